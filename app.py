@@ -3,9 +3,10 @@ Flask Web Application for Champion Cleaners Bot
 Provides a web interface to run analyses and view recommendations
 """
 
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, Response, render_template, request, jsonify, send_file
+import gzip
+import hashlib
 import os
-import json
 from pathlib import Path
 import sys
 from io import BytesIO
@@ -23,11 +24,26 @@ try:
 except ImportError:
     HAS_OPENPYXL = False
 
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
 # Add src directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 sys.path.insert(0, str(Path(__file__).parent / 'keyword_engine_v2'))
+sys.path.insert(0, str(Path(__file__).parent / 'monthly_campaign_engine'))
 
 from main_windows import ChampionCleanersBot
+from src import __version__ as ENGINE_VERSION
+from src.columnar import ARROW_STREAM_MIMETYPE, COLUMNAR_JSON_MIMETYPE, HAS_PYARROW, dumps_arrow, dumps_columnar
+from src.data_loader import DataLoader
+from src.jobs import JobRegistry, format_sse
+from src.report_sources import is_report_file
+from src.result_store import ResultStore
+from src.rollup_cube import dataset_key, get_cube
+from src.serialization import dumps, write_json
 
 try:
     from keyword_main import KeywordIntelligenceEngine
@@ -38,80 +54,247 @@ except ImportError as e:
     WebsiteRelevanceChecker = None
     print(f"Warning: Keyword modules not fully available: {e}")
 
+try:
+    from monthly_main import MonthlyCampaignEngine
+    from watch_daemon import latest_results_path
+except ImportError as e:
+    MonthlyCampaignEngine = None
+    latest_results_path = None
+    print(f"Warning: Monthly campaign engine not available: {e}")
+
 app = Flask(__name__)
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 UPLOAD_FOLDER = Path(__file__).parent / 'uploads'
 UPLOAD_FOLDER.mkdir(exist_ok=True)
+JOBS = JobRegistry()
+RESULTS = ResultStore()
+
+# Bodies smaller than this aren't worth compressing
+COMPRESS_MIN_BYTES = 1024
+COMPRESSIBLE_MIMETYPES = {'application/json', COLUMNAR_JSON_MIMETYPE, ARROW_STREAM_MIMETYPE,
+                          'text/html', 'text/plain', 'text/css', 'application/javascript'}
+
+# Result encodings clients can ask for with Accept: mimetype -> (encoder, ETag suffix)
+RESPONSE_FORMATS = {
+    'application/json': (dumps, ''),
+    COLUMNAR_JSON_MIMETYPE: (dumps_columnar, '-columnar'),
+}
+if HAS_PYARROW:
+    RESPONSE_FORMATS[ARROW_STREAM_MIMETYPE] = (dumps_arrow, '-arrow')
+
+def _file_digest(path):
+    """SHA-1 of a file's contents"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+# Thresholds in config.py change results as much as the engine version does
+CONFIG_DIGEST = _file_digest(Path(__file__).parent / 'config.py')
+
+def _result_etag(engine, input_digest, *params):
+    """Strong ETag for a result: input hash, engine version and request parameters"""
+    parts = [engine, ENGINE_VERSION, CONFIG_DIGEST, input_digest] + [str(p) for p in params]
+    return hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()
+
+def _not_modified(etag):
+    """304 response if the client already holds this result in the format it asks for (in any encoding)"""
+    _, suffix = RESPONSE_FORMATS[_preferred_format()]
+    representation = f"{etag}{suffix}"
+    # The 200 carried an encoding suffix only if it was compressed, so echo whichever
+    # variant the client holds, preferring the one this request would be encoded as
+    encoding = _preferred_encoding()
+    variants = [f"{representation}-{encoding}"] if encoding else []
+    variants += [representation] + [f"{representation}-{other}" for other in ('gzip', 'br') if other != encoding]
+    matched = next((tag for tag in variants if request.if_none_match.contains(tag)), None)
+    if matched is not None:
+        response = Response(status=304)
+        response.set_etag(matched)
+        response.vary.add('Accept')
+        response.vary.add('Accept-Encoding')
+        return response
+    return None
+
+def _preferred_format():
+    """Result mimetype the client prefers (JSON unless it asks for a columnar format)"""
+    return request.accept_mimetypes.best_match(list(RESPONSE_FORMATS), default='application/json')
+
+def _preferred_encoding():
+    """Best content coding the client accepts: brotli when available, else gzip"""
+    accepted = request.accept_encodings
+    if HAS_BROTLI and accepted['br'] > 0:
+        return 'br'
+    if accepted['gzip'] > 0:
+        return 'gzip'
+    return None
+
+@app.after_request
+def _compress_response(response):
+    """Compress sizeable text responses according to Accept-Encoding"""
+    if (response.status_code != 200 or response.direct_passthrough
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or 'Content-Encoding' in response.headers):
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    body = response.get_data()
+    encoding = _preferred_encoding()
+    if encoding is None or len(body) < COMPRESS_MIN_BYTES:
+        return response
+    
+    if encoding == 'br':
+        response.set_data(brotli.compress(body, quality=5))
+    else:
+        response.set_data(gzip.compress(body, compresslevel=6))
+    response.headers['Content-Encoding'] = encoding
+    
+    # Each encoding is a distinct representation, so it gets its own strong ETag
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(f"{etag}-{encoding}")
+    return response
 
 @app.route('/')
 def index():
     """Render home page"""
     return render_template('index.html')
 
+class AnalysisFailed(Exception):
+    """An analysis could not produce results; carries the HTTP status to report"""
+    
+    def __init__(self, message, status=500):
+        super().__init__(message)
+        self.status = status
+
+def _saved_input(sample_name):
+    """Resolve the request's input: the bundled sample or the uploaded report (saved to uploads/)"""
+    if request.form.get('use_sample') == 'true':
+        return Path(__file__).parent / sample_name, 'sample'
+    
+    if 'file' not in request.files:
+        raise AnalysisFailed('No file provided', 400)
+    
+    file = request.files['file']
+    if not file.filename or file.filename == '':
+        raise AnalysisFailed('No file selected', 400)
+    
+    # Compressed and zipped exports are decompressed on the fly by the loaders
+    if not is_report_file(file.filename):
+        raise AnalysisFailed('Only CSV or XLSX reports allowed (plain, .csv.gz, .csv.zst, .xlsx or a .zip of reports)', 400)
+    
+    csv_path = UPLOAD_FOLDER / file.filename
+    file.save(csv_path)
+    return csv_path, file.filename
+
+def _run_campaign_analysis(csv_path, dataset, progress=None):
+    """Run the campaign bot and shape its results for the API"""
+    bot = ChampionCleanersBot(str(csv_path), use_emojis=False)
+    results = bot.run_analysis(verbose=False, progress=progress)
+    
+    if not results:
+        raise AnalysisFailed('Analysis failed')
+    
+    # Build the slice-and-dice cube while the data is in memory
+    get_cube(dataset_key(str(csv_path)), bot.df)
+    
+    # Format results for JSON response
+    return {
+        'status': 'success',
+        'data_summary': results['data_summary'],
+        'campaign_metrics': results['campaign_metrics'],
+        'detected_issues': results['detected_issues'],
+        'recommendations': results['recommendations'],
+        'platform_analysis': results['platform_analysis'],
+        'device_analysis': results['device_analysis'],
+        'budget_allocation': results['budget_allocation'],
+        'dataset': dataset
+    }
+
 @app.route('/api/analyze', methods=['POST'])
 def analyze():
     """Run analysis on uploaded CSV or sample data"""
     try:
-        use_sample = request.form.get('use_sample') == 'true'
-        
-        if use_sample:
-            csv_path = Path(__file__).parent / 'sample_data.csv'
-        else:
-            if 'file' not in request.files:
-                return jsonify({'error': 'No file provided'}), 400
-            
-            file = request.files['file']
-            if not file.filename or file.filename == '':
-                return jsonify({'error': 'No file selected'}), 400
-            
-            if not file.filename.endswith('.csv'):
-                return jsonify({'error': 'Only CSV files allowed'}), 400
-            
-            csv_path = UPLOAD_FOLDER / file.filename
-            file.save(csv_path)
-        
-        # Run analysis
-        bot = ChampionCleanersBot(str(csv_path), use_emojis=False)
-        results = bot.run_analysis(verbose=False)
+        csv_path, dataset = _saved_input('sample_data.csv')
         
-        if not results:
-            return jsonify({'error': 'Analysis failed'}), 500
+        etag = _result_etag('campaign', _file_digest(csv_path), dataset)
+        cached = _not_modified(etag)
+        if cached is not None:
+            return cached
         
-        # Format results for JSON response
-        response = {
-            'status': 'success',
-            'data_summary': results['data_summary'],
-            'campaign_metrics': _serialize_metrics(results['campaign_metrics']),
-            'detected_issues': results['detected_issues'],
-            'recommendations': results['recommendations'],
-            'platform_analysis': _serialize_metrics(results['platform_analysis']),
-            'device_analysis': _serialize_metrics(results['device_analysis']),
-            'budget_allocation': _serialize_metrics(results['budget_allocation'])
-        }
-        
-        return jsonify(response)
+        return _json_response(_run_campaign_analysis(csv_path, dataset), etag=etag)
     
+    except AnalysisFailed as e:
+        return jsonify({'error': str(e)}), e.status
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-def _serialize_metrics(obj):
-    """Convert numpy types to Python native types for JSON serialization"""
-    if isinstance(obj, dict):
-        return {key: _serialize_metrics(val) for key, val in obj.items()}
-    elif isinstance(obj, list):
-        return [_serialize_metrics(item) for item in obj]
-    elif isinstance(obj, (int, float)):
-        return float(obj) if isinstance(obj, float) else int(obj)
-    elif obj is None or isinstance(obj, (str, bool)):
-        return obj
-    else:
-        return str(obj)
+def _json_response(payload, status=200, etag=None):
+    """Encode a result payload as JSON, or as columnar JSON / Arrow IPC when the Accept header asks for it"""
+    mimetype = _preferred_format()
+    encode, suffix = RESPONSE_FORMATS[mimetype]
+    response = Response(encode(payload), status=status, mimetype=mimetype)
+    response.vary.add('Accept')
+    if etag is not None:
+        # Each format is a distinct representation, so it gets its own strong ETag
+        response.set_etag(f"{etag}{suffix}")
+    return response
+
+def _as_list(items):
+    """Return items if it is a list, otherwise an empty list"""
+    return items if isinstance(items, list) else []
 
-def _serialize_list(items):
-    """Serialize a list of items, handling numpy types"""
-    if not isinstance(items, list):
-        return []
-    return [_serialize_metrics(item) for item in items]
+def _parse_filters(raw_filters):
+    """Parse repeated 'dimension:value1|value2' filter parameters"""
+    filters = {}
+    for raw in raw_filters:
+        dim, sep, values = raw.partition(':')
+        if not sep or not dim:
+            raise ValueError(f"Invalid filter '{raw}' (use dimension:value1|value2)")
+        filters.setdefault(dim.strip(), []).extend(values.split('|'))
+    return filters
+
+@app.route('/api/query', methods=['GET'])
+def query():
+    """Slice the precomputed metrics cube of an analysed dataset"""
+    try:
+        dataset = request.args.get('dataset', 'sample')
+        if dataset == 'sample':
+            csv_path = Path(__file__).parent / 'sample_data.csv'
+        else:
+            csv_path = UPLOAD_FOLDER / Path(dataset).name
+        if not csv_path.exists():
+            return jsonify({'error': f'Unknown dataset: {dataset}'}), 404
+        
+        # The dataset key tracks size and mtime, which avoids rehashing the file per query
+        key = dataset_key(str(csv_path))
+        etag = _result_etag('query', key, request.query_string.decode('utf-8'))
+        cached = _not_modified(etag)
+        if cached is not None:
+            return cached
+        
+        cube = get_cube(key)
+        if cube is None:
+            cube = get_cube(key, DataLoader(str(csv_path)).load())
+        
+        group_by = [dim.strip() for dim in request.args.get('group_by', '').split(',') if dim.strip()]
+        filters = _parse_filters(request.args.getlist('filter'))
+        sort_by = request.args.get('sort')
+        ascending = request.args.get('order', 'desc') == 'asc'
+        
+        result = cube.query(group_by, filters, sort_by=sort_by, ascending=ascending)
+        return _json_response({
+            'status': 'success',
+            'dataset': dataset,
+            'group_by': group_by,
+            'filters': filters,
+            'rows': result.to_dict(orient='records')
+        }, etag=etag)
+    
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
 @app.route('/api/export-json', methods=['POST'])
 def export_json():
@@ -120,8 +303,7 @@ def export_json():
         data = request.json
         
         output_path = Path(__file__).parent / 'recommendations_export.json'
-        with open(output_path, 'w') as f:
-            json.dump(data, f, indent=2)
+        write_json(str(output_path), data)
         
         return send_file(output_path, as_attachment=True, download_name='recommendations.json')
     
@@ -342,80 +524,208 @@ def download_sample_keywords():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _run_keyword_analysis(csv_path, dataset, progress=None, result_id=None):
+    """Run the keyword engine and shape its results for the API (retained under result_id if given)"""
+    if KeywordIntelligenceEngine is None:
+        raise AnalysisFailed('Keyword engine not available')
+        
+    engine = KeywordIntelligenceEngine()
+    
+    if not engine.load_keywords(str(csv_path)):
+        raise AnalysisFailed('Failed to load keywords', 400)
+    
+    if not engine.run_full_analysis(progress=progress):
+        raise AnalysisFailed('Analysis failed')
+    
+    # Get results summary
+    results = engine.get_results_summary()
+    
+    # Safely extract all fields with defaults
+    summary = results.get('summary', {})
+    
+    # Keep every finding server-side; the response only previews the first few
+    collections = {
+        'audit': _as_list(results.get('audit', [])),
+        'lost_searches': _as_list(results.get('lost_searches', [])),
+        'match_recommendations': _as_list(results.get('match_recommendations', [])),
+        'alignment_analysis': _as_list(results.get('alignment_analysis', [])),
+        'new_keywords': _as_list(results.get('new_keywords', [])),
+        'service_gaps': _as_list(results.get('service_gaps', [])),
+        'recommendations': _as_list(results.get('recommendations', [])),
+    }
+    result_id = RESULTS.put(collections, result_id)
+    
+    return {
+        'status': 'success',
+        'result_id': result_id,
+        'totals': {name: len(items) for name, items in collections.items()},
+        'summary': {
+            'total_keywords': int(summary.get('total_keywords', 0)),
+            'keywords_with_issues': int(summary.get('keywords_with_issues', 0)),
+            'lost_search_opportunities': int(summary.get('lost_search_opportunities', 0)),
+            'match_type_conversions': int(summary.get('match_type_conversions_recommended', 0)),
+            'new_keywords_suggested': int(summary.get('new_keywords_suggested', 0)),
+            'total_recommendations': int(summary.get('total_recommendations', 0))
+        },
+        'keyword_audit': collections['audit'][:10],
+        'lost_searches': collections['lost_searches'][:10],
+        'match_recommendations': collections['match_recommendations'][:10],
+        'alignment_analysis': collections['alignment_analysis'],
+        'new_keywords': collections['new_keywords'],
+        'service_gaps': collections['service_gaps'],
+        'top_recommendations': collections['recommendations'][:10],
+        'dataset': dataset
+    }
+
 @app.route('/api/analyze-keywords', methods=['POST'])
 def analyze_keywords():
     """Run keyword intelligence analysis"""
     try:
-        use_sample = request.form.get('use_sample') == 'true'
-        
-        if use_sample:
-            csv_path = Path(__file__).parent / 'sample_keywords.csv'
-        else:
-            if 'file' not in request.files:
-                return jsonify({'error': 'No file provided'}), 400
-            
-            file = request.files['file']
-            if not file.filename or file.filename == '':
-                return jsonify({'error': 'No file selected'}), 400
-            
-            if not file.filename.endswith('.csv'):
-                return jsonify({'error': 'Only CSV files allowed'}), 400
-            
-            csv_path = UPLOAD_FOLDER / file.filename
-            file.save(csv_path)
-        
-        # Run keyword analysis
-        if KeywordIntelligenceEngine is None:
-            return jsonify({'error': 'Keyword engine not available'}), 500
-            
-        engine = KeywordIntelligenceEngine()
-        
-        if not engine.load_keywords(str(csv_path)):
-            return jsonify({'error': 'Failed to load keywords'}), 400
-        
-        if not engine.run_full_analysis():
-            return jsonify({'error': 'Analysis failed'}), 500
+        csv_path, dataset = _saved_input('sample_keywords.csv')
         
-        # Get results summary
-        results = engine.get_results_summary()
-        
-        # Safely extract all fields with defaults
-        summary = results.get('summary', {})
-        
-        # Build match_recommendations
-        match_recs = results.get('match_recommendations', [])
-        match_recs_serialized = _serialize_list(match_recs[:10] if match_recs else [])
-        
-        # Build alignment_analysis
-        alignment = results.get('alignment_analysis', [])
-        alignment_serialized = _serialize_list(alignment)
-        
-        response = {
-            'status': 'success',
-            'summary': {
-                'total_keywords': int(summary.get('total_keywords', 0)),
-                'keywords_with_issues': int(summary.get('keywords_with_issues', 0)),
-                'lost_search_opportunities': int(summary.get('lost_search_opportunities', 0)),
-                'match_type_conversions': int(summary.get('match_type_conversions_recommended', 0)),
-                'new_keywords_suggested': int(summary.get('new_keywords_suggested', 0)),
-                'total_recommendations': int(summary.get('total_recommendations', 0))
-            },
-            'keyword_audit': _serialize_list(results.get('audit', [])[:10]),
-            'lost_searches': _serialize_list(results.get('lost_searches', [])[:10]),
-            'match_recommendations': match_recs_serialized,
-            'alignment_analysis': alignment_serialized,
-            'new_keywords': _serialize_list(results.get('new_keywords', [])),
-            'service_gaps': _serialize_list(results.get('service_gaps', [])),
-            'top_recommendations': _serialize_list(results.get('recommendations', [])[:10])
-        }
+        # The body names the dataset and carries the ETag as its result_id, so both stay stable
+        etag = _result_etag('keyword', _file_digest(csv_path), dataset)
+        # A 304 only holds while the findings it points at are still retained (describe() refreshes them)
+        cached = _not_modified(etag)
+        if cached is not None and RESULTS.describe(etag) is not None:
+            return cached
         
-        return jsonify(response)
+        return _json_response(_run_keyword_analysis(csv_path, dataset, result_id=etag), etag=etag)
     
+    except AnalysisFailed as e:
+        return jsonify({'error': str(e)}), e.status
     except Exception as e:
         import traceback
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
 
+# Query parameters of the paging endpoint; any other parameter filters on a field
+PAGE_PARAMS = {'cursor', 'limit', 'sort', 'order'}
+
+@app.route('/api/results/<result_id>', methods=['GET'])
+def result_collections(result_id):
+    """List the retained collections of a result and their sizes"""
+    collections = RESULTS.describe(result_id)
+    if collections is None:
+        return jsonify({'error': 'Unknown or expired result; re-run the analysis'}), 404
+    return jsonify({'result_id': result_id, 'collections': collections})
+
+@app.route('/api/results/<result_id>/<collection>', methods=['GET'])
+def result_page(result_id, collection):
+    """Page through a retained collection (e.g. ?severity=High&sort=value&order=desc&limit=100)"""
+    try:
+        limit = request.args.get('limit', type=int)
+        filters = {
+            field: [value.strip() for raw in request.args.getlist(field) for value in raw.split(',') if value.strip()]
+            for field in request.args if field not in PAGE_PARAMS
+        }
+        page = RESULTS.page(
+            result_id, collection,
+            cursor=request.args.get('cursor'),
+            limit=limit,
+            sort=request.args.get('sort'),
+            descending=request.args.get('order', 'asc') == 'desc',
+            filters=filters
+        )
+        return _json_response({'result_id': result_id, 'filters': filters, **page})
+    
+    except KeyError as e:
+        return jsonify({'error': e.args[0]}), 404
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+def _run_monthly_analysis(input_path, dataset, progress=None):
+    """Run the monthly engine over a zip of monthly exports (or the bundled months)"""
+    if MonthlyCampaignEngine is None:
+        raise AnalysisFailed('Monthly campaign engine not available')
+    
+    engine = MonthlyCampaignEngine(str(input_path))
+    results = engine.run_analysis(output_json=False, output_console=False, progress=progress)
+    if not results:
+        raise AnalysisFailed('No monthly exports found in the upload', 400)
+    
+    return {'status': 'success', 'dataset': dataset, **results}
+
+@app.route('/api/monthly/latest', methods=['GET'])
+def monthly_latest():
+    """Latest monthly analysis published by the watch-folder daemon"""
+    if latest_results_path is None:
+        return jsonify({'error': 'Monthly campaign engine not available'}), 500
+    
+    path = latest_results_path()
+    if not path.exists():
+        return jsonify({'error': 'No monthly results published yet (run monthly_campaign_engine/watch_daemon.py)'}), 404
+    
+    # Published atomically by the daemon, so the file is always complete
+    body = path.read_bytes()
+    etag = hashlib.sha1(body).hexdigest()
+    cached = _not_modified(etag)
+    if cached is not None:
+        return cached
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    return response
+
+# Job kind -> (sample file, runner taking (csv_path, dataset, progress))
+JOB_RUNNERS = {
+    'campaign': ('sample_data.csv', _run_campaign_analysis),
+    'keyword': ('sample_keywords.csv', _run_keyword_analysis),
+    # The sample is the directory of bundled monthly exports
+    'monthly': ('.', _run_monthly_analysis),
+}
+
+@app.route('/api/jobs', methods=['POST'])
+def start_job():
+    """Start a campaign, keyword or monthly analysis in the background"""
+    try:
+        kind = request.form.get('kind', 'campaign')
+        if kind not in JOB_RUNNERS:
+            return jsonify({'error': f"Unknown job kind '{kind}' (use {', '.join(JOB_RUNNERS)})"}), 400
+        
+        sample_name, runner = JOB_RUNNERS[kind]
+        csv_path, dataset = _saved_input(sample_name)
+        job = JOBS.start(kind, lambda progress: runner(csv_path, dataset, progress))
+        
+        return jsonify({
+            'status': 'accepted',
+            'job_id': job.id,
+            'events_url': f'/api/jobs/{job.id}/events',
+            'result_url': f'/api/jobs/{job.id}'
+        }), 202
+    
+    except AnalysisFailed as e:
+        return jsonify({'error': str(e)}), e.status
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Get a job's status, and its result once completed"""
+    job = JOBS.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    return _json_response(job.to_dict())
+
+@app.route('/api/jobs/<job_id>/events', methods=['GET'])
+def job_events(job_id):
+    """Stream a job's progress events as server-sent events"""
+    job = JOBS.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    
+    # EventSource resends the last id it saw when reconnecting
+    last_id = request.headers.get('Last-Event-ID', request.args.get('after', '-1'))
+    try:
+        after = int(last_id)
+    except ValueError:
+        after = -1
+    
+    stream = (format_sse(event) for event in job.iter_events(after))
+    response = Response(stream, mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
 @app.route('/api/health', methods=['GET'])
 def health():
     """Health check endpoint"""
@@ -0,0 +1,351 @@
+"""
+Batch Orchestrator Module
+Runs campaign, monthly and keyword analyses for many client accounts in parallel.
+
+Manifest format (JSON):
+
+    {
+        "accounts": [
+            {
+                "name": "champion-cleaners",
+                "campaign_csv": "sample_data.csv",
+                "monthly_dir": ".",
+                "keyword_csv": "sample_keywords.csv"
+            }
+        ]
+    }
+
+Each account may list any subset of the three inputs. Relative paths are
+resolved against the manifest's directory.
+"""
+
+import contextlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.serialization import write_json
+
+REPORT_TYPES = {
+    'campaign': 'campaign_csv',
+    'monthly': 'monthly_dir',
+    'keyword': 'keyword_csv',
+}
+
+
+def load_manifest(manifest_path: str) -> List[Dict]:
+    """
+    Load and validate an account manifest.
+
+    Args:
+        manifest_path: Path to the JSON manifest
+
+    Returns:
+        List of account dictionaries with absolute input paths
+
+    Raises:
+        FileNotFoundError: If the manifest doesn't exist
+        ValueError: If the manifest is malformed
+    """
+    path = Path(manifest_path)
+    if not path.exists():
+        raise FileNotFoundError(f"Manifest not found: {manifest_path}")
+
+    with open(path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    accounts = manifest.get('accounts') if isinstance(manifest, dict) else manifest
+    if not isinstance(accounts, list) or not accounts:
+        raise ValueError("Manifest must contain a non-empty 'accounts' list")
+
+    seen = set()
+    for index, account in enumerate(accounts):
+        if not isinstance(account, dict):
+            raise ValueError(f"Account entry {index} must be an object, got {type(account).__name__}")
+        name = account.get('name')
+        if not name or not isinstance(name, str):
+            raise ValueError(f"Account entry {index} missing 'name': {account}")
+        if name in seen:
+            raise ValueError(f"Duplicate account name: {name}")
+        seen.add(name)
+
+        if not any(account.get(key) for key in REPORT_TYPES.values()):
+            raise ValueError(f"Account entry {index} ('{name}') has no inputs ({', '.join(REPORT_TYPES.values())})")
+        for key in REPORT_TYPES.values():
+            if account.get(key) and not isinstance(account[key], str):
+                raise ValueError(f"Account entry {index} ('{name}') has a non-path '{key}': {account[key]!r}")
+
+        for key in REPORT_TYPES.values():
+            if account.get(key):
+                account[key] = str((path.parent / account[key]).resolve())
+
+    return accounts
+
+
+def _limit_worker_memory(memory_limit_mb: int | None) -> None:
+    """Cap the address space of a worker process (POSIX only)."""
+    if not memory_limit_mb:
+        return
+    try:
+        import resource
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ImportError, ValueError, OSError) as e:
+        print(f"[WARN] Memory cap not applied in worker: {e}")
+
+
+def _analyze_campaign(input_path: str, output_path: Path) -> Dict:
+    """Run the campaign bot on one CSV and export its results."""
+    from main_windows import ChampionCleanersBot
+
+    bot = ChampionCleanersBot(input_path, use_emojis=False)
+    results = bot.run_analysis(verbose=False)
+    if not results:
+        raise ValueError("Campaign analysis failed")
+
+    write_json(str(output_path), results)
+    summary = results['data_summary']
+    revenue = sum(m.get('revenue', 0) for m in results['campaign_metrics'].values())
+    return {
+        'rows': summary['total_rows'],
+        'cost': summary['total_cost'],
+        'conversions': summary['total_conversions'],
+        'revenue': float(revenue),
+        'issues': len(results['detected_issues']),
+    }
+
+
+def _analyze_monthly(input_path: str, output_path: Path) -> Dict:
+    """Run the monthly engine on one directory and export its results."""
+    sys.path.insert(0, str(Path(__file__).parent / 'monthly_campaign_engine'))
+    from monthly_main import MonthlyCampaignEngine
+
+    engine = MonthlyCampaignEngine(input_path)
+    results = engine.run_analysis(output_json=False, output_console=False)
+    if not results or engine.metrics_data is None:
+        raise ValueError("Monthly analysis found no data")
+
+    metrics = engine.metrics_data
+    write_json(str(output_path), {
+        'data_directory': input_path,
+        'analysis_results': results,
+    })
+    return {
+        'rows': len(engine.raw_data) if engine.raw_data is not None else 0,
+        'months': int(metrics['Month'].nunique()),
+        'cost': float(metrics['cost'].sum()),
+        'conversions': float(metrics['conversions'].sum()),
+        'issues': len(results.get('losses', [])),
+    }
+
+
+def _analyze_keywords(input_path: str, output_path: Path) -> Dict:
+    """Run the keyword engine on one export and write its results."""
+    sys.path.insert(0, str(Path(__file__).parent / 'keyword_engine_v2'))
+    from keyword_main import KeywordIntelligenceEngine
+
+    engine = KeywordIntelligenceEngine()
+    if not engine.load_keywords(input_path) or not engine.run_full_analysis():
+        raise ValueError("Keyword analysis failed")
+
+    engine.export_results_json(str(output_path))
+    summary = engine.results.get('summary', {})
+    return {
+        'rows': summary.get('total_keywords', 0),
+        'issues': summary.get('keywords_with_issues', 0),
+        'recommendations': summary.get('total_recommendations', 0),
+    }
+
+
+ANALYZERS = {
+    'campaign': _analyze_campaign,
+    'monthly': _analyze_monthly,
+    'keyword': _analyze_keywords,
+}
+
+
+def run_account_task(account_name: str, report_type: str, input_path: str,
+                     output_dir: str, memory_limit_mb: int | None = None) -> Dict:
+    """
+    Run one (account, report type) analysis inside a worker process.
+
+    Engine console output is captured to a per-task log file so that
+    parallel runs don't interleave.
+
+    Returns:
+        Task result with status, timing and headline metrics
+    """
+    _limit_worker_memory(memory_limit_mb)
+
+    account_dir = Path(output_dir) / account_name
+    account_dir.mkdir(parents=True, exist_ok=True)
+    log_path = account_dir / f"{report_type}.log"
+
+    started = time.perf_counter()
+    result = {'account': account_name, 'report_type': report_type, 'input': input_path}
+    try:
+        with open(log_path, 'w', encoding='utf-8') as log, contextlib.redirect_stdout(log):
+            metrics = ANALYZERS[report_type](input_path, account_dir / f"{report_type}_analysis.json")
+        result.update(status='success', metrics=metrics)
+    except MemoryError:
+        result.update(status='failed', error='Memory limit exceeded')
+    except Exception as e:
+        result.update(status='failed', error=str(e))
+
+    result['elapsed_seconds'] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def build_portfolio_rollup(task_results: List[Dict], wall_seconds: float) -> Dict:
+    """
+    Roll per-task results up to account and portfolio level.
+
+    Args:
+        task_results: Results returned by run_account_task
+        wall_seconds: Elapsed wall-clock time of the whole batch
+
+    Returns:
+        Portfolio summary with per-account figures and throughput stats
+    """
+    accounts: Dict[str, Dict] = {}
+    for task in task_results:
+        account = accounts.setdefault(task['account'], {'reports': {}, 'failed_reports': []})
+        if task['status'] == 'success':
+            account['reports'][task['report_type']] = task['metrics']
+        else:
+            account['failed_reports'].append({'report_type': task['report_type'], 'error': task.get('error')})
+
+    totals = {'cost': 0.0, 'conversions': 0.0, 'revenue': 0.0, 'keyword_issues': 0, 'campaign_issues': 0}
+    for account in accounts.values():
+        campaign = account['reports'].get('campaign', {})
+        monthly = account['reports'].get('monthly', {})
+        keyword = account['reports'].get('keyword', {})
+        # Prefer campaign-report spend; fall back to monthly exports
+        spend_source = campaign or monthly
+        totals['cost'] += spend_source.get('cost', 0)
+        totals['conversions'] += spend_source.get('conversions', 0)
+        totals['revenue'] += campaign.get('revenue', 0)
+        totals['campaign_issues'] += campaign.get('issues', 0) + monthly.get('issues', 0)
+        totals['keyword_issues'] += keyword.get('issues', 0)
+
+    successful = [t for t in task_results if t['status'] == 'success']
+    total_rows = sum(t['metrics'].get('rows', 0) for t in successful)
+    task_seconds = sum(t['elapsed_seconds'] for t in task_results)
+
+    return {
+        'accounts': accounts,
+        'portfolio_totals': {
+            'accounts': len(accounts),
+            'total_spend': round(totals['cost'], 2),
+            'total_conversions': round(totals['conversions'], 2),
+            'total_revenue': round(totals['revenue'], 2),
+            'portfolio_roas': round(totals['revenue'] / totals['cost'], 2) if totals['cost'] > 0 else 0,
+            'campaign_issues': totals['campaign_issues'],
+            'keyword_issues': totals['keyword_issues'],
+        },
+        'run_stats': {
+            'tasks': len(task_results),
+            'failed_tasks': len(task_results) - len(successful),
+            'rows_processed': total_rows,
+            'wall_seconds': round(wall_seconds, 3),
+            'task_seconds': round(task_seconds, 3),
+            'parallel_speedup': round(task_seconds / wall_seconds, 2) if wall_seconds > 0 else 0,
+            'rows_per_second': round(total_rows / wall_seconds, 1) if wall_seconds > 0 else 0,
+            'accounts_per_minute': round(len(accounts) / wall_seconds * 60, 2) if wall_seconds > 0 else 0,
+            'slowest_tasks': sorted(
+                ({'account': t['account'], 'report_type': t['report_type'], 'elapsed_seconds': t['elapsed_seconds']}
+                 for t in task_results),
+                key=lambda t: t['elapsed_seconds'],
+                reverse=True
+            )[:5],
+        },
+    }
+
+
+def run_batch(accounts: List[Dict], output_dir: str, workers: int | None = None,
+              memory_limit_mb: int | None = None) -> Dict:
+    """
+    Fan account analyses out over a process pool and write the rollup.
+
+    Args:
+        accounts: Accounts from load_manifest
+        output_dir: Directory for per-account results and the portfolio summary
+        workers: Maximum concurrent worker processes (default: CPU count)
+        memory_limit_mb: Per-worker address-space cap in MB
+
+    Returns:
+        Portfolio rollup dictionary
+    """
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    tasks = [
+        (account['name'], report_type, account[key])
+        for account in accounts
+        for report_type, key in REPORT_TYPES.items()
+        if account.get(key)
+    ]
+
+    print(f"[OK] Running {len(tasks)} analyses for {len(accounts)} accounts "
+          f"on {workers or os.cpu_count()} workers")
+
+    started = time.perf_counter()
+    task_results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(run_account_task, name, report_type, input_path, output_dir, memory_limit_mb):
+                (name, report_type, input_path)
+            for name, report_type, input_path in tasks
+        }
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                # The worker itself died (e.g. OOM-killed, BrokenProcessPool): record the task as failed
+                name, report_type, input_path = futures[future]
+                result = {'account': name, 'report_type': report_type, 'input': input_path,
+                          'status': 'failed', 'error': f"Worker failed: {str(e) or type(e).__name__}",
+                          'elapsed_seconds': 0.0}
+            task_results.append(result)
+            marker = '[OK]' if result['status'] == 'success' else '[ERROR]'
+            detail = f"{result['elapsed_seconds']:.2f}s" if result['status'] == 'success' else result.get('error')
+            print(f"{marker} {result['account']} / {result['report_type']}: {detail}")
+
+    rollup = build_portfolio_rollup(task_results, time.perf_counter() - started)
+    summary_path = Path(output_dir) / 'portfolio_summary.json'
+    write_json(str(summary_path), rollup)
+
+    stats = rollup['run_stats']
+    print(f"[OK] {stats['tasks'] - stats['failed_tasks']}/{stats['tasks']} analyses succeeded in "
+          f"{stats['wall_seconds']:.2f}s ({stats['rows_per_second']:.0f} rows/s, "
+          f"{stats['parallel_speedup']:.1f}x parallel speedup)")
+    print(f"[OK] Portfolio summary written to {summary_path}")
+
+    return rollup
+
+
+def main():
+    """Main entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Run Google Ads analyses for many accounts in parallel')
+    parser.add_argument('manifest', help='Path to JSON manifest of accounts')
+    parser.add_argument('--output-dir', '-o', default='batch_results', help='Directory for results')
+    parser.add_argument('--workers', '-w', type=int, default=None, help='Concurrent worker processes')
+    parser.add_argument('--max-memory-mb', type=int, default=None, help='Per-worker memory cap in MB (POSIX)')
+
+    args = parser.parse_args()
+
+    accounts = load_manifest(args.manifest)
+    rollup = run_batch(accounts, args.output_dir, workers=args.workers, memory_limit_mb=args.max_memory_mb)
+
+    return 0 if rollup['run_stats']['failed_tasks'] == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -53,7 +53,8 @@ def test_monthly_file_loader():
     from file_loader import MonthlyFileLoader
     loader = MonthlyFileLoader(str(Path(__file__).parent))
     files = loader.find_monthly_files()
-    assert len(files) == 7, f"Expected 7 CSV files, found {len(files)}"
+    # Mar-Nov 2025 exports in the project root, June and July included (found by their headers)
+    assert len(files) == 9, f"Expected 9 CSV files, found {len(files)}"
 
 test_module("Monthly Engine - File Loader", test_monthly_file_loader)
 
@@ -235,6 +235,8 @@ REPORTING = {
 # CUSTOM THRESHOLDS BY CAMPAIGN TYPE
 # ============================================================================
 
+# Benchmarks each campaign (and keyword, when the export has a campaign type) is held to;
+# compiled once by src/thresholds.py, types not listed use the global thresholds above
 CAMPAIGN_TYPE_THRESHOLDS = {
     'Search': {
         'expected_ctr': 3.0,
@@ -276,6 +278,32 @@ STREAMLIT_CONFIG = {
     'theme': 'light',
 }
 
+# Local partitioned history of loaded reports (Parquet, requires pyarrow)
+HISTORY_STORE = {
+    'enabled': False,  # Set to True to keep every loaded report
+    'path': 'history',  # Relative to the project root
+    'account': 'default',
+}
+
+# Memory-mapped snapshots of cleaned keyword tables (Arrow IPC, requires pyarrow)
+KEYWORD_SNAPSHOTS = {
+    'enabled': False,  # Set to True to reuse parsed keyword exports across runs
+    'path': 'snapshots',  # Relative to the project root
+}
+
+# Persisted index of monthly export metadata (one file per scanned directory or archive)
+MONTHLY_CATALOG = {
+    'path': 'cache/catalog',  # Relative to the project root
+}
+
+# Watch-folder daemon re-running the monthly analysis when exports arrive
+MONTHLY_WATCH = {
+    'directory': 'uploads',  # Watched folder, relative to the project root
+    'output': 'results/monthly_latest.json',  # Published results the web apps read
+    'debounce_seconds': 5,  # Quiet period after the last file event before re-analysing
+    'poll_seconds': 2,  # Polling interval when inotify is unavailable
+}
+
 # Webhook/Alert Settings
 ALERTS_CONFIG = {
     'enabled': False,
@@ -2,9 +2,13 @@
 Script to convert Google Ads keyword report to compatible format
 """
 
+import sys
 import pandas as pd
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent / 'keyword_engine_v2'))
+from keyword_normalizer import clean_keyword_text
+
 def convert_google_ads_keywords(input_file, output_file):
     """
     Convert Google Ads keyword report to required format.
@@ -75,7 +79,7 @@ def convert_google_ads_keywords(input_file, output_file):
         df_converted = df_converted[df_converted['keyword'].str.strip() != '']
         
         # Clean keyword values (remove extra quotes)
-        df_converted['keyword'] = df_converted['keyword'].astype(str).str.replace('"""', '"').str.strip()
+        df_converted['keyword'] = clean_keyword_text(df_converted['keyword'].astype(str))
         
         # Select and order columns
         final_columns = ['campaign_name', 'ad_group_name', 'keyword', 'match_type', 
@@ -6,6 +6,10 @@ Handles Google Ads native CSV export format
 import pandas as pd
 from typing import Optional
 
+from keyword_normalizer import clean_keyword_text, normalize_match_types
+from src.export_schemas import get_schema
+from src.format_sniffer import read_report, sniff
+
 
 class GoogleAdsReportParser:
     """Parse and normalize Google Ads keyword reports."""
@@ -22,28 +26,22 @@ class GoogleAdsReportParser:
             Normalized DataFrame with standard columns
         """
         try:
-            # Read the CSV, skipping the title and date rows
-            df = pd.read_csv(csv_file, skiprows=2)
+            # Read the CSV after its sniffed preamble (title and date rows)
+            fmt = sniff(csv_file)
+            schema = get_schema(fmt['report_type'] if fmt['report_type'] in ('keyword', 'search_terms') else 'keyword')
             
             # Print original columns for debugging
-            print(f"[CSV] Columns found: {list(df.columns)}")
+            print(f"[CSV] Columns found: {fmt['columns']}")
             
-            # Map Google Ads columns to our standard format
-            column_mapping = {
-                'Keyword': 'keyword',
-                'Match type': 'match_type',
-                'Clicks': 'clicks',
-                'Impr.': 'impressions',
-                'Cost': 'cost',
-                'Conversions': 'conversions',
-                'Conv. value': 'revenue',
-                'Cost / conv.': 'cpa',
-                'Conv. rate': 'conversion_rate',
-                'CTR': 'ctr'
-            }
+            # Required columns in our standard format
+            required_cols = [
+                'keyword', 'match_type', 'impressions', 'clicks', 
+                'cost', 'conversions', 'campaign_name', 'ad_group_name'
+            ]
             
-            # Rename columns
-            df_renamed = df.rename(columns=column_mapping)
+            # Parse only the required columns, renamed to our standard format
+            df = read_report(csv_file, fmt, **schema.read_options(fmt['columns'], required_cols))
+            df_renamed = schema.rename(df)
             
             # Add missing required columns with defaults
             if 'campaign_name' not in df_renamed.columns:
@@ -52,23 +50,17 @@ class GoogleAdsReportParser:
             if 'ad_group_name' not in df_renamed.columns:
                 df_renamed['ad_group_name'] = 'Standard'
             
-            # Select required columns
-            required_cols = [
-                'keyword', 'match_type', 'impressions', 'clicks', 
-                'cost', 'conversions', 'campaign_name', 'ad_group_name'
-            ]
-            
             # Check which columns we have
             available_cols = [col for col in required_cols if col in df_renamed.columns]
             df_final = df_renamed[available_cols].copy()
             
             # Data cleaning
             # Remove quotes from keyword names
-            df_final['keyword'] = df_final['keyword'].str.replace('"""', '', regex=False).str.strip()
+            df_final['keyword'] = clean_keyword_text(df_final['keyword'])
             
             # Remove quotes from match type
             if 'match_type' in df_final.columns:
-                df_final['match_type'] = df_final['match_type'].str.lower().str.strip()
+                df_final['match_type'] = normalize_match_types(df_final['match_type'])
             
             # Convert numeric columns
             numeric_cols = ['impressions', 'clicks', 'cost', 'conversions']
@@ -3,13 +3,26 @@ Keyword Audit Module
 Deep audit of keyword health and performance issues.
 """
 
+import numpy as np
 import pandas as pd
 from typing import List, Dict
 
+from config import CONVERSION_RATE_THRESHOLDS, CPA_THRESHOLDS, CTR_THRESHOLDS
+from src.thresholds import attach_thresholds
+
+from keyword_snapshot import add_keyword_metrics, has_keyword_metrics
+
 
 class KeywordAuditor:
     """Audit keyword performance and detect issues."""
     
+    # Benchmarks for keywords whose campaign type has none in CAMPAIGN_TYPE_THRESHOLDS
+    DEFAULT_THRESHOLDS = {
+        'ctr_threshold': CTR_THRESHOLDS['low'],
+        'conversion_rate_threshold': CONVERSION_RATE_THRESHOLDS['low'],
+        'cpa_threshold': CPA_THRESHOLDS['warning'],
+    }
+    
     def __init__(self, df: pd.DataFrame):
         """Initialize auditor with keyword data."""
         self.df = df.copy()
@@ -18,97 +31,103 @@ class KeywordAuditor:
     
     def _calculate_metrics(self) -> None:
         """Calculate key metrics for each keyword."""
-        self.df['ctr'] = (self.df['clicks'] / self.df['impressions'] * 100).fillna(0)
-        self.df['conversion_rate'] = (self.df['conversions'] / self.df['clicks'] * 100).fillna(0)
-        self.df['cpa'] = (self.df['cost'] / self.df['conversions']).fillna(float('inf'))
-        self.df['cpc'] = (self.df['cost'] / self.df['clicks']).fillna(0)
-        
-        if 'revenue' in self.df.columns:
-            self.df['roas'] = (self.df['revenue'] / self.df['cost']).fillna(0)
-            self.df['roas'] = self.df['roas'].replace([float('inf'), -float('inf')], 0)
+        # Shared with keyword snapshots, which store these already
+        if not has_keyword_metrics(self.df):
+            add_keyword_metrics(self.df)
     
     def audit_keyword_health(self) -> List[Dict]:
         """Perform comprehensive audit and detect issues."""
-        issues = []
-        
-        for idx, row in self.df.iterrows():
-            keyword_issues = self._audit_keyword(row)
-            issues.extend(keyword_issues)
-        
+        return self.rank_issues([issue for _, issue in self.audit_findings()])
+    
+    @staticmethod
+    def rank_issues(issues: List[Dict]) -> List[Dict]:
+        """Order issues by severity, keeping row order within a severity."""
         return sorted(issues, key=lambda x: {'High': 0, 'Medium': 1, 'Low': 2}.get(x['severity'], 3))
     
-    def _audit_keyword(self, row) -> List[Dict]:
-        """Audit a single keyword row."""
-        issues = []
-        keyword = row['keyword']
+    def audit_findings(self) -> List[tuple]:
+        """
+        Evaluate every audit rule over all keywords in one vectorized pass.
         
-        # Issue 1: Impressions but no clicks
-        if row['impressions'] > 50 and row['clicks'] == 0:
-            issues.append({
-                'keyword': keyword,
-                'campaign': row['campaign_name'],
-                'issue_type': 'NO_CLICKS',
+        CTR and CPA rules compare each keyword against its campaign type's
+        benchmark from CAMPAIGN_TYPE_THRESHOLDS when the export carries a
+        campaign type column, otherwise against the global thresholds.
+        
+        Returns:
+            (row index label, issue) pairs in row order, rules in audit order within a row
+        """
+        df = attach_thresholds(self.df.copy(), self.DEFAULT_THRESHOLDS)
+        impressions = df['impressions'].to_numpy(dtype=float)
+        clicks = df['clicks'].to_numpy(dtype=float)
+        conversions = df['conversions'].to_numpy(dtype=float)
+        cost = df['cost'].to_numpy(dtype=float)
+        ctr = df['ctr'].to_numpy(dtype=float)
+        cpa = df['cpa'].to_numpy(dtype=float)
+        
+        rules = [
+            # Issue 1: Impressions but no clicks
+            ('NO_CLICKS', (impressions > 50) & (clicks == 0)),
+            # Issue 2: Clicks but no conversions
+            ('NO_CONVERSIONS', (clicks > 10) & (conversions == 0)),
+            # Issue 3: Low CTR
+            ('LOW_CTR', (impressions > 100) & (ctr < df['ctr_threshold'].to_numpy())),
+            # Issue 4: High CPA
+            ('HIGH_CPA', (conversions > 0) & (cpa > df['cpa_threshold'].to_numpy())),
+        ]
+        # Issue 5: Low ROAS
+        if 'revenue' in df.columns:
+            roas = df['roas'].to_numpy(dtype=float)
+            rules.append(('LOW_ROAS', (df['revenue'].to_numpy(dtype=float) > 0) & (roas > 0) & (roas < 1.5)))
+        # Issue 6: High spend low return
+        rules.append(('HIGH_SPEND_LOW_RETURN', (cost > 500) & (conversions < 2)))
+        
+        flagged = []
+        for rule, (issue_type, mask) in enumerate(rules):
+            for position in np.flatnonzero(mask):
+                flagged.append((position, rule, self._issue(issue_type, df.iloc[position])))
+        flagged.sort(key=lambda x: x[:2])
+        return [(df.index[position], issue) for position, _, issue in flagged]
+    
+    @staticmethod
+    def _issue(issue_type: str, row) -> Dict:
+        """Issue record for one keyword row flagged by one rule."""
+        issue = {'keyword': row['keyword'], 'campaign': row['campaign_name'], 'issue_type': issue_type}
+        if issue_type == 'NO_CLICKS':
+            issue.update({
                 'severity': 'High',
                 'description': f"High impressions ({int(row['impressions'])}) but zero clicks (CTR: 0%)",
                 'value': int(row['impressions'])
             })
-        
-        # Issue 2: Clicks but no conversions
-        if row['clicks'] > 10 and row['conversions'] == 0:
-            issues.append({
-                'keyword': keyword,
-                'campaign': row['campaign_name'],
-                'issue_type': 'NO_CONVERSIONS',
+        elif issue_type == 'NO_CONVERSIONS':
+            issue.update({
                 'severity': 'High',
                 'description': f"Traffic ({int(row['clicks'])} clicks) but zero conversions (CVR: 0%)",
                 'value': int(row['clicks'])
             })
-        
-        # Issue 3: Low CTR
-        if row['impressions'] > 100 and row['ctr'] < 1.0:
-            issues.append({
-                'keyword': keyword,
-                'campaign': row['campaign_name'],
-                'issue_type': 'LOW_CTR',
+        elif issue_type == 'LOW_CTR':
+            issue.update({
                 'severity': 'Medium',
                 'description': f"Low click-through rate: {row['ctr']:.2f}%",
                 'value': row['ctr']
             })
-        
-        # Issue 4: High CPA
-        if row['conversions'] > 0 and row['cpa'] > 300:
-            issues.append({
-                'keyword': keyword,
-                'campaign': row['campaign_name'],
-                'issue_type': 'HIGH_CPA',
+        elif issue_type == 'HIGH_CPA':
+            issue.update({
                 'severity': 'Medium',
                 'description': f"High cost per acquisition: AED {row['cpa']:.2f}",
                 'value': row['cpa']
             })
-        
-        # Issue 5: Low ROAS
-        if 'revenue' in self.df.columns and row['revenue'] > 0 and row['roas'] > 0 and row['roas'] < 1.5:
-            issues.append({
-                'keyword': keyword,
-                'campaign': row['campaign_name'],
-                'issue_type': 'LOW_ROAS',
+        elif issue_type == 'LOW_ROAS':
+            issue.update({
                 'severity': 'Medium',
                 'description': f"Low return on ad spend: {row['roas']:.2f}x",
                 'value': row['roas']
             })
-        
-        # Issue 6: High spend low return
-        if row['cost'] > 500 and row['conversions'] < 2:
-            issues.append({
-                'keyword': keyword,
-                'campaign': row['campaign_name'],
-                'issue_type': 'HIGH_SPEND_LOW_RETURN',
+        else:
+            issue.update({
                 'severity': 'High',
                 'description': f"High spend (AED {row['cost']:.2f}) with minimal conversions ({int(row['conversions'])})",
                 'value': row['cost']
             })
-        
-        return issues
+        return issue
     
     def get_keyword_metrics(self, keyword: str | None = None) -> Dict:
         """Get metrics for specific keyword or all."""
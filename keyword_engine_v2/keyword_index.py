@@ -0,0 +1,118 @@
+"""
+Keyword Index Module
+Tokenized inverted index over the keyword column for theme and intent lookups.
+"""
+
+import re
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, List
+
+from keyword_normalizer import CANONICAL_COLUMN
+
+
+class KeywordIndex:
+    """Inverted index mapping keyword tokens and phrases to row positions.
+
+    Lookups follow the same semantics as a case-insensitive
+    ``str.contains`` on the keyword column (substring match, missing
+    keywords never match), but are answered from token posting lists
+    built once per keyword table instead of scanning every row.
+    """
+
+    TOKEN_PATTERN = re.compile(r'\w+')
+
+    def __init__(self, keywords: pd.Series):
+        """Build the index from a keyword column (raw text or the canonical categorical)."""
+        if isinstance(keywords.dtype, pd.CategoricalDtype):
+            # Already lowercased and interned by the normalizer: reuse its dictionary
+            codes = keywords.cat.codes.to_numpy()
+            uniques = keywords.cat.categories
+        else:
+            codes, uniques = pd.factorize(keywords.str.lower(), use_na_sentinel=True)
+
+        self.num_rows = len(keywords)
+        self.uniques: List[str] = [str(u) for u in uniques]
+        self._codes = codes
+
+        # CSR layout: rows of unique keyword u are _row_order[_row_starts[u]:_row_starts[u + 1]]
+        valid = codes >= 0
+        self._row_order = np.flatnonzero(valid)[np.argsort(codes[valid], kind='stable')]
+        counts = np.bincount(codes[valid], minlength=len(self.uniques))
+        self._row_starts = np.concatenate(([0], np.cumsum(counts)))
+
+        postings: Dict[str, List[int]] = {}
+        for uid, text in enumerate(self.uniques):
+            for token in set(self.TOKEN_PATTERN.findall(text)):
+                postings.setdefault(token, []).append(uid)
+        self._postings = {token: np.array(ids, dtype=np.int64) for token, ids in postings.items()}
+        self._term_cache: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, column: str = 'keyword') -> 'KeywordIndex':
+        """Build an index for the keyword column of a DataFrame."""
+        if column == 'keyword' and CANONICAL_COLUMN in df.columns:
+            return cls(df[CANONICAL_COLUMN])
+        return cls(df[column])
+
+    def _ids_for_term(self, term: str) -> np.ndarray:
+        """Unique-keyword ids having a token that contains ``term``."""
+        if term not in self._term_cache:
+            matches = [ids for token, ids in self._postings.items() if term in token]
+            if matches:
+                self._term_cache[term] = np.unique(np.concatenate(matches))
+            else:
+                self._term_cache[term] = np.empty(0, dtype=np.int64)
+        return self._term_cache[term]
+
+    def _ids_for_phrase(self, phrase: str) -> np.ndarray:
+        """Unique-keyword ids whose text contains ``phrase``."""
+        phrase = phrase.lower()
+        terms = self.TOKEN_PATTERN.findall(phrase)
+
+        if not terms:
+            # Punctuation-only phrase: nothing to intersect, check vocabulary directly
+            return np.array([uid for uid, text in enumerate(self.uniques) if phrase in text], dtype=np.int64)
+
+        candidates = self._ids_for_term(terms[0])
+        for term in terms[1:]:
+            if len(candidates) == 0:
+                break
+            candidates = np.intersect1d(candidates, self._ids_for_term(term), assume_unique=True)
+
+        if len(terms) == 1 and terms[0] == phrase:
+            return candidates
+
+        # Multi-token phrases: confirm adjacency on the (small) candidate set
+        return np.array([uid for uid in candidates if phrase in self.uniques[uid]], dtype=np.int64)
+
+    def rows_matching(self, phrases: str | Iterable[str]) -> np.ndarray:
+        """
+        Get sorted row positions whose keyword contains any of the phrases.
+
+        Args:
+            phrases: A phrase or an iterable of phrases (matched as a union)
+
+        Returns:
+            NumPy array of row positions
+        """
+        if isinstance(phrases, str):
+            phrases = [phrases]
+
+        id_sets = [self._ids_for_phrase(p) for p in phrases]
+        ids = np.unique(np.concatenate(id_sets)) if id_sets else np.empty(0, dtype=np.int64)
+        if len(ids) == 0:
+            return np.empty(0, dtype=np.int64)
+
+        rows = [self._row_order[self._row_starts[uid]:self._row_starts[uid + 1]] for uid in ids]
+        return np.sort(np.concatenate(rows))
+
+    def mask(self, phrases: str | Iterable[str]) -> np.ndarray:
+        """Get a boolean row mask for keywords containing any of the phrases."""
+        result = np.zeros(self.num_rows, dtype=bool)
+        result[self.rows_matching(phrases)] = True
+        return result
+
+    def count(self, phrases: str | Iterable[str]) -> int:
+        """Count rows whose keyword contains any of the phrases."""
+        return len(self.rows_matching(phrases))
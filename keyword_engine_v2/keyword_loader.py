@@ -4,9 +4,16 @@ Loads and validates keyword-level data from CSV files.
 """
 
 import pandas as pd
-from typing import Tuple, Dict, List
+from typing import Tuple, Dict, List, TYPE_CHECKING
 import os
 
+from keyword_normalizer import add_canonical_keywords, normalize_match_types
+from src.format_sniffer import read_reports
+
+if TYPE_CHECKING:
+    from src.history_store import HistoryStore
+    from keyword_snapshot import KeywordSnapshot
+
 
 class KeywordLoader:
     """Load and validate keyword-level Google Ads data."""
@@ -22,11 +29,14 @@ class KeywordLoader:
         'conversions'
     ]
     
-    OPTIONAL_COLUMNS = ['revenue', 'search_term', 'quality_score', 'ctr_percent', 'conversion_rate_percent']
+    OPTIONAL_COLUMNS = ['campaign_type', 'revenue', 'search_term', 'quality_score', 'ctr_percent', 'conversion_rate_percent']
     
-    def __init__(self, filepath: str):
-        """Initialize keyword loader with CSV file path."""
+    def __init__(self, filepath: str, history: 'HistoryStore | None' = None,
+                 snapshot: 'KeywordSnapshot | None' = None):
+        """Initialize keyword loader with CSV file path (and optional history store and snapshot)."""
         self.filepath = filepath
+        self.history = history
+        self.snapshot = snapshot
         self.df: pd.DataFrame | None = None
         self.validation_warnings = []
         self.validation_errors = []
@@ -36,17 +46,22 @@ class KeywordLoader:
         if not os.path.exists(self.filepath):
             raise FileNotFoundError(f"File not found: {self.filepath}")
         
+        # An unchanged export was already cleaned (and recorded in history) by an earlier run
+        if self.snapshot is not None and self.snapshot.is_fresh():
+            self.df = self.snapshot.read()
+            print(f"[OK] Loaded {len(self.df)} keywords from snapshot {self.snapshot.path.name}")
+            return self.df
+        
+        # CSV, .csv.gz/.csv.zst or a zip of reports: one sniff of each file's head decides
+        # preamble, delimiter, encoding and schema, then a single full parse
         try:
-            # Try standard CSV first
-            self.df = pd.read_csv(self.filepath)
+            self.df = read_reports(self.filepath, ['keyword', 'search_terms'], 'keyword')
+        except ValueError:
+            raise
         except Exception as e:
-            # Try Google Ads format (skip first 2 rows)
-            try:
-                self.df = pd.read_csv(self.filepath, skiprows=2)
-            except Exception as e2:
-                raise ValueError(f"Failed to load CSV: {str(e)}")
+            raise ValueError(f"Failed to load CSV: {str(e)}")
         
-        # Convert Google Ads format if needed
+        # Fill in what Google Ads exports leave out
         self._convert_google_ads_format()
         
         print(f"[OK] Loaded {len(self.df)} keywords from {self.filepath}")
@@ -54,43 +69,29 @@ class KeywordLoader:
         self._validate_columns()
         self._clean_data()
         
+        # Keyword reports carry no dates: stored as this month's snapshot
+        if self.history is not None:
+            self.history.upsert('keyword', self.df)
+        
+        if self.snapshot is not None:
+            self.snapshot.write(self.df)
+        
         return self.df
     
     def _convert_google_ads_format(self) -> None:
-        """Convert Google Ads keyword report format to required format."""
+        """Add the campaign/ad group columns Google Ads keyword exports omit and drop empty keywords."""
         assert self.df is not None, "DataFrame not initialized"
-        # Check if this is a Google Ads export (has 'Keyword' column instead of 'keyword')
-        if 'Keyword' in self.df.columns and 'keyword' not in self.df.columns:
-            # Google Ads export - convert columns
-            column_mapping = {
-                'Keyword': 'keyword',
-                'Match type': 'match_type',
-                'Clicks': 'clicks',
-                'Impr.': 'impressions',
-                'Avg. CPC': 'avg_cpc',
-                'Cost': 'cost',
-                'Conversions': 'conversions',
-                'Conv. rate': 'conversion_rate',
-                'CTR': 'ctr'
-            }
-            
-            # Rename existing columns
-            for old_col, new_col in column_mapping.items():
-                if old_col in self.df.columns:
-                    self.df.rename(columns={old_col: new_col}, inplace=True)
-            
-            # Add missing required columns
-            if 'campaign_name' not in self.df.columns:
-                self.df['campaign_name'] = 'Website Traffic'
-            if 'ad_group_name' not in self.df.columns:
-                self.df['ad_group_name'] = 'Keywords'
-            
-            # Clean keyword values (remove extra quotes from Google Ads)
-            if 'keyword' in self.df.columns:
-                self.df['keyword'] = self.df['keyword'].astype(str).str.replace('"""', '"').str.strip()
-            
-            # Remove empty keywords
-            self.df = self.df[self.df['keyword'].str.strip() != '']
+        # Columns are already renamed by the export schema
+        for column, default in (('campaign_name', 'Website Traffic'), ('ad_group_name', 'Keywords')):
+            if column not in self.df.columns:
+                self.df[column] = default
+            else:
+                # Archives can mix exports with and without the column
+                self.df[column] = self.df[column].fillna(default)
+        
+        # Remove empty keywords (quote cleanup happens once, in _clean_data)
+        if 'keyword' in self.df.columns:
+            self.df = self.df[self.df['keyword'].astype(str).str.strip() != '']
     
     def _validate_columns(self) -> None:
         """Validate required columns exist."""
@@ -109,10 +110,10 @@ class KeywordLoader:
         if 'match_type' in self.df.columns:
             self.df = self.df[~self.df['match_type'].astype(str).str.lower().str.contains('total:', regex=False)]
         
-        # Clean keyword values (remove extra quotes from Google Ads)
+        # Clean keyword values once per unique keyword and add the canonical (categorical) column
         if 'keyword' in self.df.columns:
-            self.df['keyword'] = self.df['keyword'].astype(str).str.replace('"""', '"', regex=False).str.strip()
-            self.df['keyword'] = self.df['keyword'].astype(str).str.replace('^"+|"+$', '', regex=True).str.strip()
+            self.df['keyword'] = self.df['keyword'].astype(str)
+            add_canonical_keywords(self.df)
         
         # Convert numeric columns
         numeric_cols = ['impressions', 'clicks', 'cost', 'conversions', 'revenue', 'quality_score', 'ctr_percent', 'conversion_rate_percent']
@@ -125,11 +126,9 @@ class KeywordLoader:
             if col in self.df.columns:
                 self.df[col] = self.df[col].fillna(0)
         
-        # Standardize match_type
+        # Standardize match_type ("Phrase match" -> "phrase")
         if 'match_type' in self.df.columns:
-            self.df['match_type'] = self.df['match_type'].astype(str).str.lower().str.strip()
-            # Remove " match" suffix from Google Ads format (e.g., "phrase match" -> "phrase")
-            self.df['match_type'] = self.df['match_type'].str.replace(' match$', '', regex=True)
+            self.df['match_type'] = normalize_match_types(self.df['match_type'])
         
         print(f"[OK] Data cleaned and normalized")
     
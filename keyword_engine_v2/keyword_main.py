@@ -3,14 +3,14 @@ Keyword Intelligence Engine V2 - Main Orchestrator
 Ties all keyword analysis modules together.
 """
 
-import pandas as pd
-import json
 from typing import Dict, List, Optional
 import sys
 from pathlib import Path
 
 # Add current directory to path for relative imports
 sys.path.insert(0, str(Path(__file__).parent))
+# Shared helpers live in the top-level src package
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from keyword_loader import KeywordLoader
 from keyword_audit import KeywordAuditor
@@ -19,6 +19,12 @@ from match_type_optimizer import MatchTypeOptimizer
 from market_insights import MarketInsights
 from website_relevance_checker import WebsiteRelevanceChecker
 from keyword_recommender import KeywordRecommender
+from keyword_index import KeywordIndex
+from keyword_snapshot import KeywordSnapshot
+from sharded_analysis import run_sharded_analysis
+from src.history_store import HistoryStore
+from src.progress import ProgressCallback, ProgressTracker
+from src.serialization import write_json
 
 
 class KeywordIntelligenceEngine:
@@ -27,6 +33,7 @@ class KeywordIntelligenceEngine:
     def __init__(self):
         """Initialize the keyword engine."""
         self.keywords_df = None
+        self.keyword_index = None
         self.audit = None
         self.lost_demand = None
         self.match_optimizer = None
@@ -37,33 +44,58 @@ class KeywordIntelligenceEngine:
     def load_keywords(self, csv_file: str) -> bool:
         """Load and validate keyword data."""
         try:
-            loader = KeywordLoader(csv_file)
+            loader = KeywordLoader(csv_file, history=HistoryStore.from_config(),
+                                   snapshot=KeywordSnapshot.from_config(csv_file))
             self.keywords_df = loader.load()
             if self.keywords_df is None or self.keywords_df.empty:
                 print("ERROR: Failed to load keywords from CSV")
                 return False
+            self.keyword_index = KeywordIndex.from_frame(self.keywords_df)
             print(f"SUCCESS: Loaded {len(self.keywords_df)} keywords")
             return True
         except Exception as e:
             print(f"ERROR: Could not load keywords: {str(e)}")
             return False
     
-    def run_full_analysis(self) -> bool:
-        """Execute complete keyword intelligence pipeline."""
+    def run_full_analysis(self, progress: ProgressCallback | None = None, workers: int | None = None,
+                          shard_by: str = 'campaign') -> bool:
+        """
+        Execute complete keyword intelligence pipeline (optionally reporting progress events).
+        
+        With more than one worker, the audit, lost demand, match type and market
+        stages run sharded across a process pool (shard_by: 'campaign' or
+        'keyword') and their partial results are merged.
+        """
         if self.keywords_df is None or self.keywords_df.empty:
             print("ERROR: No keyword data loaded. Call load_keywords() first.")
             return False
         
+        tracker = ProgressTracker(7, progress)
+        tracker.rows = len(self.keywords_df)
+        
         print("\n" + "="*60)
         print("KEYWORD INTELLIGENCE ENGINE V2 - RUNNING ANALYSIS")
         print("="*60)
         
+        sharded = None
+        if workers is not None and workers > 1:
+            print(f"\nRunning row-level analyses on {workers} workers (sharded by {shard_by})...")
+            try:
+                sharded = run_sharded_analysis(self.keywords_df, workers=workers, by=shard_by)
+            except Exception as e:
+                print(f"WARNING: Sharded analysis failed, running in a single process: {str(e)}")
+        
         # 1. Keyword Health Audit
         print("\n[1/6] Running Keyword Health Audit...")
+        tracker.stage('Keyword health audit')
         try:
-            self.audit = KeywordAuditor(self.keywords_df)
-            audit_results = self.audit.audit_keyword_health()
+            if sharded is not None:
+                audit_results = sharded['audit']
+            else:
+                self.audit = KeywordAuditor(self.keywords_df)
+                audit_results = self.audit.audit_keyword_health()
             self.results['audit'] = audit_results
+            tracker.partial('keyword_audit', audit_results[:10])
             print(f"Found {len(audit_results)} issues across {len(audit_results)} keywords")
         except Exception as e:
             print(f"WARNING: Audit failed: {str(e)}")
@@ -71,9 +103,13 @@ class KeywordIntelligenceEngine:
         
         # 2. Lost Demand Detection
         print("\n[2/6] Detecting Lost Searches...")
+        tracker.stage('Detecting lost searches')
         try:
-            self.lost_demand = LostDemandDetector(self.keywords_df)
-            lost_searches = self.lost_demand.detect_lost_searches()
+            if sharded is not None:
+                lost_searches = sharded['lost_searches']
+            else:
+                self.lost_demand = LostDemandDetector(self.keywords_df, index=self.keyword_index)
+                lost_searches = self.lost_demand.detect_lost_searches()
             self.results['lost_searches'] = lost_searches
             print(f"Detected {len(lost_searches)} lost search opportunities")
         except Exception as e:
@@ -82,10 +118,15 @@ class KeywordIntelligenceEngine:
         
         # 3. Match Type Optimization
         print("\n[3/6] Analyzing Match Type Performance...")
+        tracker.stage('Match type analysis')
         try:
-            self.match_optimizer = MatchTypeOptimizer(self.keywords_df)
-            match_analysis = self.match_optimizer.analyze_match_type_performance()
-            match_recs = self.match_optimizer.recommend_match_type_changes()
+            if sharded is not None:
+                match_analysis = sharded['match_analysis']
+                match_recs = sharded['match_recommendations']
+            else:
+                self.match_optimizer = MatchTypeOptimizer(self.keywords_df)
+                match_analysis = self.match_optimizer.analyze_match_type_performance()
+                match_recs = self.match_optimizer.recommend_match_type_changes()
             self.results['match_analysis'] = match_analysis
             self.results['match_recommendations'] = match_recs
             print(f"Generated {len(match_recs)} match type recommendations")
@@ -95,12 +136,19 @@ class KeywordIntelligenceEngine:
         
         # 4. Market Insights
         print("\n[4/6] Identifying Market Opportunities...")
+        tracker.stage('Market opportunities')
         try:
-            self.market = MarketInsights(self.keywords_df)
-            trends = self.market.identify_trending_themes()
-            new_keywords = self.market.identify_new_keyword_opportunities()
-            location_opps = self.market.analyze_location_opportunity()
-            service_gaps = self.market.identify_service_gaps()
+            if sharded is not None:
+                trends = sharded['trends']
+                new_keywords = sharded['new_keywords']
+                location_opps = sharded['location_opportunities']
+                service_gaps = sharded['service_gaps']
+            else:
+                self.market = MarketInsights(self.keywords_df, index=self.keyword_index)
+                trends = self.market.identify_trending_themes()
+                new_keywords = self.market.identify_new_keyword_opportunities()
+                location_opps = self.market.analyze_location_opportunity()
+                service_gaps = self.market.identify_service_gaps()
             
             self.results['trends'] = trends
             self.results['new_keywords'] = new_keywords
@@ -114,6 +162,7 @@ class KeywordIntelligenceEngine:
         
         # 5. Website Alignment Analysis
         print("\n[5/7] Checking Website-Keyword Alignment...")
+        tracker.stage('Website alignment')
         try:
             from website_relevance_checker import WebsiteRelevanceChecker
             alignment_checker = WebsiteRelevanceChecker()
@@ -127,6 +176,7 @@ class KeywordIntelligenceEngine:
         
         # 6. Generate Recommendations
         print("\n[6/7] Generating Recommendations...")
+        tracker.stage('Generating recommendations')
         try:
             self.recommender = KeywordRecommender(
                 audit_issues=self.results.get('audit', []),
@@ -146,7 +196,9 @@ class KeywordIntelligenceEngine:
         
         # 7. Summary
         print("\n[7/7] Building Summary Report...")
+        tracker.stage('Building summary')
         self._build_summary_report()
+        tracker.complete()
         
         print("\n" + "="*60)
         print("ANALYSIS COMPLETE")
@@ -223,22 +275,15 @@ class KeywordIntelligenceEngine:
             # Convert dataframes to dict format
             export_data = {
                 'summary': self.results.get('summary', {}),
-                'audit_issues': [
-                    {k: (str(v) if pd.isna(v) else v) for k, v in issue.items()}
-                    for issue in self.results.get('audit', [])
-                ],
+                'audit_issues': self.results.get('audit', []),
                 'lost_searches': self.results.get('lost_searches', []),
                 'match_recommendations': self.results.get('match_recommendations', []),
                 'new_keywords': self.results.get('new_keywords', []),
                 'service_gaps': self.results.get('service_gaps', []),
-                'top_recommendations': [
-                    {k: (str(v) if pd.isna(v) else v) for k, v in rec.items()}
-                    for rec in self.results.get('recommendations', [])[:10]
-                ]
+                'top_recommendations': self.results.get('recommendations', [])[:10]
             }
             
-            with open(output_file, 'w') as f:
-                json.dump(export_data, f, indent=2)
+            write_json(output_file, export_data)
             
             print(f"SUCCESS: Results exported to {output_file}")
             return True
@@ -0,0 +1,97 @@
+"""
+Keyword Normalizer Module
+Single cleanup stage for keyword text. String work runs once per unique
+value and the canonical form is stored dictionary-encoded (categorical),
+so downstream modules reuse it instead of lowercasing every row again.
+"""
+
+import re
+import numpy as np
+import pandas as pd
+from typing import Callable
+
+# Google Ads exports wrap keywords in (sometimes tripled) double quotes
+_SURROUNDING_QUOTES = re.compile(r'^"+|"+$')
+_WHITESPACE = re.compile(r'\s+')
+_MATCH_SUFFIX = re.compile(r' match$')
+
+CANONICAL_COLUMN = 'keyword_norm'
+
+
+def clean_keyword(text: str) -> str:
+    """Display form of a keyword: quotes removed, whitespace collapsed, case kept."""
+    text = str(text).replace('"""', '"').strip()
+    return _WHITESPACE.sub(' ', _SURROUNDING_QUOTES.sub('', text)).strip()
+
+
+def canonical_keyword(text: str) -> str:
+    """Canonical form of a keyword: the display form, lowercased."""
+    return clean_keyword(text).lower()
+
+
+def _map_unique(values: pd.Series, func: Callable[[str], str]) -> pd.Categorical:
+    """Apply ``func`` to each distinct value and return the results dictionary-encoded."""
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    mapped = [func(u) for u in uniques]
+    # Distinct raw values can share a cleaned form ("Sofa" / " sofa "): re-intern them
+    mapped_codes, categories = pd.factorize(pd.Index(mapped, dtype=object))
+    final = np.full(len(codes), -1, dtype=np.int64)
+    valid = codes >= 0
+    final[valid] = mapped_codes[codes[valid]]
+    return pd.Categorical.from_codes(final, categories=pd.Index(categories, dtype=object))
+
+
+def clean_keyword_text(values: pd.Series) -> pd.Series:
+    """
+    Clean a keyword column for display.
+
+    Args:
+        values: Raw keyword values
+
+    Returns:
+        Series of cleaned strings (missing values stay missing)
+    """
+    cleaned = _map_unique(values, clean_keyword)
+    return pd.Series(cleaned, index=values.index, name=values.name).astype(object).where(values.notna(), None)
+
+
+def canonical_keywords(values: pd.Series) -> pd.Series:
+    """
+    Canonical keyword column: lowercased, quote-stripped, whitespace-collapsed.
+
+    Args:
+        values: Raw or cleaned keyword values
+
+    Returns:
+        Categorical Series whose categories are the distinct canonical keywords
+    """
+    return pd.Series(_map_unique(values, canonical_keyword), index=values.index, name=CANONICAL_COLUMN)
+
+
+def normalize_match_types(values: pd.Series) -> pd.Series:
+    """Lowercase match types and drop Google Ads' ' match' suffix ('Phrase match' -> 'phrase')."""
+    normalized = _map_unique(values.astype(str), lambda text: _MATCH_SUFFIX.sub('', text.lower().strip()))
+    return pd.Series(normalized, index=values.index, name=values.name).astype(str)
+
+
+def add_canonical_keywords(df: pd.DataFrame, column: str = 'keyword') -> pd.DataFrame:
+    """
+    Clean the keyword column in place and add its canonical categorical column.
+
+    Args:
+        df: Keyword rows
+        column: Keyword column to normalize
+
+    Returns:
+        The same DataFrame, with ``column`` cleaned and ``keyword_norm`` added
+    """
+    df[column] = clean_keyword_text(df[column].astype(object))
+    df[CANONICAL_COLUMN] = canonical_keywords(df[column])
+    return df
+
+
+def canonical_column(df: pd.DataFrame, column: str = 'keyword') -> pd.Series:
+    """The frame's canonical keyword column, computing it if the loader didn't."""
+    if CANONICAL_COLUMN in df.columns and column == 'keyword':
+        return df[CANONICAL_COLUMN]
+    return canonical_keywords(df[column])
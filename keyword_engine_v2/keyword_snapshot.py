@@ -0,0 +1,153 @@
+"""
+Keyword Snapshot Module
+Binary snapshot of a cleaned keyword table plus its derived metric columns,
+stored as uncompressed Arrow IPC. Repeat runs on the same export open the
+snapshot through a memory map instead of re-parsing and re-cleaning the CSV,
+and concurrent workers share its pages through the OS page cache.
+"""
+
+import hashlib
+import json
+import os
+import uuid
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+from config import KEYWORD_SNAPSHOTS
+from src.report_sources import report_name, split_source
+
+# Bumped whenever the cleaned table or the metric formulas change
+SNAPSHOT_VERSION = 2
+METADATA_KEY = b'keyword_snapshot'
+
+METRIC_COLUMNS = ['ctr', 'conversion_rate', 'cpa', 'cpc']
+
+
+def add_keyword_metrics(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add the per-keyword metrics the analysis modules use.
+
+    Args:
+        df: Cleaned keyword rows
+
+    Returns:
+        The same DataFrame with ctr, conversion_rate, cpa, cpc (and roas when
+        revenue is present) added
+    """
+    df['ctr'] = (df['clicks'] / df['impressions'] * 100).fillna(0)
+    df['conversion_rate'] = (df['conversions'] / df['clicks'] * 100).fillna(0)
+    df['cpa'] = (df['cost'] / df['conversions']).fillna(float('inf'))
+    df['cpc'] = (df['cost'] / df['clicks']).fillna(0)
+    if 'revenue' in df.columns:
+        df['roas'] = (df['revenue'] / df['cost']).fillna(0)
+        df['roas'] = df['roas'].replace([float('inf'), -float('inf')], 0)
+    return df
+
+
+def has_keyword_metrics(df: pd.DataFrame) -> bool:
+    """Whether the frame already carries the metrics add_keyword_metrics() computes."""
+    columns = set(df.columns)
+    return set(METRIC_COLUMNS) <= columns and ('revenue' not in columns or 'roas' in columns)
+
+
+class KeywordSnapshot:
+    """Cached Arrow IPC copy of one keyword export, invalidated when the export changes."""
+
+    SUFFIX = '.arrow'
+
+    def __init__(self, source: str, directory: str):
+        """
+        Initialize snapshot for a keyword export.
+
+        Args:
+            source: Path of the export (or archive member) the snapshot caches
+            directory: Directory holding snapshot files (created on first write)
+
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        if not HAS_PYARROW:
+            raise ImportError("Keyword snapshots require pyarrow (pip install pyarrow)")
+        self.source = str(source)
+        # One file per export path, so exports sharing a file name don't collide
+        resolved = str(Path(split_source(self.source)[0]).resolve()) + (split_source(self.source)[1] or '')
+        digest = hashlib.sha1(resolved.encode('utf-8')).hexdigest()[:12]
+        stem = Path(report_name(self.source)).stem
+        self.path = Path(directory) / f"{stem}-{digest}{self.SUFFIX}"
+
+    @classmethod
+    def from_config(cls, source: str) -> 'KeywordSnapshot | None':
+        """Build the snapshot configured in KEYWORD_SNAPSHOTS, or None when disabled or unavailable."""
+        if not KEYWORD_SNAPSHOTS.get('enabled'):
+            return None
+        if not HAS_PYARROW:
+            print("[WARN] Keyword snapshots enabled but pyarrow is not installed - skipping")
+            return None
+        root = Path(KEYWORD_SNAPSHOTS.get('path', 'snapshots'))
+        if not root.is_absolute():
+            root = Path(__file__).parent.parent / root
+        return cls(source, str(root))
+
+    def _fingerprint(self) -> dict:
+        """Identity of the export's current contents (size and modification time)."""
+        stat = Path(split_source(self.source)[0]).stat()
+        return {'version': SNAPSHOT_VERSION, 'source': self.source,
+                'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    def is_fresh(self) -> bool:
+        """Whether a snapshot exists and was written from the export as it is now."""
+        if not self.path.exists():
+            return False
+        try:
+            with pa.memory_map(str(self.path), 'r') as source:
+                metadata = pa.ipc.open_file(source).schema.metadata or {}
+            return json.loads(metadata.get(METADATA_KEY, b'{}')) == self._fingerprint()
+        except (pa.ArrowInvalid, OSError, ValueError):
+            return False
+
+    def write(self, df: pd.DataFrame) -> Path:
+        """
+        Write a cleaned keyword table, with its metric columns, as the snapshot.
+
+        Args:
+            df: Rows returned by KeywordLoader.load()
+
+        Returns:
+            Path of the snapshot file
+        """
+        frame = df if has_keyword_metrics(df) else add_keyword_metrics(df.copy())
+        table = pa.Table.from_pandas(frame, preserve_index=True)
+        metadata = dict(table.schema.metadata or {})
+        metadata[METADATA_KEY] = json.dumps(self._fingerprint()).encode('utf-8')
+        table = table.replace_schema_metadata(metadata)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f".{self.path.name}.{uuid.uuid4().hex}.tmp")
+        # Uncompressed record batches are what makes the memory-mapped read zero-copy
+        with pa.OSFile(str(tmp_path), 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, self.path)
+        return self.path
+
+    def read(self) -> pd.DataFrame:
+        """
+        Open the snapshot through a memory map.
+
+        Numeric columns without missing values are handed to pandas without
+        copying (read-only views of the mapped pages); text columns are
+        materialized.
+
+        Returns:
+            The cleaned keyword table with its metric columns
+        """
+        with pa.memory_map(str(self.path), 'r') as source:
+            table = pa.ipc.open_file(source).read_all()
+        return table.to_pandas(split_blocks=True)
@@ -6,53 +6,72 @@ Detects lost searches and demand gaps in keyword coverage.
 import pandas as pd
 from typing import List, Dict
 
+from keyword_index import KeywordIndex
+from keyword_snapshot import add_keyword_metrics, has_keyword_metrics
+
 
 class LostDemandDetector:
     """Detect lost searches and demand gaps."""
     
-    def __init__(self, df: pd.DataFrame):
+    # Lost search patterns, in the order their findings are reported
+    LOST_TYPES = ['IMPRESSION_NO_ENGAGEMENT', 'CLICK_NO_CONVERSION']
+    
+    def __init__(self, df: pd.DataFrame, index: KeywordIndex | None = None):
         """Initialize detector with keyword data."""
         self.df = df.copy()
+        if index is None or index.num_rows != len(self.df):
+            index = KeywordIndex.from_frame(self.df)
+        self.index = index
         self._calculate_metrics()
     
     def _calculate_metrics(self) -> None:
         """Calculate metrics for analysis."""
-        self.df['ctr'] = (self.df['clicks'] / self.df['impressions'] * 100).fillna(0)
-        self.df['conversion_rate'] = (self.df['conversions'] / self.df['clicks'] * 100).fillna(0)
+        # Shared with keyword snapshots, which store these already
+        if not has_keyword_metrics(self.df):
+            add_keyword_metrics(self.df)
     
     def detect_lost_searches(self) -> List[Dict]:
         """Detect potential lost search opportunities."""
         lost_searches = []
         
+        # One pass per pattern, so findings are grouped by lost type in row order
+        for lost_type in self.LOST_TYPES:
+            for idx, row in self.df.iterrows():
+                finding = self._lost_search(row, lost_type)
+                if finding is not None:
+                    lost_searches.append(finding)
+        
+        return lost_searches
+    
+    def _lost_search(self, row, lost_type: str) -> Dict | None:
+        """Lost search finding of one pattern for a single keyword row (None if it doesn't apply)."""
         # Pattern 1: High impressions but low CTR
-        for idx, row in self.df.iterrows():
-            if row['impressions'] > 100 and row['ctr'] < 1.0:
-                lost_searches.append({
-                    'keyword': row['keyword'],
-                    'campaign': row['campaign_name'],
-                    'match_type': row['match_type'],
-                    'lost_type': 'IMPRESSION_NO_ENGAGEMENT',
-                    'severity': 'High',
-                    'description': f"Getting {int(row['impressions'])} impressions but CTR only {row['ctr']:.2f}% - users not clicking",
-                    'potential_searches_lost': int(row['impressions'] * (1 - row['ctr'] / 100)),
-                    'recommendation': 'Improve ad copy relevance or consider exact-match conversion'
-                })
+        if lost_type == 'IMPRESSION_NO_ENGAGEMENT' and row['impressions'] > 100 and row['ctr'] < 1.0:
+            return {
+                'keyword': row['keyword'],
+                'campaign': row['campaign_name'],
+                'match_type': row['match_type'],
+                'lost_type': 'IMPRESSION_NO_ENGAGEMENT',
+                'severity': 'High',
+                'description': f"Getting {int(row['impressions'])} impressions but CTR only {row['ctr']:.2f}% - users not clicking",
+                'potential_searches_lost': int(row['impressions'] * (1 - row['ctr'] / 100)),
+                'recommendation': 'Improve ad copy relevance or consider exact-match conversion'
+            }
         
         # Pattern 2: Clicks but no conversions
-        for idx, row in self.df.iterrows():
-            if row['clicks'] > 10 and row['conversions'] == 0:
-                lost_searches.append({
-                    'keyword': row['keyword'],
-                    'campaign': row['campaign_name'],
-                    'match_type': row['match_type'],
-                    'lost_type': 'CLICK_NO_CONVERSION',
-                    'severity': 'High',
-                    'description': f"Getting {int(row['clicks'])} clicks but zero conversions - funnel issue",
-                    'potential_searches_lost': int(row['clicks']),
-                    'recommendation': 'Check landing page relevance or adjust targeting'
-                })
+        if lost_type == 'CLICK_NO_CONVERSION' and row['clicks'] > 10 and row['conversions'] == 0:
+            return {
+                'keyword': row['keyword'],
+                'campaign': row['campaign_name'],
+                'match_type': row['match_type'],
+                'lost_type': 'CLICK_NO_CONVERSION',
+                'severity': 'High',
+                'description': f"Getting {int(row['clicks'])} clicks but zero conversions - funnel issue",
+                'potential_searches_lost': int(row['clicks']),
+                'recommendation': 'Check landing page relevance or adjust targeting'
+            }
         
-        return lost_searches
+        return None
     
     def detect_match_type_gaps(self) -> List[Dict]:
         """Detect gaps in match type coverage."""
@@ -138,7 +157,7 @@ class LostDemandDetector:
         gaps = []
         
         for intent_keyword in high_intent_keywords:
-            matching_keywords = self.df[self.df['keyword'].str.contains(intent_keyword, case=False, na=False)]
+            matching_keywords = self.df.iloc[self.index.rows_matching(intent_keyword)]
             
             if len(matching_keywords) == 0:
                 gaps.append({
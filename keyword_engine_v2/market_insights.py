@@ -6,6 +6,10 @@ Infers market trends and identifies keyword opportunities.
 import pandas as pd
 from typing import List, Dict, Set
 
+from keyword_index import KeywordIndex
+from keyword_normalizer import canonical_column
+from keyword_snapshot import add_keyword_metrics, has_keyword_metrics
+
 
 class MarketInsights:
     """Generate market insights and opportunity identification."""
@@ -23,80 +27,115 @@ class MarketInsights:
         'corporate': ['corporate', 'business', 'office', 'company']
     }
     
-    def __init__(self, df: pd.DataFrame):
+    LOCATION_TERMS = ['dubai', 'sharjah', 'abu dhabi', 'uae', 'near me']
+    
+    CORE_SERVICES = ['sofa cleaning', 'carpet cleaning', 'curtain cleaning', 'corporate laundry']
+    
+    # Keyword extensions suggested when missing: (keyword, search intent)
+    NEW_KEYWORD_SUGGESTIONS = [
+        ('express laundry', 'High-intent same-day laundry searches'),
+        ('same-day dry cleaning', 'Urgent laundry needs'),
+        ('premium curtain cleaning', 'High-value service upsell'),
+        ('sofa cleaning near me', 'Local furniture cleaning'),
+        ('corporate laundry service', 'B2B laundry opportunities'),
+        ('carpet cleaning dubai', 'Location-specific service'),
+        ('laundry pickup delivery', 'Convenience-focused searches'),
+        ('eco-friendly dry cleaning', 'Sustainability angle'),
+        ('white shirt laundry', 'Premium garment care'),
+        ('wedding dress cleaning', 'Special occasion services')
+    ]
+    
+    def __init__(self, df: pd.DataFrame, index: KeywordIndex | None = None):
         """Initialize market insights analyzer."""
         self.df = df.copy()
+        if index is None or index.num_rows != len(self.df):
+            index = KeywordIndex.from_frame(self.df)
+        self.index = index
         self._calculate_metrics()
     
     def _calculate_metrics(self) -> None:
         """Calculate metrics."""
-        self.df['ctr'] = (self.df['clicks'] / self.df['impressions'] * 100).fillna(0)
-        self.df['conversion_rate'] = (self.df['conversions'] / self.df['clicks'] * 100).fillna(0)
-        self.df['cpa'] = (self.df['cost'] / self.df['conversions']).fillna(float('inf'))
+        # Shared with keyword snapshots, which store these already
+        if not has_keyword_metrics(self.df):
+            add_keyword_metrics(self.df)
     
     def identify_trending_themes(self) -> List[Dict]:
         """Identify trending keyword themes."""
-        trends = []
+        return self.trends_from_totals(self.theme_totals())
+    
+    def theme_totals(self) -> Dict[str, Dict]:
+        """Keyword count and summed impressions, clicks and conversions of each theme with matching keywords."""
+        totals = {}
         
         for theme_name, theme_keywords in self.SERVICE_THEMES.items():
             # Find keywords matching this theme
-            matching_keywords = self.df[
-                self.df['keyword'].str.lower().str.contains('|'.join(theme_keywords), case=False, na=False)
-            ]
+            matching_keywords = self.df.iloc[self.index.rows_matching(theme_keywords)]
             
             if len(matching_keywords) > 0:
-                total_impressions = matching_keywords['impressions'].sum()
-                total_clicks = matching_keywords['clicks'].sum()
-                total_conversions = matching_keywords['conversions'].sum()
-                
-                ctr = (total_clicks / total_impressions * 100) if total_impressions > 0 else 0
-                cvr = (total_conversions / total_clicks * 100) if total_clicks > 0 else 0
-                
-                # Determine trend direction (simplified)
-                if total_conversions > 5:
-                    trend_strength = 'strong'
-                elif total_conversions > 0:
-                    trend_strength = 'moderate'
-                else:
-                    trend_strength = 'weak'
-                
-                trends.append({
-                    'theme': theme_name,
+                totals[theme_name] = {
                     'keyword_count': len(matching_keywords),
-                    'total_impressions': int(total_impressions),
-                    'total_clicks': int(total_clicks),
-                    'ctr': round(ctr, 2),
-                    'total_conversions': int(total_conversions),
-                    'conversion_rate': round(cvr, 2),
-                    'trend_strength': trend_strength,
-                    'opportunity_level': 'High' if total_impressions > 500 and cvr > 2 else 'Medium' if total_impressions > 100 else 'Low'
-                })
+                    'impressions': matching_keywords['impressions'].sum(),
+                    'clicks': matching_keywords['clicks'].sum(),
+                    'conversions': matching_keywords['conversions'].sum()
+                }
+        
+        return totals
+    
+    @classmethod
+    def trends_from_totals(cls, totals: Dict[str, Dict]) -> List[Dict]:
+        """Theme trends from summed theme totals, strongest first."""
+        trends = []
+        
+        for theme_name in cls.SERVICE_THEMES:
+            if theme_name not in totals:
+                continue
+            total = totals[theme_name]
+            total_impressions = total['impressions']
+            total_clicks = total['clicks']
+            total_conversions = total['conversions']
+            
+            ctr = (total_clicks / total_impressions * 100) if total_impressions > 0 else 0
+            cvr = (total_conversions / total_clicks * 100) if total_clicks > 0 else 0
+            
+            # Determine trend direction (simplified)
+            if total_conversions > 5:
+                trend_strength = 'strong'
+            elif total_conversions > 0:
+                trend_strength = 'moderate'
+            else:
+                trend_strength = 'weak'
+            
+            trends.append({
+                'theme': theme_name,
+                'keyword_count': total['keyword_count'],
+                'total_impressions': int(total_impressions),
+                'total_clicks': int(total_clicks),
+                'ctr': round(ctr, 2),
+                'total_conversions': int(total_conversions),
+                'conversion_rate': round(cvr, 2),
+                'trend_strength': trend_strength,
+                'opportunity_level': 'High' if total_impressions > 500 and cvr > 2 else 'Medium' if total_impressions > 100 else 'Low'
+            })
         
         return sorted(trends, key=lambda x: x['total_conversions'], reverse=True)
     
     def identify_new_keyword_opportunities(self) -> List[Dict]:
         """Identify potential new keyword opportunities."""
-        opportunities = []
-        
+        return self.opportunities_from_existing(self.existing_suggestions())
+    
+    def existing_suggestions(self) -> Set[str]:
+        """Suggested keywords the account already has."""
         # Analyze existing themes to suggest extensions
-        existing_keywords = set(self.df['keyword'].str.lower().unique())
-        
-        # Generate new keyword combinations
-        new_combinations = [
-            ('express laundry', 'High-intent same-day laundry searches'),
-            ('same-day dry cleaning', 'Urgent laundry needs'),
-            ('premium curtain cleaning', 'High-value service upsell'),
-            ('sofa cleaning near me', 'Local furniture cleaning'),
-            ('corporate laundry service', 'B2B laundry opportunities'),
-            ('carpet cleaning dubai', 'Location-specific service'),
-            ('laundry pickup delivery', 'Convenience-focused searches'),
-            ('eco-friendly dry cleaning', 'Sustainability angle'),
-            ('white shirt laundry', 'Premium garment care'),
-            ('wedding dress cleaning', 'Special occasion services')
-        ]
+        existing_keywords = set(canonical_column(self.df).dropna().unique())
+        return {keyword.lower() for keyword, _ in self.NEW_KEYWORD_SUGGESTIONS if keyword.lower() in existing_keywords}
+    
+    @classmethod
+    def opportunities_from_existing(cls, existing: Set[str]) -> List[Dict]:
+        """New keyword opportunities: the suggestions not already in the account."""
+        opportunities = []
         
-        for keyword, intent in new_combinations:
-            if keyword.lower() not in existing_keywords:
+        for keyword, intent in cls.NEW_KEYWORD_SUGGESTIONS:
+            if keyword.lower() not in existing:
                 opportunities.append({
                     'suggested_keyword': keyword,
                     'intent_type': intent,
@@ -111,21 +150,28 @@ class MarketInsights:
     
     def analyze_location_opportunity(self) -> List[Dict]:
         """Analyze location-specific opportunities."""
-        opportunities = []
-        
+        return self.location_from_totals(self.location_totals())
+    
+    def location_totals(self) -> Dict:
+        """Keyword count and summed impressions and conversions of location keywords."""
         # Check if location keywords exist
-        location_keywords = self.df[
-            self.df['keyword'].str.lower().str.contains('dubai|sharjah|abu dhabi|uae|near me', case=False, na=False)
-        ]
+        location_keywords = self.df.iloc[self.index.rows_matching(self.LOCATION_TERMS)]
+        return {
+            'keyword_count': len(location_keywords),
+            'impressions': location_keywords['impressions'].sum(),
+            'conversions': location_keywords['conversions'].sum()
+        }
+    
+    @staticmethod
+    def location_from_totals(totals: Dict) -> List[Dict]:
+        """Location opportunities from summed location keyword totals."""
+        opportunities = []
         
-        if len(location_keywords) > 0:
-            total_impressions = location_keywords['impressions'].sum()
-            total_conversions = location_keywords['conversions'].sum()
-            
+        if totals['keyword_count'] > 0:
             opportunities.append({
                 'location_focus': 'Current location keywords',
-                'total_impressions': int(total_impressions),
-                'total_conversions': int(total_conversions),
+                'total_impressions': int(totals['impressions']),
+                'total_conversions': int(totals['conversions']),
                 'status': 'Active',
                 'recommendation': 'Increase bids for high-performing location keywords'
             })
@@ -147,16 +193,21 @@ class MarketInsights:
     
     def identify_service_gaps(self) -> List[Dict]:
         """Identify services not well represented in keywords."""
+        return self.service_gaps_from_counts(self.service_keyword_counts())
+    
+    def service_keyword_counts(self) -> Dict[str, int]:
+        """Number of keywords mentioning each core service."""
+        return {service: self.index.count(service) for service in self.CORE_SERVICES}
+    
+    @classmethod
+    def service_gaps_from_counts(cls, counts: Dict[str, int]) -> List[Dict]:
+        """Service gaps from per-service keyword counts."""
         gaps = []
         
-        services = ['sofa cleaning', 'carpet cleaning', 'curtain cleaning', 'corporate laundry']
-        
-        for service in services:
-            service_keywords = self.df[
-                self.df['keyword'].str.lower().str.contains(service, case=False, na=False)
-            ]
+        for service in cls.CORE_SERVICES:
+            keyword_count = counts.get(service, 0)
             
-            if len(service_keywords) == 0:
+            if keyword_count == 0:
                 gaps.append({
                     'service': service,
                     'gap_type': 'MISSING_SERVICE_KEYWORDS',
@@ -169,16 +220,14 @@ class MarketInsights:
                         f"professional {service}"
                     ]
                 })
-            else:
-                keyword_count = len(service_keywords)
-                if keyword_count < 3:
-                    gaps.append({
-                        'service': service,
-                        'gap_type': 'INSUFFICIENT_COVERAGE',
-                        'severity': 'Medium',
-                        'current_keywords': keyword_count,
-                        'recommendation': f"Expand {service} keyword coverage",
-                        'suggested_additions': f"Add {3 - keyword_count} more keyword variants"
-                    })
+            elif keyword_count < 3:
+                gaps.append({
+                    'service': service,
+                    'gap_type': 'INSUFFICIENT_COVERAGE',
+                    'severity': 'Medium',
+                    'current_keywords': keyword_count,
+                    'recommendation': f"Expand {service} keyword coverage",
+                    'suggested_additions': f"Add {3 - keyword_count} more keyword variants"
+                })
         
         return gaps
@@ -5,11 +5,15 @@ Analyzes and optimizes keyword match type strategy.
 
 import pandas as pd
 from typing import List, Dict
+from keyword_snapshot import add_keyword_metrics, has_keyword_metrics
 
 
 class MatchTypeOptimizer:
     """Optimize keyword match type strategy."""
     
+    # Match types whose keywords get recommendations, in the order they are reported
+    RECOMMENDATION_ORDER = ['broad', 'phrase', 'exact']
+    
     def __init__(self, df: pd.DataFrame):
         """Initialize optimizer with keyword data."""
         self.df = df.copy()
@@ -17,22 +21,40 @@ class MatchTypeOptimizer:
     
     def _calculate_metrics(self) -> None:
         """Calculate metrics for analysis."""
-        self.df['ctr'] = (self.df['clicks'] / self.df['impressions'] * 100).fillna(0)
-        self.df['conversion_rate'] = (self.df['conversions'] / self.df['clicks'] * 100).fillna(0)
-        self.df['cpa'] = (self.df['cost'] / self.df['conversions']).fillna(float('inf'))
-        self.df['cpc'] = (self.df['cost'] / self.df['clicks']).fillna(0)
+        # Shared with keyword snapshots, which store these already
+        if not has_keyword_metrics(self.df):
+            add_keyword_metrics(self.df)
     
     def analyze_match_type_performance(self) -> Dict:
         """Analyze performance by match type."""
-        performance = {}
+        return self.performance_from_totals(self.match_type_totals())
+    
+    def match_type_totals(self) -> Dict[str, Dict]:
+        """Summed keyword count, impressions, clicks, cost and conversions per match type (first-seen order)."""
+        totals = {}
         
         for match_type in self.df['match_type'].unique():
             match_data = self.df[self.df['match_type'] == match_type]
-            
-            total_impressions = match_data['impressions'].sum()
-            total_clicks = match_data['clicks'].sum()
-            total_cost = match_data['cost'].sum()
-            total_conversions = match_data['conversions'].sum()
+            totals[match_type] = {
+                'keywords_count': len(match_data),
+                'impressions': match_data['impressions'].sum(),
+                'clicks': match_data['clicks'].sum(),
+                'cost': match_data['cost'].sum(),
+                'conversions': match_data['conversions'].sum()
+            }
+        
+        return totals
+    
+    @staticmethod
+    def performance_from_totals(totals: Dict[str, Dict]) -> Dict:
+        """Performance metrics per match type from summed totals."""
+        performance = {}
+        
+        for match_type, total in totals.items():
+            total_impressions = total['impressions']
+            total_clicks = total['clicks']
+            total_cost = total['cost']
+            total_conversions = total['conversions']
             
             ctr = (total_clicks / total_impressions * 100) if total_impressions > 0 else 0
             conversion_rate = (total_conversions / total_clicks * 100) if total_clicks > 0 else 0
@@ -40,7 +62,7 @@ class MatchTypeOptimizer:
             cpc = (total_cost / total_clicks) if total_clicks > 0 else 0
             
             performance[match_type] = {
-                'keywords_count': len(match_data),
+                'keywords_count': total['keywords_count'],
                 'impressions': int(total_impressions),
                 'clicks': int(total_clicks),
                 'ctr': round(ctr, 2),
@@ -56,75 +78,81 @@ class MatchTypeOptimizer:
     def recommend_match_type_changes(self) -> List[Dict]:
         """Recommend match type conversions."""
         recommendations = []
+        df = self._numeric_rates()
+        
+        # Broad, then phrase, then exact match keywords
+        for match_type in self.RECOMMENDATION_ORDER:
+            for idx, row in df[df['match_type'] == match_type].iterrows():
+                recommendation = self._match_type_change(row)
+                if recommendation is not None:
+                    recommendations.append(recommendation)
         
+        return recommendations
+    
+    def _numeric_rates(self) -> pd.DataFrame:
+        """Copy of the data with conversion_rate as a number."""
         # Convert conversion_rate to numeric if it's a string
         df = self.df.copy()
         if df['conversion_rate'].dtype == 'object':
             df['conversion_rate'] = df['conversion_rate'].astype(str).str.replace('%', '').str.strip()
             df['conversion_rate'] = pd.to_numeric(df['conversion_rate'], errors='coerce').fillna(0)
-        
-        # Analyze broad match keywords
-        broad_keywords = df[df['match_type'] == 'broad']
-        for idx, row in broad_keywords.iterrows():
-            if row['clicks'] > 5:
-                if row['conversion_rate'] > 2.0:
-                    # High performer - should be exact
-                    recommendations.append({
-                        'keyword': row['keyword'],
-                        'campaign': row['campaign_name'],
-                        'current_match_type': 'broad',
-                        'recommended_match_type': 'exact',
-                        'reason': f"Broad match converting well (CVR: {row['conversion_rate']:.2f}%) - should be exact for better control",
-                        'expected_impact': 'Higher conversion rate, better CPA',
-                        'confidence': 'High',
-                        'action': 'Convert to Exact match'
-                    })
-                elif row['ctr'] < 1.0 and row['impressions'] > 100:
-                    # Low performer - too broad
-                    recommendations.append({
-                        'keyword': row['keyword'],
-                        'campaign': row['campaign_name'],
-                        'current_match_type': 'broad',
-                        'recommended_match_type': 'phrase',
-                        'reason': f"Broad match getting low CTR ({row['ctr']:.2f}%) - refine to Phrase",
-                        'expected_impact': 'Better intent matching, higher CTR',
-                        'confidence': 'High',
-                        'action': 'Convert to Phrase match'
-                    })
-        
-        # Analyze phrase match keywords
-        phrase_keywords = df[df['match_type'] == 'phrase']
-        for idx, row in phrase_keywords.iterrows():
-            if row['clicks'] > 10 and row['conversion_rate'] > 3.0:
+        return df
+    
+    def _match_type_change(self, row) -> Dict | None:
+        """Match type recommendation for a single keyword row (None if it should stay as is)."""
+        if row['match_type'] == 'broad' and row['clicks'] > 5:
+            if row['conversion_rate'] > 2.0:
                 # High performer - should be exact
-                recommendations.append({
+                return {
                     'keyword': row['keyword'],
                     'campaign': row['campaign_name'],
-                    'current_match_type': 'phrase',
+                    'current_match_type': 'broad',
                     'recommended_match_type': 'exact',
-                    'reason': f"Phrase match converting well (CVR: {row['conversion_rate']:.2f}%) - should be exact",
-                    'expected_impact': 'Better ROI, lower CPA',
+                    'reason': f"Broad match converting well (CVR: {row['conversion_rate']:.2f}%) - should be exact for better control",
+                    'expected_impact': 'Higher conversion rate, better CPA',
                     'confidence': 'High',
                     'action': 'Convert to Exact match'
-                })
-        
-        # Analyze exact match keywords
-        exact_keywords = self.df[self.df['match_type'] == 'exact']
-        for idx, row in exact_keywords.iterrows():
-            if row['clicks'] > 0 and row['conversion_rate'] < 0.5 and row['ctr'] > 2.0:
-                # Traffic but low conversion - landing page issue
-                recommendations.append({
+                }
+            if row['ctr'] < 1.0 and row['impressions'] > 100:
+                # Low performer - too broad
+                return {
                     'keyword': row['keyword'],
                     'campaign': row['campaign_name'],
-                    'current_match_type': 'exact',
-                    'recommended_match_type': 'exact',
-                    'reason': f"Exact match with good CTR ({row['ctr']:.2f}%) but low CVR - landing page issue",
-                    'expected_impact': 'Improved conversion rate',
-                    'confidence': 'Medium',
-                    'action': 'Check landing page relevance'
-                })
+                    'current_match_type': 'broad',
+                    'recommended_match_type': 'phrase',
+                    'reason': f"Broad match getting low CTR ({row['ctr']:.2f}%) - refine to Phrase",
+                    'expected_impact': 'Better intent matching, higher CTR',
+                    'confidence': 'High',
+                    'action': 'Convert to Phrase match'
+                }
         
-        return recommendations
+        if row['match_type'] == 'phrase' and row['clicks'] > 10 and row['conversion_rate'] > 3.0:
+            # High performer - should be exact
+            return {
+                'keyword': row['keyword'],
+                'campaign': row['campaign_name'],
+                'current_match_type': 'phrase',
+                'recommended_match_type': 'exact',
+                'reason': f"Phrase match converting well (CVR: {row['conversion_rate']:.2f}%) - should be exact",
+                'expected_impact': 'Better ROI, lower CPA',
+                'confidence': 'High',
+                'action': 'Convert to Exact match'
+            }
+        
+        if row['match_type'] == 'exact' and row['clicks'] > 0 and row['conversion_rate'] < 0.5 and row['ctr'] > 2.0:
+            # Traffic but low conversion - landing page issue
+            return {
+                'keyword': row['keyword'],
+                'campaign': row['campaign_name'],
+                'current_match_type': 'exact',
+                'recommended_match_type': 'exact',
+                'reason': f"Exact match with good CTR ({row['ctr']:.2f}%) but low CVR - landing page issue",
+                'expected_impact': 'Improved conversion rate',
+                'confidence': 'Medium',
+                'action': 'Check landing page relevance'
+            }
+        
+        return None
     
     def get_best_match_type_keywords(self) -> List[Dict]:
         """Get best performing keywords by match type."""
@@ -0,0 +1,211 @@
+"""
+Sharded Analysis Module
+Map-reduce mode of the keyword pipeline for very large accounts. The
+keyword table is partitioned by campaign (or by keyword hash) across a
+process pool, each shard runs the row-local detectors, and a merge step
+reduces the partial results into what a single-process run returns.
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List
+
+from keyword_audit import KeywordAuditor
+from lost_demand_detector import LostDemandDetector
+from match_type_optimizer import MatchTypeOptimizer
+from market_insights import MarketInsights
+from keyword_normalizer import canonical_column
+
+SHARD_KEYS = ('campaign', 'keyword')
+
+
+def partition(df: pd.DataFrame, shards: int, by: str = 'campaign') -> List[np.ndarray]:
+    """
+    Split keyword rows into shards.
+
+    Args:
+        df: Keyword rows
+        shards: Number of shards wanted
+        by: 'campaign' keeps each campaign in one shard (largest campaigns are
+            placed first, each on the least loaded shard); 'keyword' spreads
+            rows by a hash of the canonical keyword
+
+    Returns:
+        Ascending row positions of each non-empty shard
+
+    Raises:
+        ValueError: If ``by`` is not a known shard key
+    """
+    if by not in SHARD_KEYS:
+        raise ValueError(f"Unknown shard key '{by}' (use {', '.join(SHARD_KEYS)})")
+    shards = max(1, min(shards, len(df)))
+
+    if by == 'campaign':
+        codes, uniques = pd.factorize(df['campaign_name'], use_na_sentinel=False)
+        sizes = np.bincount(codes, minlength=len(uniques))
+        loads = np.zeros(shards, dtype=np.int64)
+        assignment = np.empty(len(uniques), dtype=np.int64)
+        for campaign in np.argsort(-sizes, kind='stable'):
+            target = int(np.argmin(loads))
+            assignment[campaign] = target
+            loads[target] += sizes[campaign]
+        shard_of_row = assignment[codes]
+    else:
+        hashes = pd.util.hash_pandas_object(canonical_column(df), index=False).to_numpy()
+        shard_of_row = (hashes % np.uint64(shards)).astype(np.int64)
+
+    positions = [np.flatnonzero(shard_of_row == shard) for shard in range(shards)]
+    return [rows for rows in positions if len(rows)]
+
+
+def _tagged(frame: pd.DataFrame, finding) -> List[tuple]:
+    """(row position, finding) pairs for every row a finding function reports on."""
+    pairs = []
+    for position, row in frame.iterrows():
+        result = finding(row)
+        for item in (result if isinstance(result, list) else [result]):
+            if item is not None:
+                pairs.append((position, item))
+    return pairs
+
+
+def analyze_shard(shard: pd.DataFrame) -> Dict:
+    """
+    Run the row-local detectors on one shard (runs in a worker).
+
+    Args:
+        shard: Keyword rows whose index holds their position in the full table
+
+    Returns:
+        Position-tagged findings and summed totals for merge_partials()
+    """
+    auditor = KeywordAuditor(shard)
+    detector = LostDemandDetector(shard)
+    optimizer = MatchTypeOptimizer(shard)
+    market = MarketInsights(shard)
+
+    rates = optimizer._numeric_rates()
+    match_totals = optimizer.match_type_totals()
+    match_types = optimizer.df['match_type']
+    return {
+        'audit': auditor.audit_findings(),
+        'lost_searches': {
+            lost_type: _tagged(detector.df, lambda row: detector._lost_search(row, lost_type))
+            for lost_type in LostDemandDetector.LOST_TYPES
+        },
+        'match_recommendations': {
+            match_type: _tagged(rates[rates['match_type'] == match_type], optimizer._match_type_change)
+            for match_type in MatchTypeOptimizer.RECOMMENDATION_ORDER
+        },
+        'match_totals': match_totals,
+        'match_first_seen': {match_type: int(match_types.index[match_types == match_type][0])
+                             for match_type in match_totals},
+        'theme_totals': market.theme_totals(),
+        'location_totals': market.location_totals(),
+        'service_counts': market.service_keyword_counts(),
+        'existing_suggestions': market.existing_suggestions(),
+    }
+
+
+def _sum_totals(partials: List[Dict[str, Dict]]) -> Dict[str, Dict]:
+    """Add up per-key totals from each shard (keys in first-seen shard order)."""
+    merged: Dict[str, Dict] = {}
+    for totals in partials:
+        for key, total in totals.items():
+            if key in merged:
+                merged[key] = {field: merged[key][field] + value for field, value in total.items()}
+            else:
+                merged[key] = dict(total)
+    return merged
+
+
+def _in_row_order(tagged: List[List[tuple]]) -> List[Dict]:
+    """Findings from every shard, in the row order of the full table."""
+    pairs = [pair for shard_pairs in tagged for pair in shard_pairs]
+    # Stable: several findings of the same row keep their order
+    pairs.sort(key=lambda pair: pair[0])
+    return [finding for _, finding in pairs]
+
+
+def merge_partials(partials: List[Dict]) -> Dict:
+    """
+    Reduce shard results into the results of a single-process run.
+
+    Args:
+        partials: analyze_shard() results
+
+    Returns:
+        Dict with audit, lost_searches, match_analysis, match_recommendations,
+        trends, new_keywords, location_opportunities and service_gaps
+    """
+    audit = KeywordAuditor.rank_issues(_in_row_order([p['audit'] for p in partials]))
+    lost_searches = [
+        finding for lost_type in LostDemandDetector.LOST_TYPES
+        for finding in _in_row_order([p['lost_searches'][lost_type] for p in partials])
+    ]
+    match_recommendations = [
+        rec for match_type in MatchTypeOptimizer.RECOMMENDATION_ORDER
+        for rec in _in_row_order([p['match_recommendations'][match_type] for p in partials])
+    ]
+
+    # Match types are reported in the order they first appear in the table
+    match_totals = _sum_totals([p['match_totals'] for p in partials])
+    first_seen = {}
+    for p in partials:
+        for match_type, position in p['match_first_seen'].items():
+            first_seen[match_type] = min(position, first_seen.get(match_type, position))
+    match_totals = {match_type: match_totals[match_type] for match_type in sorted(match_totals, key=first_seen.get)}
+
+    service_counts: Dict[str, int] = {}
+    for p in partials:
+        for service, count in p['service_counts'].items():
+            service_counts[service] = service_counts.get(service, 0) + count
+
+    return {
+        'audit': audit,
+        'lost_searches': lost_searches,
+        'match_analysis': MatchTypeOptimizer.performance_from_totals(match_totals),
+        'match_recommendations': match_recommendations,
+        'trends': MarketInsights.trends_from_totals(_sum_totals([p['theme_totals'] for p in partials])),
+        'new_keywords': MarketInsights.opportunities_from_existing(
+            set().union(*(p['existing_suggestions'] for p in partials))),
+        'location_opportunities': MarketInsights.location_from_totals(
+            _sum_totals([{'location': p['location_totals']} for p in partials])['location']),
+        'service_gaps': MarketInsights.service_gaps_from_counts(service_counts),
+    }
+
+
+def run_sharded_analysis(df: pd.DataFrame, workers: int | None = None, by: str = 'campaign',
+                         use_processes: bool = True) -> Dict:
+    """
+    Run the row-level keyword analyses over shards in parallel.
+
+    Args:
+        df: Cleaned keyword rows (KeywordLoader output)
+        workers: Worker count, also the shard count (default: CPU count)
+        by: Shard key, 'campaign' or 'keyword' (see partition())
+        use_processes: Use a process pool (threads only help when detectors release the GIL)
+
+    Returns:
+        Merged results (see merge_partials())
+    """
+    workers = workers or os.cpu_count() or 1
+    # Shard rows carry their position in the full table as their index
+    frame = df.reset_index(drop=True)
+    shards = [frame.iloc[rows] for rows in partition(frame, workers, by)]
+
+    if len(shards) <= 1:
+        return merge_partials([analyze_shard(shard) for shard in shards or [frame]])
+
+    with _create_executor(min(workers, len(shards)), use_processes) as executor:
+        partials = list(executor.map(analyze_shard, shards))
+    return merge_partials(partials)
+
+
+def _create_executor(workers: int, use_processes: bool) -> Executor:
+    """Create the worker pool shards are analyzed in."""
+    if use_processes:
+        return ProcessPoolExecutor(max_workers=workers)
+    return ThreadPoolExecutor(max_workers=workers)
@@ -6,6 +6,8 @@ Aligns keywords with actual services offered on website.
 import pandas as pd
 from typing import Dict, List
 
+from keyword_normalizer import canonical_column
+
 
 class WebsiteRelevanceChecker:
     """Check alignment of keywords with website services."""
@@ -60,24 +62,30 @@ class WebsiteRelevanceChecker:
         """Check how well keywords align with actual services."""
         alignment_results = []
         
-        for _, row in keywords_df.iterrows():
-            keyword = row['keyword'].lower()
-            campaign = row.get('campaign', 'Unknown')
-            
+        # Service matching runs once per distinct canonical keyword, not once per row
+        canonical = canonical_column(keywords_df)
+        matches = {}
+        for keyword in canonical.dropna().unique():
             aligned_service = self._find_aligned_service(keyword)
+            strength = self._calculate_alignment_strength(keyword, aligned_service) if aligned_service else 0.0
+            matches[keyword] = (aligned_service, strength)
+        
+        campaigns = keywords_df['campaign'] if 'campaign' in keywords_df.columns else pd.Series('Unknown', index=keywords_df.index)
+        for display, keyword, campaign in zip(keywords_df['keyword'], canonical, campaigns):
+            aligned_service, strength = matches.get(keyword, (None, 0.0))
             
             if aligned_service:
                 alignment = {
-                    'keyword': row['keyword'],
+                    'keyword': display,
                     'campaign': campaign,
                     'aligned_service': aligned_service['name'],
-                    'alignment_strength': self._calculate_alignment_strength(keyword, aligned_service),
+                    'alignment_strength': strength,
                     'status': 'ALIGNED',
                     'issue': None
                 }
             else:
                 alignment = {
-                    'keyword': row['keyword'],
+                    'keyword': display,
                     'campaign': campaign,
                     'aligned_service': None,
                     'alignment_strength': 0.0,
@@ -17,6 +17,7 @@ if sys.platform == 'win32':
 sys.path.insert(0, str(Path(__file__).parent))
 
 from src.data_loader import DataLoader
+from src.history_store import HistoryStore
 from src.analyzer import PerformanceAnalyzer
 from src.recommender import RecommendationEngine
 
@@ -58,7 +59,7 @@ class ChampionCleanersBot:
                 print("📊 STEP 1: Loading and Validating Data")
                 print("-" * 80)
             
-            self.loader = DataLoader(self.csv_filepath)
+            self.loader = DataLoader(self.csv_filepath, history=HistoryStore.from_config())
             self.df = self.loader.load()
             
             is_valid, warnings, errors = self.loader.validate_data_quality()
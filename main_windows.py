@@ -12,23 +12,30 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from src.data_loader import DataLoader
+from src.history_store import HistoryStore
 from src.analyzer import PerformanceAnalyzer
 from src.recommender import RecommendationEngine
+from src.time_series import TimeSeriesEngine
+from src.anomaly_detector import AnomalyDetector
+from src.budget_simulator import simulate_allocation
+from src.progress import ProgressCallback, ProgressTracker
 
 
 class ChampionCleanersBot:
     """AI-powered decision-support bot for Champion Cleaners Google Ads."""
     
-    def __init__(self, csv_filepath: str, use_emojis: bool = False):
+    def __init__(self, csv_filepath: str, use_emojis: bool = False, anomaly_state: str | None = None):
         """
         Initialize the bot.
         
         Args:
             csv_filepath: Path to CSV file with campaign data
             use_emojis: Whether to use emoji symbols (disable on Windows)
+            anomaly_state: Optional .npz file carrying anomaly baselines between runs
         """
         self.csv_filepath = csv_filepath
         self.use_emojis = use_emojis
+        self.anomaly_state = anomaly_state
         self.loader = None
         self.analyzer = None
         self.recommender = None
@@ -49,16 +56,18 @@ class ChampionCleanersBot:
             'low': '[LOW]' if not use_emojis else '🟢',
         }
     
-    def run_analysis(self, verbose: bool = True) -> dict | None:
+    def run_analysis(self, verbose: bool = True, progress: ProgressCallback | None = None) -> dict | None:
         """
         Run complete analysis and generate recommendations.
         
         Args:
             verbose: Whether to print detailed output
+            progress: Optional callback receiving structured progress events
             
         Returns:
             Dictionary with analysis results and recommendations
         """
+        tracker = ProgressTracker(5, progress)
         try:
             if verbose:
                 print("\n" + "="*80)
@@ -70,7 +79,8 @@ class ChampionCleanersBot:
                 print(f"{self.icons['data']} STEP 1: Loading and Validating Data")
                 print("-" * 80)
             
-            self.loader = DataLoader(self.csv_filepath)
+            tracker.stage('Loading and validating data')
+            self.loader = DataLoader(self.csv_filepath, history=HistoryStore.from_config())
             self.df = self.loader.load()
             
             is_valid, warnings, errors = self.loader.validate_data_quality()
@@ -101,8 +111,10 @@ class ChampionCleanersBot:
                 print(f"\n{self.icons['chart']} STEP 2: Performance Analysis")
                 print("-" * 80)
             
+            tracker.stage('Performance analysis', rows=len(self.df))
             self.analyzer = PerformanceAnalyzer(self.df)
             campaign_metrics = self.analyzer.get_campaign_metrics()
+            tracker.partial('campaign_metrics', campaign_metrics)
             comparisons = self.analyzer.compare_campaigns()
             issues = self.analyzer.detect_trends_and_risks()
             
@@ -152,6 +164,8 @@ class ChampionCleanersBot:
                 print(f"\n{self.icons['warning']} STEP 3: Risk & Trend Detection")
                 print("-" * 80)
             
+            tracker.stage('Risk and trend detection')
+            tracker.partial('detected_issues', issues)
             if issues:
                 print(f"\nDetected {len(issues)} issue(s):\n")
                 for idx, issue in enumerate(issues, 1):
@@ -166,6 +180,7 @@ class ChampionCleanersBot:
                 print(f"\n{self.icons['bulb']} STEP 4: Intelligent Recommendations")
                 print("-" * 80)
             
+            tracker.stage('Generating recommendations')
             self.recommender = RecommendationEngine(campaign_metrics, issues, comparisons)
             recommendations = self.recommender.generate_recommendations()
             
@@ -182,6 +197,7 @@ class ChampionCleanersBot:
                 print(f"\n{self.icons['money']} STEP 5: Budget Allocation Recommendation")
                 print("-" * 80)
             
+            tracker.stage('Budget allocation and simulation')
             budget_rec = self.recommender.generate_budget_allocation_recommendation()
             
             if verbose:
@@ -194,6 +210,25 @@ class ChampionCleanersBot:
                     rec_pct = alloc.get('recommended_percentage', alloc['current_percentage'])
                     print(f"{campaign:<40} {alloc['current_percentage']:<12.1f} {rec_pct:<15.1f} {adjust_str:<12}")
             
+            # Monte Carlo outcome range of the recommended allocation
+            budget_simulation = simulate_allocation(self.df, budget_rec)
+            
+            if verbose:
+                outcome = budget_simulation['recommended_allocation']
+                print(f"\nSimulated revenue change: AED {outcome['revenue_change']['mean']:+,.2f} "
+                      f"(90% interval {outcome['revenue_change']['p5']:+,.2f} to {outcome['revenue_change']['p95']:+,.2f}, "
+                      f"P(increase) {outcome['probability_revenue_increase']:.0%})")
+            
+            # Rolling-window performance over the most recent days
+            time_series = TimeSeriesEngine(self.df)
+            rolling = time_series.latest_rolling()
+            anomalies = self._detect_anomalies()
+            
+            if verbose and anomalies:
+                print(f"\n{self.icons['warning']} Daily Anomalies:")
+                for anomaly in anomalies:
+                    print(f"  • [{anomaly['severity']}] {anomaly['campaign']}: {anomaly['description']}")
+            
             # Compile results
             results = {
                 'status': 'success',
@@ -203,9 +238,14 @@ class ChampionCleanersBot:
                 'device_analysis': device_data,
                 'detected_issues': issues,
                 'recommendations': recommendations,
-                'budget_allocation': budget_rec
+                'budget_allocation': budget_rec,
+                'budget_simulation': budget_simulation,
+                'rolling_metrics': rolling,
+                'anomalies': anomalies
             }
             
+            tracker.complete()
+            
             if verbose:
                 print("\n" + "="*80)
                 print("Analysis Complete!")
@@ -222,6 +262,19 @@ class ChampionCleanersBot:
             traceback.print_exc()
             return None
     
+    def _detect_anomalies(self) -> list:
+        """Score daily rows against stored baselines, resuming saved state if any."""
+        if self.anomaly_state and os.path.exists(self.anomaly_state):
+            detector = AnomalyDetector.load(self.anomaly_state)
+        else:
+            detector = AnomalyDetector()
+        
+        anomalies = detector.update(self.df)
+        
+        if self.anomaly_state:
+            detector.save(self.anomaly_state)
+        return anomalies
+    
     def export_recommendations(self, output_path: str | None = None) -> None:
         """
         Export recommendations to JSON file.
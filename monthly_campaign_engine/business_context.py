@@ -59,6 +59,10 @@ class BusinessContextAnalyzer:
         
         return matched_services if matched_services else ['general']
     
+    def get_campaign_services(self) -> Dict[str, List[str]]:
+        """Get the services each campaign maps to."""
+        return {name: self._map_campaign_to_service(name) for name in self.df['campaign_name'].unique()}
+    
     def get_service_coverage_analysis(self) -> dict[str, dict[str, float | int]]:
         """Analyze which services get budget and which don't."""
         service_budget = {svc: 0 for svc in self.SERVICE_KEYWORDS.keys()}
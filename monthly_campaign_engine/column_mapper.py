@@ -7,59 +7,45 @@ Handles variations in column naming across exports.
 import pandas as pd
 from typing import Dict, List, Tuple
 
+from src.export_schemas import get_schema
+
 
 class ColumnMapper:
     """Map and normalize Google Ads export columns."""
     
-    # Standard column mappings with possible aliases
-    COLUMN_MAPPINGS = {
-        'campaign_name': ['Campaign', 'campaign', 'Campaign name'],
-        'campaign_type': ['Campaign type', 'campaign_type', 'Type'],
-        'impressions': ['Impr.', 'Impressions', 'Impr', 'impressions'],
-        'clicks': ['Interactions', 'Clicks', 'clicks', 'Clks'],
-        'cost': ['Cost', 'cost', 'Spend', 'Ad spend'],
-        'conversions': ['Conversions', 'conversions', 'Conv.', 'Conv'],
-        'conv_value': ['Conv. value', 'Conversion value', 'conv_value', 'Revenue'],
-        'conv_rate': ['Conv. rate', 'Conversion rate', 'conv_rate'],
-        'interaction_rate': ['Interaction rate', 'CTR', 'Click rate', 'interaction_rate'],
-        'avg_cpc': ['Avg. cost', 'CPC', 'avg_cost', 'Avg. CPC'],
-        'campaign_status': ['Campaign status', 'Status'],
-        'optimization_score': ['Optimization score', 'Opt. score'],
-        'bid_strategy': ['Bid strategy type', 'Bid strategy'],
-    }
+    # Aliases live in the shared export-schema registry
+    SCHEMA = get_schema('monthly')
+    COLUMN_MAPPINGS = SCHEMA.columns
     
     def __init__(self, df: pd.DataFrame):
         """Initialize mapper with dataframe."""
         self.df = df.copy()
         self.original_columns = df.columns.tolist()
         self.mapping_report = {}
+        # Resolved once per frame: {standard name: actual column}
+        self._resolved = {standard: col for col, standard in self.SCHEMA.resolve(self.original_columns).items()}
     
     def find_column(self, target_key: str) -> str | None:
         """Find the actual column name for a target key."""
-        possible_names = self.COLUMN_MAPPINGS.get(target_key, [])
-        
-        for col in possible_names:
-            if col in self.df.columns:
-                return col
-        
-        return None
+        return self._resolved.get(target_key)
     
     def normalize_columns(self) -> pd.DataFrame:
         """Map and normalize all columns."""
         normalized = pd.DataFrame()
         
-        for standard_name, possible_names in self.COLUMN_MAPPINGS.items():
-            for col_name in possible_names:
-                if col_name in self.df.columns:
-                    normalized[standard_name] = self.df[col_name]
-                    self.mapping_report[standard_name] = col_name
-                    break
+        for standard_name in self.COLUMN_MAPPINGS:
+            col_name = self._resolved.get(standard_name)
+            if col_name is not None:
+                normalized[standard_name] = self.df[col_name]
+                self.mapping_report[standard_name] = col_name
         
         # Preserve month columns if they exist
         if 'Month' in self.df.columns:
             normalized['Month'] = self.df['Month']
         if 'Month_Num' in self.df.columns:
             normalized['Month_Num'] = self.df['Month_Num']
+        if 'Period' in self.df.columns:
+            normalized['Period'] = self.df['Period']
         
         return normalized
     
@@ -0,0 +1,248 @@
+"""
+Monthly File Catalog
+Discovers monthly Google Ads exports by their report header and keeps a
+persisted index of file metadata so repeat scans avoid re-reading files.
+"""
+
+import hashlib
+import json
+import os
+import re
+import zipfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import pandas as pd
+
+from config import MONTHLY_CATALOG
+from src.report_sources import expand_sources, is_report_file, open_source, report_name
+
+# Second line of a Google Ads export, e.g. "March 1, 2025 - March 31, 2025"
+DATE_RANGE_PATTERN = re.compile(r'^"?\s*([A-Za-z]+\.? \d{1,2}, \d{4})\s*-\s*([A-Za-z]+\.? \d{1,2}, \d{4})\s*"?\s*$')
+
+# Fallback for files without a header: "Mar 2025.csv", "June 2025.xlsx", ...
+FILENAME_PATTERN = re.compile(r'^([A-Za-z]+)[\s_-]+(\d{4})\.(?:csv|xlsx)$', re.IGNORECASE)
+
+
+def _parse_header_date(text: str) -> datetime | None:
+    """Parse a header date written with a full or abbreviated month name."""
+    text = text.replace('.', '')
+    for fmt in ('%B %d, %Y', '%b %d, %Y'):
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def period_from_header(lines: List[str]) -> pd.Period | None:
+    """
+    Detect the reporting month from an export's preamble lines.
+
+    Args:
+        lines: First lines of the file (title, date range, ...)
+
+    Returns:
+        Monthly period, or None if the file doesn't cover a single month
+    """
+    for line in lines[:3]:
+        match = DATE_RANGE_PATTERN.match(line.strip())
+        if not match:
+            continue
+        start = _parse_header_date(match.group(1))
+        end = _parse_header_date(match.group(2))
+        if start is None or end is None:
+            return None
+        if (start.year, start.month) != (end.year, end.month):
+            return None
+        return pd.Period(year=start.year, month=start.month, freq='M')
+    return None
+
+
+def period_from_filename(filename: str) -> pd.Period | None:
+    """Detect the reporting month from a 'Month YYYY.csv' style filename."""
+    match = FILENAME_PATTERN.match(filename)
+    if not match:
+        return None
+    month = _parse_header_date(f"{match.group(1)} 1, {match.group(2)}")
+    if month is None:
+        return None
+    return pd.Period(year=month.year, month=month.month, freq='M')
+
+
+class MonthlyFileCatalog:
+    """Index of monthly export files keyed by reporting period."""
+
+    INDEX_VERSION = 1
+    HEADER_BYTES = 4096
+
+    def __init__(self, directory: str = ".", index_path: str | None = None, persist: bool = True):
+        """
+        Initialize catalog for a directory of exports.
+
+        Args:
+            directory: Directory to scan for CSV exports (plain, .gz/.zst or zipped),
+                or a single archive of exports
+            index_path: Where to persist the index (default: a file in the
+                MONTHLY_CATALOG cache keyed by the directory's resolved path)
+            persist: Whether to read and write the persisted index
+        """
+        self.directory = Path(directory)
+        self.index_path = Path(index_path) if index_path else self.default_index_path(self.directory)
+        self.persist = persist
+        self.entries: Dict[str, Dict] = {}
+        self.stats = {'scanned': 0, 'reused': 0, 'refreshed': 0}
+
+    @staticmethod
+    def default_index_path(directory: Path) -> Path:
+        """Index file of a directory or archive in the project cache, outside the data directory."""
+        root = Path(MONTHLY_CATALOG.get('path', 'cache/catalog'))
+        if not root.is_absolute():
+            root = Path(__file__).parent.parent / root
+        resolved = Path(directory).resolve()
+        key = hashlib.sha1(str(resolved).encode('utf-8')).hexdigest()[:16]
+        return root / f"{resolved.name or 'root'}-{key}.json"
+
+    def _load_index(self) -> Dict[str, Dict]:
+        """Load the persisted index, ignoring missing or stale formats."""
+        if not self.persist or not self.index_path.exists():
+            return {}
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get('version') != self.INDEX_VERSION:
+            return {}
+        return data.get('files', {})
+
+    def _save_index(self) -> None:
+        """Atomically write the index to its cache file."""
+        if not self.persist:
+            return
+        tmp_path = self.index_path.with_suffix('.tmp')
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': self.INDEX_VERSION, 'files': self.entries}, f, indent=2)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            print(f"  [WARN] Could not persist file catalog: {e}")
+
+    @staticmethod
+    def _hash_file(source: str) -> str:
+        """Content hash (of the decompressed report) used to detect changed exports."""
+        digest = hashlib.sha1()
+        with open_source(source) as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _describe(self, source: str, stat: os.stat_result) -> Dict:
+        """Read a report's header and build its catalog entry."""
+        with open_source(source) as f:
+            head = f.read(self.HEADER_BYTES).decode('utf-8-sig', errors='replace')
+        lines = head.splitlines()
+
+        period = period_from_header(lines)
+        origin = 'header'
+        if period is None and not any(DATE_RANGE_PATTERN.match(line.strip()) for line in lines[:3]):
+            period = period_from_filename(report_name(source))
+            origin = 'filename'
+
+        return {
+            'path': source,
+            'mtime': stat.st_mtime,
+            'size': stat.st_size,
+            'hash': self._hash_file(source),
+            'period': str(period) if period is not None else None,
+            'period_source': origin if period is not None else None,
+            'report_title': lines[0].strip() if lines else '',
+        }
+
+    def scan(self) -> List[Dict]:
+        """
+        Refresh the catalog and return monthly files in period order.
+
+        Files whose size and mtime match the persisted index are not
+        re-read. Every CSV inside a zip is catalogued as its own report
+        (keyed "archive.zip::member.csv"). When several files cover the
+        same month, the most recently modified one wins.
+
+        Returns:
+            Catalog entries that have a reporting period
+        """
+        known = self._load_index()
+        self.entries = {}
+        self.stats = {'scanned': 0, 'reused': 0, 'refreshed': 0}
+
+        if self.directory.is_file():
+            files = [self.directory]
+        else:
+            files = sorted(path for path in self.directory.iterdir() if path.is_file() and is_report_file(path.name))
+
+        for path in files:
+            stat = path.stat()
+            try:
+                sources = expand_sources(str(path))
+            except (OSError, ValueError, zipfile.BadZipFile) as e:
+                print(f"  [ERROR] {path.name}: {e}")
+                continue
+
+            for source in sources:
+                # Archive members are keyed by archive name and member, plain files by name
+                key = path.name + source[len(str(path)):]
+                cached = known.get(key)
+                self.stats['scanned'] += 1
+
+                if cached and cached.get('size') == stat.st_size and cached.get('mtime') == stat.st_mtime:
+                    entry = dict(cached, path=source)
+                    self.stats['reused'] += 1
+                else:
+                    try:
+                        entry = self._describe(source, stat)
+                    except (OSError, ImportError, zipfile.BadZipFile) as e:
+                        print(f"  [ERROR] {key}: {e}")
+                        continue
+                    self.stats['refreshed'] += 1
+
+                self.entries[key] = entry
+
+        self._save_index()
+        return self.monthly_entries()
+
+    def monthly_entries(self) -> List[Dict]:
+        """Get one entry per reporting month, ordered by period."""
+        by_period: Dict[str, Dict] = {}
+        for entry in self.entries.values():
+            period = entry.get('period')
+            if period is None:
+                continue
+            current = by_period.get(period)
+            if current is not None:
+                keep, drop = (entry, current) if entry['mtime'] > current['mtime'] else (current, entry)
+                print(f"  [WARN] {report_name(drop['path'])} and {report_name(keep['path'])} both cover "
+                      f"{period}; using {report_name(keep['path'])}")
+                entry = keep
+            by_period[period] = entry
+
+        return [by_period[p] for p in sorted(by_period, key=lambda p: pd.Period(p, freq='M'))]
+
+    def get_period_index(self) -> pd.PeriodIndex:
+        """Get the catalogued reporting months as a monthly PeriodIndex."""
+        return pd.PeriodIndex([e['period'] for e in self.monthly_entries()], freq='M')
+
+    @staticmethod
+    def month_key(period: pd.Period) -> Tuple[str, int, str]:
+        """Get (month name, year, 'Mon YYYY' key) for a period."""
+        month_name = period.strftime('%b')
+        return month_name, period.year, f"{month_name} {period.year}"
+
+    @staticmethod
+    def months_in_order(df: pd.DataFrame) -> List[str]:
+        """Get a frame's 'Month' labels in chronological (not alphabetical) order."""
+        order_col = 'Period' if 'Period' in df.columns else 'Month_Num'
+        if order_col not in df.columns:
+            return sorted(df['Month'].unique())
+        return df.sort_values(order_col)['Month'].drop_duplicates().tolist()
@@ -4,81 +4,165 @@ Loads and normalizes monthly campaign CSV files from Google Ads exports.
 """
 
 import pandas as pd
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Tuple
-from datetime import datetime
-import re
+from typing import List, Dict, TYPE_CHECKING
+
+from file_catalog import MonthlyFileCatalog
+from src.export_schemas import get_schema
+from src.format_sniffer import read_report, sniff
+from src.report_sources import report_name
+
+if TYPE_CHECKING:
+    from src.history_store import HistoryStore
+
+
+def _parse_month_file(csv_file: str) -> pd.DataFrame:
+    """Parse one monthly export (a CSV, compressed CSV or archive member) into campaign rows (runs in a worker)."""
+    # Skip the sniffed preamble (title, date range) and parse only the columns the schema maps
+    fmt = sniff(csv_file)
+    df = read_report(csv_file, fmt, **get_schema('monthly').read_options(fmt['columns']))
+    
+    # Filter to campaign rows (exclude "Total:" rows which are in Campaign status column)
+    keep = ~df['Campaign status'].fillna('').astype(str).str.contains('Total:', regex=False)
+    
+    # Also exclude rows where Campaign is NaN or empty
+    keep &= df['Campaign'].notna() & (df['Campaign'].astype(str).str.strip() != '')
+    
+    return df[keep].reset_index(drop=True)
+
+
+def _unify_dtypes(frames: List[pd.DataFrame]) -> List[pd.DataFrame]:
+    """
+    Give every month the same column dtypes before concatenation.
+    
+    Numeric columns become float64 everywhere, and campaign names share one
+    categorical dtype, so ``pd.concat`` neither upcasts nor copies object
+    columns month by month.
+    """
+    columns = {col for df in frames for col in df.columns}
+    dtypes = {}
+    
+    for col in columns:
+        present = [df[col] for df in frames if col in df.columns]
+        if col == 'Campaign':
+            categories = sorted({name for series in present for name in series.dropna().unique()})
+            dtypes[col] = pd.CategoricalDtype(categories)
+        elif all(pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+                 for series in present):
+            dtypes[col] = 'float64'
+        elif len({series.dtype for series in present}) > 1:
+            dtypes[col] = 'object'
+    
+    return [df.astype({col: dtype for col, dtype in dtypes.items() if col in df.columns}) for df in frames]
 
 
 class MonthlyFileLoader:
     """Load and parse multiple monthly campaign CSV files."""
     
-    def __init__(self, directory: str = "."):
-        """Initialize loader with directory containing monthly CSVs."""
+    def __init__(self, directory: str = ".", max_workers: int | None = None, use_processes: bool = False,
+                 catalog: MonthlyFileCatalog | None = None, history: 'HistoryStore | None' = None,
+                 parsed_cache: Dict[tuple, pd.DataFrame] | None = None):
+        """
+        Initialize loader with directory containing monthly CSVs.
+        
+        Args:
+            directory: Directory containing the monthly exports, or a zip of them
+            max_workers: Parallel parsers (default: one per file, capped at 8)
+            use_processes: Parse in a process pool instead of threads
+            catalog: File catalog to discover exports with (default: one for the directory)
+            history: Optional history store each loaded month is upserted into
+            parsed_cache: Parsed months keyed by (content hash, period), shared across
+                loads so only new or changed exports are parsed again
+        """
         self.directory = Path(directory)
+        self.max_workers = max_workers
+        self.use_processes = use_processes
+        self.catalog = catalog or MonthlyFileCatalog(directory)
+        self.history = history
+        self.parsed_cache = parsed_cache
+        self.stats = {'parsed': 0, 'reused': 0}
         self.raw_dataframes = {}  # {month_key: dataframe}
+        self.periods = {}  # {month_key: pd.Period}
         self.months_found = []
     
     def find_monthly_files(self) -> List[Path]:
-        """Find all monthly CSV files (e.g., 'Mar 2025.csv')."""
-        pattern = re.compile(r'^(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{4}\.csv$', re.IGNORECASE)
-        files = [f for f in self.directory.glob("*.csv") if pattern.match(f.name)]
-        return sorted(files)
-    
-    def _extract_month_year(self, filename: str) -> Tuple[str, int, str]:
-        """Extract month name, year, and month key from filename."""
-        match = re.match(r'^(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(\d{4})\.csv$', filename, re.IGNORECASE)
-        if not match:
-            raise ValueError(f"Invalid filename format: {filename}")
-        
-        month_name = match.group(1).capitalize()
-        year = int(match.group(2))
-        month_key = f"{month_name} {year}"
-        
-        return month_name, year, month_key
+        """Find all monthly exports in period order, whatever their filename."""
+        return [Path(entry['path']) for entry in self.catalog.scan()]
     
     def load_monthly_files(self) -> Dict[str, pd.DataFrame]:
-        """Load all monthly CSV files."""
-        files = self.find_monthly_files()
+        """Load all monthly CSV files, parsing them concurrently."""
+        entries = self.catalog.scan()
         
-        if not files:
-            print("WARNING: No monthly CSV files found (pattern: 'Mon YYYY.csv')")
+        if not entries:
+            print("WARNING: No monthly CSV files found (expected a single-month date range header)")
             return {}
         
-        for csv_file in files:
-            try:
-                month_name, year, month_key = self._extract_month_year(csv_file.name)
-                self.months_found.append(month_key)
-                
-                # Skip header rows and load the actual campaign data
-                df = pd.read_csv(csv_file, skiprows=2)
-                
-                # Filter to campaign rows (exclude "Total:" rows which are in Campaign status column)
-                df = df[~df['Campaign status'].fillna('').str.contains('Total:', na=False, regex=False)].copy()
-                
-                # Also exclude rows where Campaign is NaN or empty
-                df = df[df['Campaign'].notna()].copy()
-                df = df[df['Campaign'].str.strip() != ''].copy()
+        # Catalog order is period order: the order results are stored and later concatenated in
+        months = []
+        for entry in entries:
+            period = pd.Period(entry['period'], freq='M')
+            months.append((entry['path'], period) + MonthlyFileCatalog.month_key(period))
+        
+        # Unchanged exports (same content hash and period) come from the parsed cache
+        cache_keys = {entry['period']: (entry.get('hash'), entry['period']) for entry in entries}
+        cached = {}
+        if self.parsed_cache is not None:
+            cached = {month[4]: self.parsed_cache[cache_keys[str(month[1])]] for month in months
+                      if cache_keys[str(month[1])] in self.parsed_cache}
+        to_parse = [month for month in months if month[4] not in cached]
+        self.stats = {'parsed': len(to_parse), 'reused': len(cached)}
+        
+        workers = self.max_workers or min(8, len(to_parse)) or 1
+        parsed = {}
+        with self._create_executor(workers) as executor:
+            futures = {month[4]: executor.submit(_parse_month_file, month[0]) for month in to_parse}
+            for csv_file, period, month_name, year, month_key in months:
+                try:
+                    if month_key in cached:
+                        df = cached[month_key].copy()
+                    else:
+                        df = futures[month_key].result()
+                        if self.parsed_cache is not None:
+                            self.parsed_cache[cache_keys[str(period)]] = df.copy()
+                except Exception as e:
+                    print(f"  [ERROR] {report_name(csv_file)}: {str(e)}")
+                    continue
                 
-                # Add month identifier
+                # Add month identifiers
                 df['Month'] = month_key
-                df['Month_Num'] = (year - 2024) * 12 + ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
-                                                         'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'].index(month_name) + 1
-                
-                self.raw_dataframes[month_key] = df
-                
-            except Exception as e:
-                print(f"  [ERROR] {csv_file.name}: {str(e)}")
+                df['Month_Num'] = (year - 2024) * 12 + period.month
+                df['Period'] = pd.Series(period, index=df.index, dtype='period[M]')
+                parsed[month_key] = df
+                self.periods[month_key] = period
+        
+        unified = _unify_dtypes(list(parsed.values())) if parsed else []
+        for month_key, df in zip(parsed.keys(), unified):
+            self.months_found.append(month_key)
+            self.raw_dataframes[month_key] = df
+        
+        if self.history is not None and self.raw_dataframes:
+            self.history.upsert('monthly', pd.concat(self.raw_dataframes.values(), ignore_index=True))
         
         return self.raw_dataframes
     
+    def _create_executor(self, workers: int) -> Executor:
+        """Create the worker pool used to parse month files."""
+        if self.use_processes:
+            return ProcessPoolExecutor(max_workers=workers)
+        return ThreadPoolExecutor(max_workers=workers)
+    
     def get_dataframe(self, month_key: str) -> pd.DataFrame | None:
         """Get a specific month's dataframe."""
         return self.raw_dataframes.get(month_key, None)
     
     def get_all_months(self) -> List[str]:
-        """Get list of all months loaded in order."""
-        return sorted(self.months_found)
+        """Get list of all months loaded, in chronological order."""
+        return sorted(self.months_found, key=self.periods.__getitem__)
+    
+    def get_periods(self) -> pd.PeriodIndex:
+        """Get the loaded months as a monthly PeriodIndex."""
+        return pd.PeriodIndex([self.periods[m] for m in self.get_all_months()], freq='M')
     
     def combine_all_months(self) -> pd.DataFrame:
         """Combine all monthly dataframes into single time-series."""
@@ -89,6 +173,7 @@ class MonthlyFileLoader:
         if not self.raw_dataframes:
             return pd.DataFrame()
         
+        # Stored in month order with unified dtypes, so a single concat suffices
         dfs = list(self.raw_dataframes.values())
         combined = pd.concat(dfs, ignore_index=True)
         
@@ -99,4 +184,3 @@ class MonthlyFileLoader:
             combined = combined.sort_values(['Month', 'Campaign']).reset_index(drop=True)
         
         return combined
-        return combined
@@ -5,7 +5,9 @@ Calculates standard performance metrics from normalized campaign data.
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List
+from typing import Dict
+
+from file_catalog import MonthlyFileCatalog
 
 
 class MetricsEngine:
@@ -104,7 +106,7 @@ class MetricsEngine:
         
         summary = {}
         
-        for month in sorted(self.df['Month'].unique()):
+        for month in MonthlyFileCatalog.months_in_order(self.df):
             month_data = self.df[self.df['Month'] == month]
             
             summary[month] = {
@@ -3,12 +3,20 @@ Monthly Campaign Engine - Main Orchestrator
 Ties all modules together for comprehensive monthly analysis.
 """
 
-import json
+import sys
 import pandas as pd
 from pathlib import Path
 from typing import Optional, Dict
 from datetime import datetime
 
+# Shared helpers live in the top-level src package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.budget_simulator import simulate_monthly_recommendations
+from src.history_store import HistoryStore
+from src.progress import ProgressCallback, ProgressTracker
+from src.serialization import write_json
+
 from file_loader import MonthlyFileLoader
 from column_mapper import ColumnMapper
 from metrics_engine import MetricsEngine
@@ -21,25 +29,29 @@ from recommendation_engine import RecommendationEngine
 class MonthlyCampaignEngine:
     """Main orchestrator for monthly campaign analysis."""
     
-    def __init__(self, data_directory: Optional[str] = None):
-        """Initialize the engine."""
+    def __init__(self, data_directory: Optional[str] = None, parsed_cache: Optional[Dict] = None):
+        """Initialize the engine (parsed_cache: parsed months reused across runs, see MonthlyFileLoader)."""
         if data_directory is None:
             data_directory = str(Path(__file__).parent.parent / 'uploads')
         
         self.data_directory = Path(data_directory)
+        self.parsed_cache = parsed_cache
         self.raw_data = None
         self.normalized_data = None
         self.metrics_data = None
         self.analysis_results = {}
     
-    def run_analysis(self, output_json: bool = True, output_console: bool = True) -> Dict:
-        """Run complete analysis pipeline."""
+    def run_analysis(self, output_json: bool = True, output_console: bool = True,
+                     progress: ProgressCallback | None = None) -> Dict:
+        """Run complete analysis pipeline (optionally reporting progress events)."""
+        tracker = ProgressTracker(7, progress)
         print("=" * 80)
         print("CHAMPION CLEANERS - MONTHLY CAMPAIGN ANALYSIS ENGINE")
         print("=" * 80)
         
         # Step 1: Load data
         print("\n[1/7] Loading monthly CSV files...")
+        tracker.stage('Loading monthly files')
         self.raw_data = self._load_files()
         if self.raw_data is None or self.raw_data.empty:
             print("ERROR: No data loaded. Check file paths.")
@@ -49,37 +61,45 @@ class MonthlyCampaignEngine:
         
         # Step 2: Normalize columns
         print("\n[2/7] Normalizing column names...")
+        tracker.stage('Normalizing columns', rows=len(self.raw_data))
         self.normalized_data = self._map_columns()
         print(f"✓ Standardized {len(self.normalized_data.columns)} columns")
         
         # Step 3: Calculate metrics
         print("\n[3/7] Calculating performance metrics...")
+        tracker.stage('Calculating metrics')
         self.metrics_data = self._calculate_metrics()
         print(f"✓ Computed metrics for {self.metrics_data['campaign_name'].nunique()} campaigns across {self.metrics_data['Month'].nunique()} months")
         
         # Step 4: Analyze trends
         print("\n[4/7] Analyzing trends and seasonality...")
+        tracker.stage('Analyzing trends')
         trends = self._analyze_trends()
         self.analysis_results['trends'] = trends
         print(f"✓ Identified trends in {len(trends)} campaign trajectories")
         
         # Step 5: Detect losses
         print("\n[5/7] Detecting performance losses...")
+        tracker.stage('Detecting losses')
         losses = self._detect_losses()
         self.analysis_results['losses'] = losses
+        tracker.partial('losses', losses[:10])
         print(f"✓ Found {len(losses)} performance issues (sorted by severity)")
         
         # Step 6: Business context
         print("\n[6/7] Analyzing business context...")
+        tracker.stage('Business context')
         business_context = self._analyze_business_context()
         self.analysis_results['business_context'] = business_context
         print(f"✓ Service coverage: {sum(1 for s, m in business_context.get('service_coverage', {}).items() if m.get('status') == 'BALANCED')} balanced services")
         
         # Step 7: Generate recommendations
         print("\n[7/7] Generating strategic recommendations...")
+        tracker.stage('Generating recommendations')
         recommendations = self._generate_recommendations(trends, losses, business_context)
         self.analysis_results['recommendations'] = recommendations
         print(f"✓ Generated {recommendations['summary'].get('total_recommendations', 0)} actionable recommendations")
+        tracker.complete()
         
         # Output results
         if output_console:
@@ -97,7 +117,8 @@ class MonthlyCampaignEngine:
     
     def _load_files(self) -> Optional[pd.DataFrame]:
         """Load monthly CSV files."""
-        loader = MonthlyFileLoader(str(self.data_directory))
+        loader = MonthlyFileLoader(str(self.data_directory), history=HistoryStore.from_config(),
+                                   parsed_cache=self.parsed_cache)
         
         files = loader.find_monthly_files()
         if not files:
@@ -179,6 +200,13 @@ class MonthlyCampaignEngine:
             if r.get('priority') == 'MEDIUM'
         ])
         
+        # What-if outcomes for proposed spend changes, with confidence intervals
+        campaign_services = BusinessContextAnalyzer(self.metrics_data).get_campaign_services()
+        elasticities = {c: curve['elasticity'] for c, curve in all_recs['response_curves'].items()}
+        all_recs['budget_simulation'] = simulate_monthly_recommendations(
+            self.metrics_data, all_recs, campaign_services, elasticities=elasticities
+        )
+        
         return all_recs
     
     def _print_console_summary(self):
@@ -236,11 +264,15 @@ class MonthlyCampaignEngine:
     
     def _export_json(self) -> str:
         """Export full analysis to JSON."""
-        assert self.metrics_data is not None, "No metrics data to export"
         output_file = self.data_directory.parent / f"monthly_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        write_json(str(output_file), self.export_payload())
         
-        # Convert DataFrames to serializable format
-        export_data = {
+        return str(output_file)
+    
+    def export_payload(self) -> Dict:
+        """Summary and results of the last run, as exported to JSON."""
+        assert self.metrics_data is not None, "No metrics data to export"
+        return {
             'analysis_date': datetime.now().isoformat(),
             'data_directory': str(self.data_directory),
             'summary': {
@@ -252,26 +284,6 @@ class MonthlyCampaignEngine:
             },
             'analysis_results': self.analysis_results
         }
-        
-        # Make sure all values are JSON serializable
-        def make_serializable(obj):
-            if isinstance(obj, dict):
-                return {k: make_serializable(v) for k, v in obj.items()}
-            elif isinstance(obj, (list, tuple)):
-                return [make_serializable(item) for item in obj]
-            elif isinstance(obj, pd.Timestamp):
-                return obj.isoformat()
-            elif isinstance(obj, (int, float, str, bool, type(None))):
-                return obj
-            else:
-                return str(obj)
-        
-        export_data = make_serializable(export_data)
-        
-        with open(output_file, 'w') as f:
-            json.dump(export_data, f, indent=2)
-        
-        return str(output_file)
 
 
 def main():
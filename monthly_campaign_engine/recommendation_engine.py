@@ -7,6 +7,9 @@ import pandas as pd
 from typing import List, Dict, Tuple
 from datetime import datetime
 
+from business_context import BusinessContextAnalyzer
+from response_curves import ResponseCurves
+
 
 class RecommendationEngine:
     """Generate strategic recommendations from analysis."""
@@ -22,6 +25,21 @@ class RecommendationEngine:
         self.losses = losses
         self.business_context = business_context
         self.total_monthly_budget = metrics_df.groupby('Month')['cost'].sum().mean()
+        self.response_curves = ResponseCurves.fit(metrics_df)
+        # Computed once: each service's campaigns weighted by their total spend
+        spend = metrics_df.groupby('campaign_name', observed=True)['cost'].sum()
+        self.service_campaign_spend: Dict[str, Dict[str, float]] = {}
+        for campaign, services in BusinessContextAnalyzer(metrics_df).get_campaign_services().items():
+            for service in services:
+                self.service_campaign_spend.setdefault(service, {})[campaign] = spend.get(campaign, 0)
+    
+    def _service_elasticity(self, service: str) -> float:
+        """Spend-weighted response elasticity of the campaigns serving a service."""
+        weights = self.service_campaign_spend.get(service, {})
+        total = sum(weights.values())
+        if total <= 0:
+            return ResponseCurves.DEFAULT_ELASTICITY
+        return sum(self.response_curves.get_elasticity(c) * w for c, w in weights.items()) / total
     
     def generate_budget_recommendations(self) -> List[Dict]:
         """Generate budget allocation recommendations."""
@@ -39,7 +57,7 @@ class RecommendationEngine:
                     'recommended_spend': round(metrics['total_spend'] * 1.2, 2),
                     'increase_amount': round(metrics['total_spend'] * 0.2, 2),
                     'reason': f"{service} has ROI of {metrics['roi']:.2f}x with underfunded allocation",
-                    'expected_impact': f"Increase revenue by ~{int(metrics['roi'] * 0.2 * metrics['total_spend'])} AED",
+                    'expected_impact': f"Increase revenue by ~{int(metrics['revenue'] * (1.2 ** self._service_elasticity(service) - 1))} AED",
                     'confidence': 0.85,
                     'priority': 'HIGH'
                 })
@@ -159,6 +177,9 @@ class RecommendationEngine:
             current_spend = campaign['cost']
             monthly_avg_spend = current_spend / len(self.df[self.df['campaign_name'] == campaign['campaign_name']].drop_duplicates('Month'))
             
+            # Diminishing returns: +30% spend yields 1.3^b - 1 more conversions
+            additional = self.response_curves.additional_conversions(campaign['campaign_name'], 1.3)
+            
             recommendations.append({
                 'type': 'SCALE_CAMPAIGN',
                 'target': campaign['campaign_name'],
@@ -168,7 +189,8 @@ class RecommendationEngine:
                 'current_roas': round(campaign['roas'], 2),
                 'reason': f"{campaign['campaign_name']} has strong ROAS of {campaign['roas']:.2f}x",
                 'action': f"Increase daily budget by 30% and test new keywords/audiences",
-                'expected_impact': f"Generate {int(campaign['conversions'] * 0.3 / len(monthly_summary))} additional monthly conversions",
+                'expected_impact': f"Generate {int(additional)} additional monthly conversions",
+                'response_elasticity': round(self.response_curves.get_elasticity(campaign['campaign_name']), 3),
                 'confidence': 0.90,
                 'priority': 'HIGH'
             })
@@ -222,7 +244,8 @@ class RecommendationEngine:
             'budget_recommendations': self.generate_budget_recommendations(),
             'loss_remediation': self.generate_loss_remediation(),
             'growth_opportunities': self.generate_growth_opportunities(),
-            'strategic_initiatives': self.generate_strategic_initiatives()
+            'strategic_initiatives': self.generate_strategic_initiatives(),
+            'response_curves': self.response_curves.to_dict()
         }
     
     def get_executive_summary(self) -> Dict:
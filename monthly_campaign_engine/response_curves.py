@@ -0,0 +1,140 @@
+"""
+Response Curves
+Fits a diminishing-returns curve (conversions = a * spend^b) per campaign
+from monthly history, for all campaigns in one vectorized pass.
+"""
+
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from typing import Dict
+
+
+class ResponseCurves:
+    """Per-campaign spend -> conversions curves fitted by log-linear least squares."""
+
+    # Elasticity bounds: 0 = spend doesn't matter, 1 = linear returns
+    MIN_ELASTICITY = 0.0
+    MAX_ELASTICITY = 1.0
+    # Assumed when a campaign has too few usable months to fit
+    DEFAULT_ELASTICITY = 1.0
+    MIN_MONTHS = 3
+
+    _cache: 'OrderedDict[str, ResponseCurves]' = OrderedDict()
+    CACHE_SIZE = 32
+
+    def __init__(self, campaigns: pd.Index, log_a: np.ndarray, elasticity: np.ndarray, fitted: np.ndarray,
+                 r_squared: np.ndarray, months: np.ndarray, avg_spend: np.ndarray, avg_conversions: np.ndarray):
+        """Hold fitted curve parameters (use ResponseCurves.fit to build)."""
+        self.campaigns = campaigns
+        self.fitted = fitted
+        self.log_a = log_a
+        self.elasticity = elasticity
+        self.r_squared = r_squared
+        self.months = months
+        self.avg_spend = avg_spend
+        self.avg_conversions = avg_conversions
+
+    @classmethod
+    def fit(cls, metrics_df: pd.DataFrame) -> 'ResponseCurves':
+        """
+        Fit curves for every campaign, reusing a cached fit for identical data.
+
+        Args:
+            metrics_df: Monthly metrics with campaign_name, Month, cost, conversions
+
+        Returns:
+            Fitted ResponseCurves
+        """
+        pivot = metrics_df.pivot_table(index='campaign_name', columns='Month',
+                                       values=['cost', 'conversions'], aggfunc='sum', observed=True)
+        key = cls._data_hash(pivot)
+        if key in cls._cache:
+            cls._cache.move_to_end(key)
+            return cls._cache[key]
+
+        curves = cls._fit_pivot(pivot['cost'].fillna(0).to_numpy(dtype=float),
+                                pivot['conversions'].fillna(0).to_numpy(dtype=float),
+                                pivot.index)
+        cls._cache[key] = curves
+        if len(cls._cache) > cls.CACHE_SIZE:
+            cls._cache.popitem(last=False)
+        return curves
+
+    @staticmethod
+    def _data_hash(pivot: pd.DataFrame) -> str:
+        """Hash of the campaign x month spend/conversion values."""
+        digest = hashlib.sha1(np.ascontiguousarray(pivot.to_numpy(dtype=float)).tobytes())
+        digest.update(repr((pivot.index.tolist(), pivot.columns.tolist())).encode('utf-8'))
+        return digest.hexdigest()
+
+    @classmethod
+    def _fit_pivot(cls, cost: np.ndarray, conversions: np.ndarray, campaigns: pd.Index) -> 'ResponseCurves':
+        """Masked least squares of log(conversions) on log(spend), one row per campaign."""
+        usable = (cost > 0) & (conversions > 0)
+        n = usable.sum(axis=1)
+        x = np.log(np.where(usable, cost, 1))
+        y = np.log(np.where(usable, conversions, 1))
+
+        safe_n = np.maximum(n, 1)
+        x_mean = (x * usable).sum(axis=1) / safe_n
+        y_mean = (y * usable).sum(axis=1) / safe_n
+        dx = (x - x_mean[:, None]) * usable
+        dy = (y - y_mean[:, None]) * usable
+        sxx = (dx ** 2).sum(axis=1)
+        sxy = (dx * dy).sum(axis=1)
+        syy = (dy ** 2).sum(axis=1)
+
+        fitted = (n >= cls.MIN_MONTHS) & (sxx > 1e-12)
+        slope = np.divide(sxy, sxx, out=np.zeros_like(sxy), where=sxx > 1e-12)
+        elasticity = np.where(fitted, np.clip(slope, cls.MIN_ELASTICITY, cls.MAX_ELASTICITY), cls.DEFAULT_ELASTICITY)
+        r_squared = np.where(fitted & (syy > 1e-12),
+                             np.divide(sxy ** 2, sxx * syy, out=np.zeros_like(sxy), where=(sxx * syy) > 1e-24), 0)
+
+        months = (cost > 0).sum(axis=1)
+        avg_spend = cost.sum(axis=1) / np.maximum(months, 1)
+        avg_conversions = conversions.sum(axis=1) / np.maximum(months, 1)
+        log_a = y_mean - elasticity * x_mean
+
+        return cls(campaigns, log_a, elasticity, fitted, r_squared, n, avg_spend, avg_conversions)
+
+    def _position(self, campaign: str) -> int | None:
+        """Row of a campaign, or None if it wasn't fitted."""
+        matches = self.campaigns.get_indexer([campaign])
+        return None if matches[0] < 0 else int(matches[0])
+
+    def get_elasticity(self, campaign: str) -> float:
+        """Fitted spend elasticity of a campaign (default if unknown)."""
+        pos = self._position(campaign)
+        return float(self.elasticity[pos]) if pos is not None else self.DEFAULT_ELASTICITY
+
+    def spend_multiplier_effect(self, campaign: str, multiplier: float) -> float:
+        """
+        Relative change in conversions when spend is multiplied.
+
+        Anchored at the campaign's own average month, so only the curve's
+        shape (the elasticity) matters: ``multiplier^b - 1``.
+        """
+        return multiplier ** self.get_elasticity(campaign) - 1
+
+    def additional_conversions(self, campaign: str, multiplier: float) -> float:
+        """Extra monthly conversions from scaling a campaign's average spend."""
+        pos = self._position(campaign)
+        if pos is None:
+            return 0.0
+        return float(self.avg_conversions[pos] * self.spend_multiplier_effect(campaign, multiplier))
+
+    def to_dict(self) -> Dict[str, Dict]:
+        """Fitted parameters per campaign."""
+        return {
+            campaign: {
+                'elasticity': round(float(self.elasticity[i]), 3),
+                'scale': round(float(np.exp(self.log_a[i])), 4),
+                'r_squared': round(float(self.r_squared[i]), 3),
+                'months_used': int(self.months[i]),
+                'fitted': bool(self.fitted[i]),
+            }
+            for i, campaign in enumerate(self.campaigns)
+        }
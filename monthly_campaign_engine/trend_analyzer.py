@@ -7,6 +7,8 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple
 
+from file_catalog import MonthlyFileCatalog
+
 
 class TrendAnalyzer:
     """Analyze trends and patterns across multiple months."""
@@ -22,7 +24,7 @@ class TrendAnalyzer:
             return {}
         
         changes = {}
-        months = sorted(self.df['Month'].unique())
+        months = MonthlyFileCatalog.months_in_order(self.df)
         
         for i in range(1, len(months)):
             prev_month = months[i - 1]
@@ -98,7 +100,7 @@ class TrendAnalyzer:
         
         monthly_performance = {}
         
-        for month in sorted(self.df['Month'].unique()):
+        for month in MonthlyFileCatalog.months_in_order(self.df):
             month_data = self.df[self.df['Month'] == month]
             monthly_performance[month] = {
                 'total_conversions': int(month_data['conversions'].sum()),
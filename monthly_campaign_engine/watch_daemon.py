@@ -0,0 +1,331 @@
+"""
+Watch-Folder Daemon
+Watches the monthly upload directory (inotify on Linux, polling elsewhere),
+debounces bursts of arriving exports, re-parses only the new or changed
+months and publishes the refreshed analysis to a stable JSON file that the
+Flask and Streamlit apps read.
+"""
+
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import struct
+import sys
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Set
+
+import pandas as pd
+
+# Shared helpers live in the top-level src package
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import MONTHLY_WATCH
+from src.report_sources import is_report_file, report_name
+from src.serialization import dumps
+
+from file_catalog import MonthlyFileCatalog
+from monthly_main import MonthlyCampaignEngine
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# inotify(7) event masks: files finished writing, moved in or out, or deleted
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_DELETE = 0x200
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE
+EVENT_HEADER = struct.Struct('iIII')
+
+
+def _project_path(path: str) -> Path:
+    """Resolve a configured path against the project root."""
+    path = Path(path)
+    return path if path.is_absolute() else PROJECT_ROOT / path
+
+
+def latest_results_path() -> Path:
+    """Stable location of the most recently published monthly results."""
+    return _project_path(MONTHLY_WATCH.get('output', 'results/monthly_latest.json'))
+
+
+def read_latest_results(path: str | None = None) -> Dict | None:
+    """
+    Read the most recently published monthly results.
+
+    Args:
+        path: Published results file (default: MONTHLY_WATCH['output'])
+
+    Returns:
+        The published results, or None if nothing has been published yet
+    """
+    path = Path(path) if path else latest_results_path()
+    if not path.exists():
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _is_watched(name: str) -> bool:
+    """Whether a file name is a report (hidden files such as the catalog index are not)."""
+    return not name.startswith('.') and is_report_file(name)
+
+
+class DirectoryWatcher:
+    """Block until report files in a directory change."""
+
+    def __init__(self, directory: str, poll_seconds: float = 2.0, use_inotify: bool = True):
+        """
+        Initialize watcher.
+
+        Args:
+            directory: Directory to watch
+            poll_seconds: Polling interval when inotify is unavailable
+            use_inotify: Try inotify first (Linux only)
+        """
+        self.directory = Path(directory)
+        self.poll_seconds = poll_seconds
+        self._fd = self._open_inotify() if use_inotify else None
+        self._snapshot = self._scan() if self._fd is None else {}
+
+    @property
+    def mode(self) -> str:
+        """'inotify' or 'polling'."""
+        return 'polling' if self._fd is None else 'inotify'
+
+    def _open_inotify(self) -> int | None:
+        """inotify descriptor watching the directory, or None where unavailable."""
+        if not sys.platform.startswith('linux'):
+            return None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+        if fd < 0:
+            return None
+        if libc.inotify_add_watch(fd, str(self.directory).encode(), WATCH_MASK) < 0:
+            os.close(fd)
+            return None
+        return fd
+
+    def _scan(self) -> Dict[str, tuple]:
+        """(size, mtime) of every report file, for polling."""
+        snapshot = {}
+        for path in self.directory.iterdir():
+            if _is_watched(path.name):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                snapshot[path.name] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    def _read_events(self) -> Set[str]:
+        """Names of report files in the queued inotify events."""
+        names = set()
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return names
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            _, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0').decode('utf-8', errors='replace')
+            offset += length
+            if mask & WATCH_MASK and _is_watched(name):
+                names.add(name)
+        return names
+
+    def _changes(self, timeout: float | None) -> Set[str]:
+        """Report files changed within ``timeout`` seconds (None waits indefinitely)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if self._fd is not None:
+                ready, _, _ = select.select([self._fd], [], [], remaining)
+                changed = self._read_events() if ready else set()
+            else:
+                time.sleep(self.poll_seconds if remaining is None else min(self.poll_seconds, remaining))
+                current = self._scan()
+                changed = {name for name in set(current) | set(self._snapshot)
+                           if current.get(name) != self._snapshot.get(name)}
+                self._snapshot = current
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def wait(self, debounce: float, timeout: float | None = None) -> Set[str]:
+        """
+        Wait for a burst of changes to settle.
+
+        Args:
+            debounce: Seconds without further changes that end a burst
+            timeout: Give up after this many seconds without any change (None: never)
+
+        Returns:
+            Names of the report files changed during the burst (empty on timeout)
+        """
+        changed = self._changes(timeout)
+        while changed:
+            more = self._changes(debounce)
+            if not more:
+                break
+            changed |= more
+        return changed
+
+    def close(self) -> None:
+        """Release the inotify descriptor."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class MonthlyWatchDaemon:
+    """Re-run the monthly analysis when exports in the watched directory change."""
+
+    def __init__(self, directory: str | None = None, output_path: str | None = None,
+                 debounce: float | None = None, poll_seconds: float | None = None, use_inotify: bool = True):
+        """
+        Initialize daemon (arguments default to MONTHLY_WATCH in config.py).
+
+        Args:
+            directory: Directory monthly exports are dropped into
+            output_path: File the refreshed results are published to
+            debounce: Quiet period after the last file event before re-analysing
+            poll_seconds: Polling interval when inotify is unavailable
+            use_inotify: Use inotify where available
+        """
+        self.directory = _project_path(directory or MONTHLY_WATCH.get('directory', 'uploads'))
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.output_path = Path(output_path) if output_path else latest_results_path()
+        self.debounce = MONTHLY_WATCH.get('debounce_seconds', 5) if debounce is None else debounce
+        self.poll_seconds = MONTHLY_WATCH.get('poll_seconds', 2) if poll_seconds is None else poll_seconds
+        self.use_inotify = use_inotify
+        # Parsed months shared across runs, keyed by (content hash, period)
+        self.parsed_cache: Dict[tuple, pd.DataFrame] = {}
+        self.published_sources = self._published_sources()
+
+    def _published_sources(self) -> Dict[str, str]:
+        """{period: content hash} of the months behind the currently published results."""
+        results = read_latest_results(self.output_path)
+        if not results:
+            return {}
+        return {source['period']: source['hash'] for source in results.get('sources', [])}
+
+    def _current_sources(self) -> List[Dict]:
+        """Catalog entries of the monthly exports now in the directory."""
+        catalog = MonthlyFileCatalog(str(self.directory))
+        return catalog.scan()
+
+    def refresh(self, force: bool = False) -> Dict | None:
+        """
+        Re-analyse if the set of monthly exports changed since the last publish.
+
+        Args:
+            force: Re-analyse even when no export changed
+
+        Returns:
+            The published results, or None if nothing changed or no months were found
+        """
+        entries = self._current_sources()
+        current = {entry['period']: entry['hash'] for entry in entries}
+        changed = sorted(period for period in current if self.published_sources.get(period) != current[period])
+        removed = sorted(period for period in self.published_sources if period not in current)
+        if not (changed or removed or force):
+            print("[OK] No monthly exports changed - published results are current")
+            return None
+        if not entries:
+            print(f"[WARN] No monthly exports found in {self.directory}")
+            return None
+
+        print(f"[OK] Re-analysing {len(entries)} months (changed: {', '.join(changed) or 'none'}; "
+              f"removed: {', '.join(removed) or 'none'})")
+        engine = MonthlyCampaignEngine(str(self.directory), parsed_cache=self.parsed_cache)
+        results = engine.run_analysis(output_json=False, output_console=False)
+        if not results:
+            print("[ERROR] Monthly analysis produced no results - keeping the previous publish")
+            return None
+
+        # Keep only the months still present
+        live = {(entry['hash'], entry['period']) for entry in entries}
+        for key in [key for key in self.parsed_cache if key not in live]:
+            del self.parsed_cache[key]
+
+        payload = engine.export_payload()
+        payload['published_at'] = datetime.now().isoformat()
+        payload['sources'] = [
+            {'period': entry['period'], 'file': report_name(entry['path']), 'hash': entry['hash']}
+            for entry in entries
+        ]
+        payload['changed_months'] = changed
+        payload['removed_months'] = removed
+        self._publish(payload)
+        self.published_sources = current
+        print(f"[OK] Published monthly results to {self.output_path}")
+        return payload
+
+    def _publish(self, payload: Dict) -> None:
+        """Atomically replace the published results, so readers never see a partial file."""
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.output_path.with_name(f".{self.output_path.name}.{uuid.uuid4().hex}.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(dumps(payload, indent=True))
+        os.replace(tmp_path, self.output_path)
+
+    def run(self, max_refreshes: int | None = None) -> None:
+        """
+        Watch the directory until interrupted.
+
+        Args:
+            max_refreshes: Stop after this many change bursts (None: run forever)
+        """
+        watcher = DirectoryWatcher(str(self.directory), self.poll_seconds, self.use_inotify)
+        print(f"[OK] Watching {self.directory} ({watcher.mode}); publishing to {self.output_path}")
+        try:
+            # Catch up on exports dropped while the daemon was not running
+            self.refresh()
+            bursts = 0
+            while max_refreshes is None or bursts < max_refreshes:
+                changed = watcher.wait(self.debounce)
+                bursts += 1
+                print(f"[OK] Detected changes: {', '.join(sorted(changed))}")
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"[ERROR] Monthly re-analysis failed: {str(e)}")
+        except KeyboardInterrupt:
+            print("[OK] Watch daemon stopped")
+        finally:
+            watcher.close()
+
+
+def main():
+    """Run the watch-folder daemon from the command line."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Re-run the monthly analysis when exports are dropped into a folder')
+    parser.add_argument('directory', nargs='?', default=None, help='Directory to watch (default: uploads/)')
+    parser.add_argument('--output', '-o', default=None, help='Published results file')
+    parser.add_argument('--debounce', type=float, default=None, help='Quiet seconds before re-analysing')
+    parser.add_argument('--poll', action='store_true', help='Poll instead of using inotify')
+    parser.add_argument('--once', action='store_true', help='Refresh once and exit')
+    args = parser.parse_args()
+
+    daemon = MonthlyWatchDaemon(args.directory, args.output, debounce=args.debounce, use_inotify=not args.poll)
+    if args.once:
+        daemon.refresh()
+    else:
+        daemon.run()
+
+
+if __name__ == '__main__':
+    main()
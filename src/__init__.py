@@ -6,6 +6,8 @@ AI-powered analysis and recommendations for Google Ads campaigns.
 from .data_loader import DataLoader
 from .analyzer import PerformanceAnalyzer
 from .recommender import RecommendationEngine
+from .time_series import TimeSeriesEngine
+from .rollup_cube import RollupCube
 
 __version__ = "1.0.0"
 __author__ = "Champion Cleaners Analytics Team"
@@ -13,5 +15,7 @@ __author__ = "Champion Cleaners Analytics Team"
 __all__ = [
     'DataLoader',
     'PerformanceAnalyzer',
-    'RecommendationEngine'
+    'RecommendationEngine',
+    'TimeSeriesEngine',
+    'RollupCube'
 ]
@@ -3,13 +3,31 @@ Performance Analyzer Module
 Calculates key performance metrics and detects trends/risks.
 """
 
+import numpy as np
 import pandas as pd
 from typing import Dict
 
+from config import (
+    BUDGET_THRESHOLDS,
+    CONVERSION_RATE_THRESHOLDS,
+    CPA_THRESHOLDS,
+    CTR_THRESHOLDS,
+    ROAS_THRESHOLDS,
+)
+
+from .thresholds import attach_thresholds
+
 
 class PerformanceAnalyzer:
     """Analyze Google Ads campaign performance metrics."""
     
+    # Benchmarks for campaigns whose type has none in CAMPAIGN_TYPE_THRESHOLDS
+    DEFAULT_THRESHOLDS = {
+        'ctr_threshold': CTR_THRESHOLDS['low'],
+        'conversion_rate_threshold': CONVERSION_RATE_THRESHOLDS['low'],
+        'cpa_threshold': CPA_THRESHOLDS['high'],
+    }
+    
     def __init__(self, df: pd.DataFrame):
         """
         Initialize analyzer with data.
@@ -113,6 +131,21 @@ class PerformanceAnalyzer:
             'worst_conversion_rate': (by_conversion_rate[-1][0], by_conversion_rate[-1][1]['conversion_rate']) if by_conversion_rate else None,
         }
     
+    def metrics_frame(self) -> pd.DataFrame:
+        """
+        Campaign metrics as a frame, with each campaign's benchmarks joined on.
+
+        Campaigns whose type has an entry in CAMPAIGN_TYPE_THRESHOLDS are held
+        to that type's expected CTR, conversion rate and CPA; other campaigns
+        to the global thresholds.
+
+        Returns:
+            One row per campaign (in campaign_metrics order) with the metrics
+            plus ctr_threshold, conversion_rate_threshold and cpa_threshold
+        """
+        frame = pd.DataFrame.from_dict(self.campaign_metrics, orient='index')
+        return attach_thresholds(frame, self.DEFAULT_THRESHOLDS)
+    
     def detect_trends_and_risks(self) -> list[dict[str, str | int | float]]:
         """
         Detect trends and potential issues in campaign performance.
@@ -120,63 +153,87 @@ class PerformanceAnalyzer:
         Returns:
             List of detected issues with details
         """
-        issues = []
+        if not self.campaign_metrics:
+            return []
+        frame = self.metrics_frame()
+        cpa = frame['cpa'].to_numpy(dtype=float)
+        ctr = frame['ctr'].to_numpy(dtype=float)
+        conversion_rate = frame['conversion_rate'].to_numpy(dtype=float)
+        roas = frame['roas'].to_numpy(dtype=float)
+        cost = frame['cost'].to_numpy(dtype=float)
         
-        for campaign_name, metrics in self.campaign_metrics.items():
-            # High CPA detection
-            if metrics['conversions'] > 0:
-                avg_cpa = metrics['cpa']
-                if avg_cpa > 500:  # Threshold for high CPA
-                    issues.append({
-                        'campaign': campaign_name,
-                        'issue_type': 'HIGH_CPA',
-                        'severity': 'High' if avg_cpa > 1000 else 'Medium',
-                        'value': avg_cpa,
-                        'description': f"High cost per acquisition (CPA): AED {avg_cpa}"
-                    })
-            
-            # Low CTR detection
-            if metrics['ctr'] < 1.0 and metrics['impressions'] > 100:
-                issues.append({
-                    'campaign': campaign_name,
-                    'issue_type': 'LOW_CTR',
-                    'severity': 'Medium',
-                    'value': metrics['ctr'],
-                    'description': f"Low click-through rate (CTR): {metrics['ctr']}%"
-                })
-            
-            # Low conversion rate detection
-            if metrics['clicks'] > 50 and metrics['conversion_rate'] < 1.0:
-                issues.append({
-                    'campaign': campaign_name,
-                    'issue_type': 'LOW_CONVERSION_RATE',
-                    'severity': 'High',
-                    'value': metrics['conversion_rate'],
-                    'description': f"Low conversion rate: {metrics['conversion_rate']}%"
-                })
-            
-            # Low ROAS detection
-            if metrics['roas'] > 0 and metrics['roas'] < 1.5 and metrics['cost'] > 100:
-                issues.append({
-                    'campaign': campaign_name,
-                    'issue_type': 'LOW_ROAS',
-                    'severity': 'Medium',
-                    'value': metrics['roas'],
-                    'description': f"Low return on ad spend (ROAS): {metrics['roas']}"
-                })
-            
-            # High spend with low return
-            if metrics['cost'] > 5000 and metrics['conversions'] < 10:
-                issues.append({
-                    'campaign': campaign_name,
-                    'issue_type': 'HIGH_SPEND_LOW_RETURN',
-                    'severity': 'High',
-                    'value': metrics['cost'],
-                    'description': f"High spend (AED {metrics['cost']}) with minimal conversions"
-                })
+        # Every rule evaluated for all campaigns at once, against each campaign's own benchmark
+        rules = [
+            ('HIGH_CPA', (frame['conversions'] > 0).to_numpy() & (cpa > frame['cpa_threshold'].to_numpy()),
+             'cpa_threshold'),
+            ('LOW_CTR', (ctr < frame['ctr_threshold'].to_numpy()) & (frame['impressions'] > 100).to_numpy(),
+             'ctr_threshold'),
+            ('LOW_CONVERSION_RATE',
+             (frame['clicks'] > 50).to_numpy() & (conversion_rate < frame['conversion_rate_threshold'].to_numpy()),
+             'conversion_rate_threshold'),
+            ('LOW_ROAS', (roas > 0) & (roas < ROAS_THRESHOLDS['low']) & (cost > 100), None),
+            ('HIGH_SPEND_LOW_RETURN',
+             (cost > BUDGET_THRESHOLDS['high_spend']) & (frame['conversions'] < BUDGET_THRESHOLDS['low_return']).to_numpy(),
+             None),
+        ]
+        
+        flagged = []
+        for rule, (issue_type, mask, threshold_column) in enumerate(rules):
+            for position in np.flatnonzero(mask):
+                metrics = frame.iloc[position]
+                issue = self._issue(str(frame.index[position]), issue_type, metrics)
+                if threshold_column:
+                    issue['threshold'] = float(metrics[threshold_column])
+                flagged.append((position, rule, issue))
+        # Campaign order, then rule order, as when the rules ran campaign by campaign
+        issues = [issue for _, _, issue in sorted(flagged, key=lambda x: x[:2])]
         
         return sorted(issues, key=lambda x: {'High': 0, 'Medium': 1, 'Low': 2}.get(str(x.get('severity', 'Low')), 3))
     
+    @staticmethod
+    def _issue(campaign_name: str, issue_type: str, metrics: pd.Series) -> dict[str, str | int | float]:
+        """Issue record for one campaign flagged by one rule."""
+        if issue_type == 'HIGH_CPA':
+            avg_cpa = metrics['cpa']
+            return {
+                'campaign': campaign_name,
+                'issue_type': 'HIGH_CPA',
+                'severity': 'High' if avg_cpa > 2 * metrics['cpa_threshold'] else 'Medium',
+                'value': avg_cpa,
+                'description': f"High cost per acquisition (CPA): AED {avg_cpa} (benchmark AED {metrics['cpa_threshold']:g})"
+            }
+        if issue_type == 'LOW_CTR':
+            return {
+                'campaign': campaign_name,
+                'issue_type': 'LOW_CTR',
+                'severity': 'Medium',
+                'value': metrics['ctr'],
+                'description': f"Low click-through rate (CTR): {metrics['ctr']}% (benchmark {metrics['ctr_threshold']:g}%)"
+            }
+        if issue_type == 'LOW_CONVERSION_RATE':
+            return {
+                'campaign': campaign_name,
+                'issue_type': 'LOW_CONVERSION_RATE',
+                'severity': 'High',
+                'value': metrics['conversion_rate'],
+                'description': f"Low conversion rate: {metrics['conversion_rate']}% (benchmark {metrics['conversion_rate_threshold']:g}%)"
+            }
+        if issue_type == 'LOW_ROAS':
+            return {
+                'campaign': campaign_name,
+                'issue_type': 'LOW_ROAS',
+                'severity': 'Medium',
+                'value': metrics['roas'],
+                'description': f"Low return on ad spend (ROAS): {metrics['roas']}"
+            }
+        return {
+            'campaign': campaign_name,
+            'issue_type': 'HIGH_SPEND_LOW_RETURN',
+            'severity': 'High',
+            'value': metrics['cost'],
+            'description': f"High spend (AED {metrics['cost']}) with minimal conversions"
+        }
+    
     def analyze_by_platform(self) -> Dict:
         """
         Analyze aggregate metrics by platform (Search, Display, App).
@@ -0,0 +1,212 @@
+"""
+Anomaly Detector Module
+Streaming per-campaign anomaly detection on daily metrics using a robust
+exponentially weighted mean and variance.
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from typing import Dict, List
+
+
+class AnomalyDetector:
+    """Detect daily metric anomalies per campaign with O(1) state per series."""
+
+    # Daily metrics tracked per campaign, and which direction is bad news
+    METRICS = ['cost', 'conversions', 'ctr', 'cpa', 'roas']
+    BAD_DIRECTION = {'cost': 1, 'conversions': -1, 'ctr': -1, 'cpa': 1, 'roas': -1}
+
+    EPOCH = pd.Timestamp('1970-01-01')
+
+    def __init__(self, alpha: float = 0.2, threshold: float = 3.0, warmup: int = 7,
+                 clip: float = 3.0, min_relative_std: float = 0.05):
+        """
+        Initialize detector with empty state.
+
+        Args:
+            alpha: EWMA smoothing factor (higher reacts faster)
+            threshold: |z| above which a day is flagged
+            warmup: Observations per series before anomalies are reported
+            clip: Residuals are clipped to this many std devs before updating,
+                so a single outlier barely moves the baseline
+            min_relative_std: Std floor as a fraction of the mean, so very
+                stable series don't flag tiny wobbles
+        """
+        self.alpha = alpha
+        self.threshold = threshold
+        self.warmup = warmup
+        self.clip = clip
+        self.min_relative_std = min_relative_std
+
+        self.campaigns: List[str] = []
+        self._campaign_pos: Dict[str, int] = {}
+        # One row per campaign, one column per metric; float32 keeps 100k series in ~2 MB
+        self.mean = np.zeros((0, len(self.METRICS)), dtype=np.float32)
+        self.var = np.zeros((0, len(self.METRICS)), dtype=np.float32)
+        self.count = np.zeros((0, len(self.METRICS)), dtype=np.uint32)
+        self.last_day = np.full((0, len(self.METRICS)), -1, dtype=np.int32)
+
+    @property
+    def num_series(self) -> int:
+        """Number of (campaign, metric) series tracked."""
+        return len(self.campaigns) * len(self.METRICS)
+
+    @property
+    def state_bytes(self) -> int:
+        """Memory used by the numeric state arrays."""
+        return self.mean.nbytes + self.var.nbytes + self.count.nbytes + self.last_day.nbytes
+
+    def _register(self, names: List[str]) -> np.ndarray:
+        """Get state rows for campaigns, allocating rows for new ones."""
+        new = [name for name in dict.fromkeys(names) if name not in self._campaign_pos]
+        if new:
+            for name in new:
+                self._campaign_pos[name] = len(self.campaigns)
+                self.campaigns.append(name)
+            extra = len(new)
+            self.mean = np.vstack([self.mean, np.zeros((extra, len(self.METRICS)), dtype=np.float32)])
+            self.var = np.vstack([self.var, np.zeros((extra, len(self.METRICS)), dtype=np.float32)])
+            self.count = np.vstack([self.count, np.zeros((extra, len(self.METRICS)), dtype=np.uint32)])
+            self.last_day = np.vstack([self.last_day, np.full((extra, len(self.METRICS)), -1, dtype=np.int32)])
+        return np.array([self._campaign_pos[name] for name in names], dtype=np.int64)
+
+    def _daily_values(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Aggregate rows to one per (date, campaign) with tracked metrics."""
+        frame = df[['date', 'campaign_name']].copy()
+        frame['date'] = pd.to_datetime(frame['date'], errors='coerce').dt.normalize()
+        for col in ['impressions', 'clicks', 'cost', 'conversions', 'revenue']:
+            frame[col] = pd.to_numeric(df[col], errors='coerce').fillna(0) if col in df.columns else 0.0
+        daily = frame.dropna(subset=['date']).groupby(['date', 'campaign_name'], observed=True).sum().reset_index()
+
+        # Undefined ratios (zero denominators) are skipped rather than scored
+        daily['ctr'] = daily['clicks'] / daily['impressions'].replace(0, np.nan) * 100
+        daily['cpa'] = daily['cost'] / daily['conversions'].replace(0, np.nan)
+        daily['roas'] = daily['revenue'] / daily['cost'].replace(0, np.nan)
+        if 'revenue' not in df.columns:
+            daily['roas'] = np.nan
+        return daily.sort_values(['date', 'campaign_name']).reset_index(drop=True)
+
+    def update(self, df: pd.DataFrame) -> List[Dict]:
+        """
+        Score new daily rows against each series' baseline, then fold them in.
+
+        Days already processed for a series are ignored, so feeding the
+        same file twice doesn't double count.
+
+        Args:
+            df: DataFrame with date, campaign_name and metric columns
+
+        Returns:
+            List of detected anomalies, in the analyzer's issue format
+        """
+        if df is None or df.empty:
+            return []
+
+        daily = self._daily_values(df)
+        if daily.empty:
+            return []
+
+        anomalies = []
+        rows = self._register(daily['campaign_name'].tolist())
+        days = ((daily['date'] - self.EPOCH).dt.days).to_numpy(dtype=np.int32)
+        values = daily[self.METRICS].to_numpy(dtype=np.float64)
+
+        # Days are processed in order; within a day all series update at once
+        boundaries = np.flatnonzero(np.diff(days)) + 1
+        for block in np.split(np.arange(len(daily)), boundaries):
+            anomalies.extend(self._update_day(daily, block, rows[block], days[block], values[block]))
+
+        return sorted(anomalies, key=lambda x: (x['date'], -abs(float(x['z_score']))))
+
+    def _update_day(self, daily: pd.DataFrame, block: np.ndarray, rows: np.ndarray,
+                    days: np.ndarray, values: np.ndarray) -> List[Dict]:
+        """Score and update all series observed on one day."""
+        mean = self.mean[rows].astype(np.float64)
+        var = self.var[rows].astype(np.float64)
+        count = self.count[rows]
+        fresh = (days[:, None] > self.last_day[rows]) & np.isfinite(values)
+
+        std = np.maximum(np.sqrt(var), self.min_relative_std * np.abs(mean))
+        std = np.maximum(std, 1e-9)
+        residual = values - mean
+        z = np.where(fresh, residual / std, 0.0)
+        flagged = fresh & (count >= self.warmup) & (np.abs(z) > self.threshold)
+
+        # Robust update: clip the residual once the baseline is established
+        established = count >= self.warmup
+        step = np.where(established, np.clip(residual, -self.clip * std, self.clip * std), residual)
+        new_mean = np.where(count == 0, values, mean + self.alpha * step)
+        new_var = np.where(count == 0, 0.0, (1 - self.alpha) * (var + self.alpha * step ** 2))
+
+        self.mean[rows] = np.where(fresh, new_mean, mean)
+        self.var[rows] = np.where(fresh, new_var, var)
+        self.count[rows] = count + fresh
+        self.last_day[rows] = np.where(fresh, days[:, None], self.last_day[rows])
+
+        anomalies = []
+        for i, m in zip(*np.nonzero(flagged)):
+            metric = self.METRICS[m]
+            direction = 1 if z[i, m] > 0 else -1
+            if direction != self.BAD_DIRECTION[metric]:
+                severity = 'Low'  # unusual but favourable
+            else:
+                severity = 'High' if abs(z[i, m]) > 2 * self.threshold else 'Medium'
+            record = daily.iloc[block[i]]
+            anomalies.append({
+                'campaign': record['campaign_name'],
+                'issue_type': f"{metric.upper()}_{'SPIKE' if direction > 0 else 'DROP'}",
+                'severity': severity,
+                'value': round(float(values[i, m]), 2),
+                'expected': round(float(mean[i, m]), 2),
+                'z_score': round(float(z[i, m]), 2),
+                'metric': metric,
+                'date': record['date'].strftime('%Y-%m-%d'),
+                'description': f"{metric.upper()} of {values[i, m]:.2f} on {record['date']:%Y-%m-%d} "
+                               f"vs expected {mean[i, m]:.2f} (z={z[i, m]:+.1f})"
+            })
+        return anomalies
+
+    def save(self, filepath: str) -> None:
+        """
+        Persist detector state to a compressed .npz file.
+
+        Args:
+            filepath: Destination path
+        """
+        tmp_path = f"{filepath}.tmp.npz"
+        np.savez_compressed(
+            tmp_path,
+            campaigns=np.array(self.campaigns, dtype=str),
+            metrics=np.array(self.METRICS, dtype=str),
+            mean=self.mean, var=self.var, count=self.count, last_day=self.last_day,
+            params=np.array([self.alpha, self.threshold, self.warmup, self.clip, self.min_relative_std]),
+        )
+        os.replace(tmp_path, filepath)
+
+    @classmethod
+    def load(cls, filepath: str) -> 'AnomalyDetector':
+        """
+        Restore a detector saved with save().
+
+        Args:
+            filepath: Path to the .npz state file
+
+        Returns:
+            AnomalyDetector with restored state
+
+        Raises:
+            ValueError: If the file tracks a different metric set
+        """
+        with np.load(filepath) as state:
+            if list(state['metrics']) != cls.METRICS:
+                raise ValueError(f"State file tracks different metrics: {list(state['metrics'])}")
+            alpha, threshold, warmup, clip, min_relative_std = state['params']
+            detector = cls(float(alpha), float(threshold), int(warmup), float(clip), float(min_relative_std))
+            detector.campaigns = [str(name) for name in state['campaigns']]
+            detector._campaign_pos = {name: i for i, name in enumerate(detector.campaigns)}
+            detector.mean = state['mean']
+            detector.var = state['var']
+            detector.count = state['count']
+            detector.last_day = state['last_day']
+        return detector
@@ -0,0 +1,207 @@
+"""
+Budget Allocator Module
+Constrained budget allocation across campaigns: efficiency-proportional
+shares projected onto per-campaign (or per-group) min/max caps, then
+rounded to the configured adjustment step.
+"""
+
+import numpy as np
+from typing import Dict, Sequence
+
+from config import (
+    BUDGET_ADJUSTMENT_STEP,
+    EFFICIENCY_WEIGHTS,
+    MAX_BUDGET_ALLOCATION,
+    MIN_BUDGET_ALLOCATION,
+)
+
+
+def efficiency_scores(roas: np.ndarray, conversion_rate: np.ndarray,
+                      weights: Dict[str, float] = EFFICIENCY_WEIGHTS) -> np.ndarray:
+    """
+    Weighted efficiency score per campaign.
+
+    Each metric is scaled by its mean across campaigns before weighting, so
+    the weights trade off ROAS and conversion rate independently of units.
+    Zero values fall back to 0.5, as in the original proportional rule.
+
+    Args:
+        roas: ROAS per campaign
+        conversion_rate: Conversion rate (%) per campaign
+        weights: Metric weights, e.g. {'roas': 0.6, 'conversion_rate': 0.4}
+
+    Returns:
+        Non-negative efficiency scores
+    """
+    metrics = {
+        'roas': np.where(np.asarray(roas, dtype=float) > 0, roas, 0.5),
+        'conversion_rate': np.where(np.asarray(conversion_rate, dtype=float) > 0, conversion_rate, 0.5),
+    }
+    score = np.zeros(len(metrics['roas']))
+    if len(score) == 0:
+        return score
+    for name, weight in weights.items():
+        score += weight * metrics[name] / metrics[name].mean()
+    return score
+
+
+def water_fill(scores: np.ndarray, min_share: float, max_share: float,
+               iterations: int = 100) -> np.ndarray:
+    """
+    Project score-proportional shares onto [min_share, max_share].
+
+    Finds the level ``lam`` such that ``sum(clip(lam * scores, lo, hi)) == 1``
+    by bisection, which is vectorized over all campaigns.
+
+    Args:
+        scores: Non-negative efficiency scores
+        min_share: Lower bound per item (fraction of total)
+        max_share: Upper bound per item (fraction of total)
+        iterations: Bisection steps
+
+    Returns:
+        Shares summing to 1 within the bounds
+    """
+    scores = np.asarray(scores, dtype=float)
+    n = len(scores)
+    if n == 0:
+        return scores
+    if scores.sum() <= 0:
+        scores = np.ones(n)
+
+    low_level, high_level = 0.0, max_share / scores[scores > 0].min()
+    for _ in range(iterations):
+        level = (low_level + high_level) / 2
+        if np.clip(level * scores, min_share, max_share).sum() > 1:
+            high_level = level
+        else:
+            low_level = level
+
+    shares = np.clip(low_level * scores, min_share, max_share)
+    # Hand the bisection residue to items strictly inside their bounds
+    free = (shares > min_share) & (shares < max_share)
+    if free.any():
+        shares[free] += (1 - shares.sum()) * shares[free] / shares[free].sum()
+
+    # Every positive score capped and the rest (zero scores) at the floor: raise the
+    # items below the cap equally, each up to max_share, until the shares sum to 1
+    deficit = 1 - shares.sum()
+    while deficit > 1e-12:
+        below = shares < max_share - 1e-12
+        if not below.any():
+            break
+        shares[below] = np.minimum(shares[below] + deficit / below.sum(), max_share)
+        deficit = 1 - shares.sum()
+    return shares
+
+
+def round_to_step(percentages: np.ndarray, step: float, total: float = 100.0,
+                  max_percentage: float | None = None) -> np.ndarray:
+    """
+    Round percentages to multiples of ``step`` keeping their sum (largest remainder).
+
+    Args:
+        percentages: Percentages summing to ``total``
+        step: Rounding increment in percentage points
+        total: Target sum
+        max_percentage: Upper bound no item is rounded past (None: unbounded)
+
+    Returns:
+        Rounded percentages summing to ``total``
+    """
+    units = np.asarray(percentages, dtype=float) / step
+    floored = np.floor(units + 1e-9)
+    cap = np.inf if max_percentage is None else np.floor(max_percentage / step + 1e-9)
+    missing = int(round(total / step - floored.sum()))
+    order = np.argsort(-(units - floored), kind='stable')
+    while missing > 0:
+        # Largest remainders first, skipping items already at the cap
+        eligible = order[floored[order] < cap][:missing]
+        if len(eligible) == 0:
+            break
+        floored[eligible] += 1
+        missing -= len(eligible)
+    return floored * step
+
+
+class BudgetAllocator:
+    """Allocate a budget across campaigns under min/max share constraints."""
+
+    def __init__(self, min_share: float = MIN_BUDGET_ALLOCATION, max_share: float = MAX_BUDGET_ALLOCATION,
+                 step: float = BUDGET_ADJUSTMENT_STEP, weights: Dict[str, float] = EFFICIENCY_WEIGHTS):
+        """
+        Initialize allocator.
+
+        Args:
+            min_share: Minimum share per campaign or group (fraction)
+            max_share: Maximum share per campaign or group (fraction)
+            step: Rounding step for recommended percentages (percentage points)
+            weights: Efficiency metric weights
+        """
+        self.min_share = min_share
+        self.max_share = max_share
+        self.step = step
+        self.weights = weights
+
+    def effective_bounds(self, n: int) -> tuple:
+        """
+        Bounds that are feasible for ``n`` items.
+
+        With too many items for the minimum, floors are shrunk so they claim
+        at most half the budget; with too few for the maximum, the cap is
+        raised to an even split.
+        """
+        min_share = self.min_share if n * self.min_share <= 1 else 0.5 / n
+        max_share = self.max_share if n * self.max_share >= 1 else 1 / n
+        return min_share, max_share
+
+    def effective_step(self, n: int, min_share: float) -> float:
+        """Rounding step, falling back to 0.1 points when the grid is too coarse."""
+        if n * self.step <= 100 and min_share * 100 >= self.step:
+            return self.step
+        return 0.1
+
+    def describe(self, num_campaigns: int, num_groups: int | None = None) -> Dict:
+        """Get the bounds and rounding step that apply to an allocation."""
+        min_share, max_share = self.effective_bounds(num_groups or num_campaigns)
+        step = self.effective_step(num_campaigns, min_share) if num_groups is None else 0.1
+        return {
+            'min_percentage': round(min_share * 100, 2),
+            'max_percentage': round(max_share * 100, 2),
+            'step_percentage': step,
+        }
+
+    def allocate(self, scores: np.ndarray, groups: Sequence | None = None) -> np.ndarray:
+        """
+        Compute recommended budget percentages.
+
+        Args:
+            scores: Efficiency score per campaign
+            groups: Optional group label per campaign (e.g. platform); when
+                given, the caps apply to group totals and campaigns share
+                their group's budget in proportion to their scores
+
+        Returns:
+            Recommended percentage per campaign (sums to 100)
+        """
+        scores = np.asarray(scores, dtype=float)
+        if len(scores) == 0:
+            return scores
+
+        if groups is None:
+            min_share, max_share = self.effective_bounds(len(scores))
+            shares = water_fill(scores, min_share, max_share)
+            return round_to_step(shares * 100, self.effective_step(len(scores), min_share),
+                                 max_percentage=max_share * 100)
+
+        labels, codes = np.unique(np.asarray(groups, dtype=str), return_inverse=True)
+        group_scores = np.bincount(codes, weights=scores, minlength=len(labels))
+        min_share, max_share = self.effective_bounds(len(labels))
+        group_shares = water_fill(group_scores, min_share, max_share)
+
+        # Within a group, split proportionally (even split if all scores are zero)
+        members = np.bincount(codes, minlength=len(labels))
+        within = np.where(group_scores[codes] > 0,
+                          scores / np.where(group_scores[codes] > 0, group_scores[codes], 1),
+                          1 / members[codes])
+        return round_to_step(group_shares[codes] * within * 100, 0.1)
@@ -0,0 +1,246 @@
+"""
+Budget Simulator Module
+Monte Carlo what-if simulation of budget proposals. Cost per click,
+conversions per click and value per conversion are sampled (lognormal)
+from their observed period-to-period variation, and conversion counts
+(Poisson) for all scenarios and campaigns at once.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List
+
+
+class BudgetSimulator:
+    """Simulate conversion and revenue outcomes of proposed spend levels."""
+
+    # Coefficient of variation assumed when a campaign has a single period of history
+    DEFAULT_CV = 0.2
+    MIN_CV = 0.02
+    PERCENTILES = (5, 50, 95)
+
+    def __init__(self, history: pd.DataFrame, period_col: str, campaign_col: str = 'campaign_name',
+                 revenue_col: str = 'revenue', scenarios: int = 2000, seed: int | None = 42):
+        """
+        Estimate per-campaign sampling distributions from history.
+
+        Args:
+            history: Rows with campaign, period, clicks, cost, conversions (and revenue)
+            period_col: Column identifying the period (e.g. 'date' or 'Month')
+            campaign_col: Campaign name column
+            revenue_col: Revenue column ('revenue' or 'conv_value')
+            scenarios: Number of Monte Carlo scenarios
+            seed: Random seed for reproducible intervals
+        """
+        self.scenarios = scenarios
+        self.seed = seed
+
+        frame = history[[campaign_col, period_col]].copy()
+        for col, source in (('clicks', 'clicks'), ('cost', 'cost'), ('conversions', 'conversions'),
+                            ('revenue', revenue_col)):
+            frame[col] = pd.to_numeric(history[source], errors='coerce').fillna(0) if source in history.columns else 0.0
+        periods = frame.groupby([campaign_col, period_col], observed=True)[['clicks', 'cost', 'conversions', 'revenue']].sum()
+
+        self.num_periods = max(frame[period_col].nunique(), 1)
+        totals = periods.groupby(level=0, observed=True).sum()
+        self.campaigns: List[str] = totals.index.tolist()
+        self._pos = {name: i for i, name in enumerate(self.campaigns)}
+
+        clicks = totals['clicks'].to_numpy(dtype=float)
+        cost = totals['cost'].to_numpy(dtype=float)
+        conversions = totals['conversions'].to_numpy(dtype=float)
+        revenue = totals['revenue'].to_numpy(dtype=float)
+
+        # Campaigns without clicks or spend can't be projected
+        self.valid = (clicks > 0) & (cost > 0)
+        self.current_spend = cost / self.num_periods
+        self.cpc_mean = np.where(self.valid, cost / np.where(clicks > 0, clicks, 1), 0)
+        self.rate_mean = np.where(clicks > 0, conversions / np.where(clicks > 0, clicks, 1), 0)
+        self.value_mean = np.where(conversions > 0, revenue / np.where(conversions > 0, conversions, 1), 0)
+
+        per_period = periods.assign(
+            cpc=periods['cost'] / periods['clicks'].where(periods['clicks'] > 0),
+            rate=periods['conversions'] / periods['clicks'].where(periods['clicks'] > 0),
+            value=periods['revenue'] / periods['conversions'].where(periods['conversions'] > 0),
+        )
+        self.cpc_cv = self._coefficient_of_variation(per_period['cpc'])
+        self.rate_cv = self._coefficient_of_variation(per_period['rate'])
+        self.value_cv = self._coefficient_of_variation(per_period['value'])
+
+    def _coefficient_of_variation(self, values: pd.Series) -> np.ndarray:
+        """Per-campaign CV of a per-period ratio, aligned to self.campaigns."""
+        grouped = values.groupby(level=0, observed=True)
+        stats = pd.DataFrame({'mean': grouped.mean(), 'std': grouped.std(), 'n': grouped.count()})
+        stats = stats.reindex(self.campaigns)
+        cv = (stats['std'] / stats['mean']).where((stats['n'] >= 2) & (stats['mean'] > 0))
+        return np.maximum(cv.fillna(self.DEFAULT_CV).to_numpy(dtype=float), self.MIN_CV)
+
+    @staticmethod
+    def _lognormal(rng: np.random.Generator, mean: np.ndarray, cv: np.ndarray, size: tuple) -> np.ndarray:
+        """Sample positive draws with the given mean and coefficient of variation."""
+        sigma = np.sqrt(np.log1p(cv ** 2)).astype(np.float32)
+        mu = (np.log(np.where(mean > 0, mean, 1)) - sigma ** 2 / 2).astype(np.float32)
+        draws = rng.standard_normal(size, dtype=np.float32)
+        draws *= sigma
+        draws += mu
+        np.exp(draws, out=draws)
+        draws[:, mean <= 0] = 0
+        return draws
+
+    def _sample_parameters(self, rng: np.random.Generator) -> Dict[str, np.ndarray]:
+        """Draw one (scenario, campaign) matrix per uncertain parameter."""
+        size = (self.scenarios, len(self.campaigns))
+        return {
+            'cpc': self._lognormal(rng, self.cpc_mean, self.cpc_cv, size),
+            'rate': self._lognormal(rng, self.rate_mean, self.rate_cv, size),
+            'value': self._lognormal(rng, self.value_mean, self.value_cv, size),
+        }
+
+    def _expected_conversions(self, params: Dict[str, np.ndarray], columns: np.ndarray,
+                              spend: np.ndarray, horizon: float) -> np.ndarray:
+        """Expected conversions per scenario for the given campaigns at a spend level."""
+        cpc = params['cpc'][:, columns]
+        clicks = np.where(cpc > 0, horizon * spend / np.where(cpc > 0, cpc, 1), 0)
+        return clicks * params['rate'][:, columns] * self.valid[columns]
+
+    @staticmethod
+    def _couple(rng: np.random.Generator, base: np.ndarray, base_mean: np.ndarray,
+                new_mean: np.ndarray) -> np.ndarray:
+        """
+        Draw Poisson conversions at a new mean, coupled to the baseline draw.
+
+        Increases add an independent Poisson of the extra mean (superposition);
+        decreases keep each baseline conversion with probability new/base
+        (thinning). Both give exact Poisson marginals while the change only
+        carries the noise of the change itself.
+        """
+        extra = rng.poisson(np.maximum(new_mean - base_mean, 0))
+        keep = np.divide(new_mean, base_mean, out=np.ones_like(base_mean), where=base_mean > 0)
+        return np.where(new_mean >= base_mean, base + extra, rng.binomial(base, np.minimum(keep, 1)))
+
+    def _interval(self, values: np.ndarray) -> Dict[str, float]:
+        """Mean and percentile interval of a scenario vector."""
+        low, median, high = np.percentile(values, self.PERCENTILES)
+        return {
+            'mean': round(float(values.mean()), 2),
+            'p5': round(float(low), 2),
+            'p50': round(float(median), 2),
+            'p95': round(float(high), 2),
+        }
+
+    def simulate(self, proposals: Dict[str, Dict[str, float]], horizon: float = 1,
+                 elasticities: Dict[str, float] | None = None) -> Dict[str, Dict]:
+        """
+        Simulate proposals against the current spend.
+
+        All proposals share the same sampled CPC/rate/value scenarios, so
+        differences between them reflect the spend change, not sampling luck.
+
+        Args:
+            proposals: {proposal name: {campaign: proposed spend per period}};
+                campaigns not listed keep their current spend
+            horizon: Number of periods to project
+            elasticities: Optional spend elasticity per campaign; conversions
+                then scale as (proposed / current spend) ** elasticity instead
+                of linearly
+
+        Returns:
+            Per proposal: spend, projected totals and changes with 90% intervals
+        """
+        rng = np.random.default_rng(self.seed)
+        params = self._sample_parameters(rng)
+        all_columns = np.arange(len(self.campaigns))
+        base_mean = self._expected_conversions(params, all_columns, self.current_spend, horizon)
+        base_conversions = rng.poisson(base_mean)
+        base_revenue = base_conversions * params['value']
+        base_total_conversions = base_conversions.sum(axis=1)
+        base_total_revenue = base_revenue.sum(axis=1)
+
+        results = {}
+        for name, spend_by_campaign in proposals.items():
+            known = {c: s for c, s in spend_by_campaign.items() if c in self._pos}
+            columns = np.array([self._pos[c] for c in known], dtype=int)
+            spend = np.array(list(known.values()), dtype=float)
+
+            new_mean = self._expected_conversions(params, columns, spend, horizon)
+            if elasticities:
+                exponent = np.array([elasticities.get(c, 1.0) for c in known], dtype=float)
+                current = self.current_spend[columns]
+                ratio = np.divide(spend, current, out=np.ones_like(spend), where=current > 0)
+                new_mean = np.where(current > 0, base_mean[:, columns] * ratio ** exponent, new_mean)
+            conversions = self._couple(rng, base_conversions[:, columns], base_mean[:, columns], new_mean)
+            conversion_change = (conversions - base_conversions[:, columns]).sum(axis=1)
+            revenue_change = ((conversions - base_conversions[:, columns]) * params['value'][:, columns]).sum(axis=1)
+
+            results[name] = {
+                'current_spend': round(float(self.current_spend[columns].sum() * horizon), 2),
+                'proposed_spend': round(float(spend.sum() * horizon), 2),
+                'conversions': self._interval(base_total_conversions + conversion_change),
+                'revenue': self._interval(base_total_revenue + revenue_change),
+                'conversion_change': self._interval(conversion_change),
+                'revenue_change': self._interval(revenue_change),
+                'probability_revenue_increase': round(float((revenue_change > 0).mean()), 3),
+                'unknown_campaigns': sorted(set(spend_by_campaign) - set(known)),
+                'insufficient_history': [c for c in known if not self.valid[self._pos[c]]],
+            }
+
+        return results
+
+
+def simulate_allocation(history: pd.DataFrame, budget_allocation: Dict, scenarios: int = 2000,
+                        seed: int | None = 42) -> Dict:
+    """
+    Simulate the src engine's recommended allocation over the analysed date range.
+
+    Args:
+        history: DataLoader rows (date, campaign_name, clicks, cost, conversions, revenue)
+        budget_allocation: Output of generate_budget_allocation_recommendation
+        scenarios: Number of Monte Carlo scenarios
+        seed: Random seed
+
+    Returns:
+        Simulation result for the 'recommended_allocation' proposal
+    """
+    simulator = BudgetSimulator(history, 'date', scenarios=scenarios, seed=seed)
+    total_per_period = budget_allocation['total_monthly_budget'] / simulator.num_periods
+    proposal = {
+        campaign: total_per_period * alloc.get('recommended_percentage', alloc['current_percentage']) / 100
+        for campaign, alloc in budget_allocation['allocations'].items()
+    }
+    return simulator.simulate({'recommended_allocation': proposal}, horizon=simulator.num_periods)
+
+
+def simulate_monthly_recommendations(metrics_df: pd.DataFrame, recommendations: Dict,
+                                     campaign_services: Dict[str, List[str]], scenarios: int = 2000,
+                                     seed: int | None = 42, elasticities: Dict[str, float] | None = None) -> Dict:
+    """
+    Simulate the monthly engine's budget and scaling proposals for one month.
+
+    Args:
+        metrics_df: Monthly campaign metrics (campaign_name, Month, clicks, cost, conversions, conv_value)
+        recommendations: Output of the monthly RecommendationEngine.generate_all_recommendations
+        campaign_services: Services each campaign maps to, for service-level budget changes
+        elasticities: Optional per-campaign spend elasticities (diminishing returns)
+        scenarios: Number of Monte Carlo scenarios
+        seed: Random seed
+
+    Returns:
+        Simulation results keyed by '<type>: <target>'
+    """
+    simulator = BudgetSimulator(metrics_df, 'Month', revenue_col='conv_value', scenarios=scenarios, seed=seed)
+    current = dict(zip(simulator.campaigns, simulator.current_spend))
+    proposals = {}
+
+    for rec in recommendations.get('budget_recommendations', []):
+        if not rec.get('current_spend'):
+            continue
+        factor = rec['recommended_spend'] / rec['current_spend']
+        campaigns = [c for c, services in campaign_services.items() if rec['target'] in services]
+        if campaigns:
+            proposals[f"{rec['type']}: {rec['target']}"] = {c: current.get(c, 0) * factor for c in campaigns}
+
+    for rec in recommendations.get('growth_opportunities', []):
+        if 'recommended_monthly_spend' in rec:
+            proposals[f"{rec['type']}: {rec['target']}"] = {rec['target']: rec['recommended_monthly_spend']}
+
+    return simulator.simulate(proposals, elasticities=elasticities) if proposals else {}
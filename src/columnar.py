@@ -0,0 +1,216 @@
+"""
+Columnar Module
+Compact encodings of result payloads for large result sets. Lists of
+records (audit issues, recommendations, ...) are sent as one array per
+field instead of repeating every key on every row, with low-cardinality
+text fields such as severity or issue_type dictionary-encoded. Payloads
+are encoded as columnar JSON or, when pyarrow is installed, as an Arrow
+IPC stream.
+"""
+
+import json
+from typing import Any, Dict, List
+
+from .serialization import dumps, to_native
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+COLUMNAR_JSON_MIMETYPE = 'application/vnd.columnar+json'
+ARROW_STREAM_MIMETYPE = 'application/vnd.apache.arrow.stream'
+
+# Key marking an encoded table in columnar JSON
+TABLE_KEY = '$table'
+
+# Text columns are dictionary-encoded when they have at least this many rows and
+# no more distinct values than this fraction of them
+DICTIONARY_MIN_ROWS = 4
+DICTIONARY_MAX_RATIO = 0.5
+
+
+def _is_records(value: Any) -> bool:
+    """Whether a value is a non-empty list of dicts."""
+    return isinstance(value, list) and bool(value) and all(isinstance(item, dict) for item in value)
+
+
+def _field_names(records: List[Dict]) -> List[str]:
+    """Keys of every record, in first-seen order."""
+    fields: Dict[Any, None] = {}
+    for record in records:
+        # Records nearly always share their keys, so the subset test is usually all it takes
+        if not fields.keys() >= record.keys():
+            fields.update(dict.fromkeys(record))
+    return list(fields)
+
+
+def _is_enum(values: List[Any]) -> bool:
+    """Whether a column is text with few enough distinct values to dictionary-encode."""
+    if len(values) < DICTIONARY_MIN_ROWS:
+        return False
+    try:
+        distinct = set(values)
+    except TypeError:
+        # Unhashable values (dicts, lists) are never enums
+        return False
+    distinct.discard(None)
+    return (bool(distinct) and len(distinct) <= len(values) * DICTIONARY_MAX_RATIO
+            and all(isinstance(value, str) for value in distinct))
+
+
+def to_columnar(obj: Any) -> Any:
+    """
+    Replace every list of records in a result tree with a columnar table.
+
+    A table is ``{"$table": {"length": n, "fields": [...], "columns": {field:
+    values}, "dictionaries": {field: distinct values}, "missing": {field: rows}}}``.
+    Columns listed in ``dictionaries`` hold indices into that list (null
+    stays null). Fields some records lack are null in those rows, which
+    ``missing`` lists so decoding restores the original records.
+
+    Args:
+        obj: Result tree (dicts and lists are walked recursively)
+
+    Returns:
+        The tree with record lists replaced
+    """
+    if isinstance(obj, dict):
+        return {key: to_columnar(value) for key, value in obj.items()}
+    if not isinstance(obj, list):
+        return obj
+    if not _is_records(obj):
+        return [to_columnar(item) for item in obj]
+
+    fields = _field_names(obj)
+    complete = all(len(record) == len(fields) for record in obj)
+    columns, dictionaries, missing = {}, {}, {}
+    for field in fields:
+        values = [record.get(field) for record in obj]
+        if _is_enum(values):
+            codes: Dict[str, int] = {}
+            columns[field] = [None if value is None else codes.setdefault(value, len(codes)) for value in values]
+            dictionaries[field] = list(codes)
+        else:
+            # Only containers can hold further record lists
+            columns[field] = [to_columnar(value) if isinstance(value, (dict, list)) else value for value in values]
+        if not complete:
+            absent = [row for row, record in enumerate(obj) if field not in record]
+            if absent:
+                missing[field] = absent
+    return {TABLE_KEY: {'length': len(obj), 'fields': fields, 'columns': columns,
+                        'dictionaries': dictionaries, 'missing': missing}}
+
+
+def from_columnar(obj: Any) -> Any:
+    """
+    Decode a columnar JSON tree back into lists of records (the inverse of to_columnar()).
+
+    Args:
+        obj: Parsed columnar JSON
+
+    Returns:
+        The result tree with tables expanded to lists of dicts
+    """
+    if isinstance(obj, list):
+        return [from_columnar(item) for item in obj]
+    if not isinstance(obj, dict):
+        return obj
+    if set(obj) != {TABLE_KEY}:
+        return {key: from_columnar(value) for key, value in obj.items()}
+
+    table = obj[TABLE_KEY]
+    columns = {}
+    for field in table['fields']:
+        values = table['columns'][field]
+        dictionary = table['dictionaries'].get(field)
+        if dictionary is not None:
+            columns[field] = [None if code is None else dictionary[code] for code in values]
+        else:
+            columns[field] = [from_columnar(value) for value in values]
+    records = [{field: columns[field][row] for field in table['fields']} for row in range(table['length'])]
+    for field, rows in table.get('missing', {}).items():
+        for row in rows:
+            del records[row][field]
+    return records
+
+
+def dumps_columnar(obj: Any) -> bytes:
+    """Encode a result tree as columnar JSON bytes."""
+    return dumps(to_columnar(obj))
+
+
+def _arrow_struct(records: List[Dict | None]) -> 'pa.Array':
+    """Struct array with one child per record field (None records are null)."""
+    fields = _field_names([record for record in records if record is not None])
+    children = [_arrow_array([None if record is None else record.get(field) for record in records])
+                for field in fields]
+    mask = pa.array([record is None for record in records], type=pa.bool_())
+    return pa.StructArray.from_arrays(children, [str(field) for field in fields], mask=mask)
+
+
+def _arrow_array(values: List[Any]) -> 'pa.Array':
+    """
+    Arrow array of one column.
+
+    Record lists become list<struct>, dicts become structs, repetitive text
+    becomes dictionary<int32, string>, and values pyarrow cannot type
+    consistently (e.g. a field mixing text and numbers) fall back to JSON text.
+    """
+    present = [value for value in values if value is not None]
+    if present and all(isinstance(value, list) for value in present):
+        items = [item for value in present for item in value]
+        if all(isinstance(item, dict) for item in items) and any(items):
+            offsets = [0]
+            for value in values:
+                offsets.append(offsets[-1] + (len(value) if value is not None else 0))
+            mask = pa.array([value is None for value in values], type=pa.bool_())
+            return pa.ListArray.from_arrays(pa.array(offsets, type=pa.int32()), _arrow_struct(items), mask=mask)
+    elif present and all(isinstance(value, dict) for value in present) and any(present):
+        return _arrow_struct(values)
+
+    try:
+        array = pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        native = to_native(values)
+        try:
+            array = pa.array(native)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            return pa.array([None if value is None else json.dumps(value) for value in native], type=pa.string())
+    if (pa.types.is_string(array.type) and len(array) >= DICTIONARY_MIN_ROWS
+            and pc.count_distinct(array).as_py() <= len(array) * DICTIONARY_MAX_RATIO):
+        return array.dictionary_encode()
+    return array
+
+
+def to_arrow_table(obj: Dict | List[Dict]) -> 'pa.Table':
+    """
+    Arrow table of a result payload.
+
+    Args:
+        obj: A list of records (one row each) or a result dict (one row, one
+            column per key, record lists as list<struct> columns)
+
+    Returns:
+        pyarrow Table
+
+    Raises:
+        ImportError: If pyarrow is not installed
+    """
+    if not HAS_PYARROW:
+        raise ImportError("Arrow responses require pyarrow (pip install pyarrow)")
+    if _is_records(obj):
+        return pa.Table.from_struct_array(_arrow_struct(obj))
+    names = [str(key) for key in obj]
+    return pa.Table.from_arrays([_arrow_array([value]) for value in obj.values()], names=names)
+
+
+def dumps_arrow(obj: Dict | List[Dict]) -> bytes:
+    """Encode a result payload as an Arrow IPC stream (see to_arrow_table())."""
+    table = to_arrow_table(obj)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
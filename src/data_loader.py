@@ -4,9 +4,14 @@ Handles CSV loading, validation, and data cleaning for Google Ads performance da
 """
 
 import pandas as pd
-from typing import Tuple, Dict, List
+from typing import Tuple, Dict, List, TYPE_CHECKING
 import os
 
+from .format_sniffer import read_reports
+
+if TYPE_CHECKING:
+    from .history_store import HistoryStore
+
 
 class DataLoader:
     """Load and validate Google Ads performance data from CSV files."""
@@ -23,14 +28,16 @@ class DataLoader:
     
     OPTIONAL_COLUMNS = ['revenue', 'installs', 'platform', 'device_os']
     
-    def __init__(self, filepath: str):
+    def __init__(self, filepath: str, history: 'HistoryStore | None' = None):
         """
         Initialize DataLoader with CSV file path.
         
         Args:
             filepath: Path to the CSV file
+            history: Optional history store the cleaned rows are upserted into
         """
         self.filepath = filepath
+        self.history = history
         self.df: pd.DataFrame | None = None
         self.validation_warnings = []
         self.validation_errors = []
@@ -44,20 +51,27 @@ class DataLoader:
             
         Raises:
             FileNotFoundError: If file doesn't exist
-            ValueError: If required columns are missing
+            ValueError: If the file is not a campaign report or required columns are missing
         """
         if not os.path.exists(self.filepath):
             raise FileNotFoundError(f"File not found: {self.filepath}")
         
         try:
-            self.df = pd.read_csv(self.filepath)
+            # CSV, .csv.gz/.csv.zst or a zip of reports, each parsed in one pass with its schema
+            self.df = read_reports(self.filepath, ['campaign'], 'campaign')
             print(f"[OK] Loaded {len(self.df)} rows from {self.filepath}")
+        except ValueError:
+            raise
         except Exception as e:
             raise ValueError(f"Failed to load CSV: {str(e)}")
         
         self._validate_columns()
         self._clean_data()
         
+        if self.history is not None:
+            partitions = self.history.upsert('campaign', self.df)
+            print(f"[OK] Stored rows in {partitions} history partition(s)")
+        
         return self.df
     
     def _validate_columns(self) -> None:
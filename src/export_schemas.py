@@ -0,0 +1,233 @@
+"""
+Export Schemas Module
+Single registry of the Google Ads report layouts the loaders understand.
+Each schema compiles its header aliases into one lookup table, and the
+registry picks a schema from a file's header row, so column resolution
+and read options (usecols, dtypes, converters) are computed once per file.
+"""
+
+import pandas as pd
+from typing import Callable, Dict, List, Sequence
+
+# Google Ads writes " --" for empty metric cells
+NA_VALUES = [' --', '--']
+
+
+def parse_percent(value: str) -> float:
+    """Parse a percentage cell ('7.18%', '1,234.5%', ' --') into a number of percent."""
+    text = str(value).strip().rstrip('%').replace(',', '')
+    try:
+        return float(text)
+    except ValueError:
+        return float('nan')
+
+
+class ExportSchema:
+    """One report layout: canonical columns, their header aliases and column types."""
+
+    def __init__(self, name: str, columns: Dict[str, List[str]], fingerprint: Sequence[str],
+                 percent: Sequence[str] = (), text: Sequence[str] = ()):
+        """
+        Initialize and compile a schema.
+
+        Args:
+            name: Report type ('campaign', 'keyword', 'search_terms', 'monthly')
+            columns: {canonical name: header aliases, most preferred first}
+            fingerprint: Canonical columns a header must provide to match this schema
+            percent: Canonical columns holding 'NN.N%' text
+            text: Canonical columns kept as strings
+        """
+        self.name = name
+        self.columns = columns
+        self.fingerprint = set(fingerprint)
+        self.percent = set(percent)
+        self.text = set(text)
+
+        # Compiled once: normalized header -> (canonical name, alias preference);
+        # the canonical name itself is accepted as the least preferred alias
+        self._lookup: Dict[str, tuple] = {}
+        for canonical, aliases in columns.items():
+            for rank, alias in enumerate(list(aliases) + [canonical]):
+                self._lookup.setdefault(self._key(alias), (canonical, rank))
+
+    @staticmethod
+    def _key(header: str) -> str:
+        """Normalized form headers are matched on."""
+        return str(header).strip().casefold()
+
+    def resolve(self, headers: Sequence[str]) -> Dict[str, str]:
+        """
+        Map a file's headers to canonical names.
+
+        When several headers alias the same canonical column, the most
+        preferred alias wins.
+
+        Args:
+            headers: Header row of the file
+
+        Returns:
+            {header: canonical name} for every recognized header, in header order
+        """
+        best: Dict[str, tuple] = {}
+        for header in headers:
+            match = self._lookup.get(self._key(header))
+            if match is None:
+                continue
+            canonical, rank = match
+            if canonical not in best or rank < best[canonical][1]:
+                best[canonical] = (header, rank)
+        chosen = {header: canonical for canonical, (header, _) in best.items()}
+        return {header: chosen[header] for header in headers if header in chosen}
+
+    def matches(self, headers: Sequence[str]) -> bool:
+        """Whether the headers provide every fingerprint column."""
+        return self.fingerprint <= set(self.resolve(headers).values())
+
+    def read_options(self, headers: Sequence[str], columns: Sequence[str] | None = None) -> Dict:
+        """
+        Typed pd.read_csv options parsing only the schema's columns.
+
+        Args:
+            headers: Header row of the file
+            columns: Canonical columns to keep (default: every recognized column)
+
+        Returns:
+            Dict of usecols, dtype, converters, thousands and na_values
+            (metric columns are left to the C parser's numeric inference,
+            so a stray text cell is coerced by the loader instead of
+            failing the whole read)
+        """
+        wanted = set(columns) if columns is not None else None
+        resolved = {header: canonical for header, canonical in self.resolve(headers).items()
+                    if wanted is None or canonical in wanted}
+        dtype: Dict[str, str] = {}
+        converters: Dict[str, Callable] = {}
+        for header, canonical in resolved.items():
+            if canonical in self.percent:
+                converters[header] = parse_percent
+            elif canonical in self.text:
+                dtype[header] = 'str'
+        return {
+            'usecols': list(resolved),
+            'dtype': dtype,
+            'converters': converters,
+            'thousands': ',',
+            'na_values': NA_VALUES,
+        }
+
+    def rename(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Rename recognized columns of a DataFrame to their canonical names."""
+        return df.rename(columns=self.resolve(list(df.columns)))
+
+
+SCHEMAS: Dict[str, ExportSchema] = {
+    'search_terms': ExportSchema(
+        'search_terms',
+        columns={
+            'search_term': ['Search term'],
+            'campaign_name': ['Campaign'],
+            'ad_group_name': ['Ad group'],
+            'keyword': ['Keyword'],
+            'match_type': ['Match type', 'Search terms match type'],
+            'impressions': ['Impr.', 'Impressions'],
+            'clicks': ['Clicks'],
+            'cost': ['Cost'],
+            'conversions': ['Conversions'],
+            'revenue': ['Conv. value'],
+        },
+        fingerprint=['search_term'],
+        text=['search_term', 'campaign_name', 'ad_group_name', 'keyword', 'match_type'],
+    ),
+    'keyword': ExportSchema(
+        'keyword',
+        columns={
+            'campaign_name': ['Campaign'],
+            'ad_group_name': ['Ad group'],
+            'keyword': ['Keyword', 'Search keyword'],
+            'match_type': ['Match type'],
+            'campaign_type': ['Campaign type'],
+            'impressions': ['Impr.', 'Impressions'],
+            'clicks': ['Clicks'],
+            'cost': ['Cost'],
+            'conversions': ['Conversions'],
+            'revenue': ['Conv. value'],
+            'quality_score': ['Quality Score'],
+            'search_term': ['Search term'],
+            'ctr_percent': [],
+            'conversion_rate_percent': [],
+        },
+        fingerprint=['keyword', 'match_type'],
+        text=['campaign_name', 'campaign_type', 'ad_group_name', 'keyword', 'match_type', 'search_term'],
+    ),
+    'monthly': ExportSchema(
+        'monthly',
+        columns={
+            'campaign_name': ['Campaign', 'Campaign name'],
+            'campaign_type': ['Campaign type', 'Type'],
+            'impressions': ['Impr.', 'Impressions', 'Impr'],
+            'clicks': ['Interactions', 'Clicks', 'Clks'],
+            'cost': ['Cost', 'Spend', 'Ad spend'],
+            'conversions': ['Conversions', 'Conv.', 'Conv'],
+            'conv_value': ['Conv. value', 'Conversion value', 'Revenue'],
+            'conv_rate': ['Conv. rate', 'Conversion rate'],
+            'interaction_rate': ['Interaction rate', 'CTR', 'Click rate'],
+            'avg_cpc': ['Avg. cost', 'CPC', 'avg_cost', 'Avg. CPC'],
+            'campaign_status': ['Campaign status', 'Status'],
+            'optimization_score': ['Optimization score', 'Opt. score'],
+            'bid_strategy': ['Bid strategy type', 'Bid strategy'],
+        },
+        fingerprint=['campaign_name', 'campaign_status', 'impressions'],
+        percent=['conv_rate', 'interaction_rate', 'optimization_score'],
+        text=['campaign_name', 'campaign_type', 'campaign_status', 'bid_strategy'],
+    ),
+    'campaign': ExportSchema(
+        'campaign',
+        columns={
+            'date': ['Day', 'Date'],
+            'campaign_name': ['Campaign'],
+            'campaign_type': ['Campaign type'],
+            'impressions': ['Impr.', 'Impressions'],
+            'clicks': ['Clicks', 'Interactions'],
+            'cost': ['Cost'],
+            'conversions': ['Conversions'],
+            'revenue': ['Conv. value'],
+            'installs': ['Installs'],
+            'platform': ['Platform', 'Network'],
+            'device_os': ['Device', 'Operating system'],
+            'service': ['Service'],
+        },
+        fingerprint=['campaign_name'],
+        text=['campaign_name', 'campaign_type', 'platform', 'device_os', 'service'],
+    ),
+}
+
+
+def detect_schema(headers: Sequence[str]) -> ExportSchema | None:
+    """
+    Pick the schema matching a header row.
+
+    Schemas are tried from most to least specific (search terms, keyword,
+    monthly campaign export, flat campaign report).
+
+    Args:
+        headers: Header row of the file
+
+    Returns:
+        The matching schema, or None if no fingerprint matches
+    """
+    for schema in SCHEMAS.values():
+        if schema.matches(headers):
+            return schema
+    return None
+
+
+def get_schema(name: str) -> ExportSchema:
+    """
+    Look up a schema by report type.
+
+    Raises:
+        KeyError: If no schema has that name
+    """
+    if name not in SCHEMAS:
+        raise KeyError(f"Unknown report schema '{name}' (available: {', '.join(SCHEMAS)})")
+    return SCHEMAS[name]
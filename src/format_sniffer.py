@@ -0,0 +1,173 @@
+"""
+Format Sniffer Module
+Detects the layout of a CSV report (encoding, delimiter, preamble length,
+header row and report type) from its first few KB, so loaders can parse
+the file with a single full read instead of retrying on failure.
+"""
+
+import codecs
+import csv
+from collections import Counter
+from typing import Dict, List, Sequence
+
+import pandas as pd
+
+from .export_schemas import detect_schema, get_schema
+from .report_sources import expand_sources, open_source, report_name
+
+SNIFF_BYTES = 8192
+DELIMITERS = ',\t;|'
+
+
+def _detect_encoding(head: bytes) -> str:
+    """Encoding of a file from its byte-order mark, falling back to UTF-8 then cp1252."""
+    if head.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        # Google Ads "CSV for Excel" exports are tab-separated UTF-16
+        return 'utf-16'
+    try:
+        # Incremental decoding tolerates a multi-byte character cut off at the sample boundary
+        codecs.getincrementaldecoder('utf-8')().decode(head, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'cp1252'
+
+
+def _detect_delimiter(lines: List[str]) -> str:
+    """Delimiter splitting the most lines into the same number (>1) of fields."""
+    best, best_score = ',', (0, 0)
+    for delimiter in DELIMITERS:
+        counts = Counter(len(row) for row in csv.reader(lines, delimiter=delimiter) if len(row) > 1)
+        if counts:
+            fields, lines_agreeing = counts.most_common(1)[0]
+            if (lines_agreeing, fields) > best_score:
+                best, best_score = delimiter, (lines_agreeing, fields)
+    return best
+
+
+def _read_head(handle, size: int) -> bytes:
+    """Read up to ``size`` bytes (decompressing streams may return short reads)."""
+    chunks, remaining = [], size
+    while remaining > 0:
+        chunk = handle.read(remaining)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b''.join(chunks)
+
+
+def sniff(filepath: str, sample_bytes: int = SNIFF_BYTES) -> Dict:
+    """
+    Detect a CSV report's layout from the start of the file.
+
+    Args:
+        filepath: Path to the CSV file (compressed files and archive members
+            are decompressed on the fly, see report_sources)
+        sample_bytes: Bytes read from the start of the file
+
+    Returns:
+        Dict with encoding, delimiter, skiprows (preamble lines before the
+        header), title, columns and report_type (name of the matching
+        export schema, None if unrecognized)
+
+    Raises:
+        ValueError: If no header row is found in the sample
+    """
+    with open_source(filepath) as f:
+        head = _read_head(f, sample_bytes)
+        truncated = bool(f.read(1))
+
+    encoding = _detect_encoding(head)
+    text = head.decode(encoding, errors='replace')
+    lines = text.splitlines()
+    if truncated and len(lines) > 1:
+        # The last line may be cut off mid-row
+        lines = lines[:-1]
+
+    # Preamble lines (report title, date range) hold a single field; the header is the
+    # first line with several fields that the following line agrees with
+    delimiter = _detect_delimiter(lines[-20:])
+    rows = list(csv.reader(lines, delimiter=delimiter))
+    header_index = None
+    for i, row in enumerate(rows):
+        if len(row) < 2:
+            continue
+        following = rows[i + 1] if i + 1 < len(rows) else None
+        if following is None or len(following) == len(row):
+            header_index = i
+            break
+    if header_index is None:
+        raise ValueError(f"No header row found in the first {sample_bytes} bytes of {filepath}")
+
+    columns = [col.strip() for col in rows[header_index]]
+    schema = detect_schema(columns)
+    preamble = [row[0].strip() for row in rows[:header_index] if row]
+    return {
+        'encoding': encoding,
+        'delimiter': delimiter,
+        'skiprows': header_index,
+        'title': preamble[0] if preamble else None,
+        'columns': columns,
+        'report_type': schema.name if schema else None,
+    }
+
+
+def read_report(filepath: str, fmt: Dict | None = None, **read_csv_kwargs) -> pd.DataFrame:
+    """
+    Parse a CSV report in one pass using its sniffed layout.
+
+    Args:
+        filepath: Path to the CSV file
+        fmt: Result of sniff() (sniffed here if None)
+        **read_csv_kwargs: Extra pd.read_csv options (thousands, na_values, ...)
+
+    Returns:
+        Parsed DataFrame
+    """
+    fmt = fmt or sniff(filepath)
+    with open_source(filepath) as handle:
+        return pd.read_csv(handle, skiprows=fmt['skiprows'], sep=fmt['delimiter'],
+                           encoding=fmt['encoding'], **read_csv_kwargs)
+
+
+def read_reports(path: str, accepted: Sequence[str], expected: str,
+                 columns: Sequence[str] | None = None) -> pd.DataFrame:
+    """
+    Read every report of the accepted types from a CSV, compressed CSV or zip.
+
+    Each report is sniffed, parsed with its schema's read options and
+    renamed to canonical columns; archive members of other report types
+    are skipped with a warning.
+
+    Args:
+        path: Input file
+        accepted: Report types to load (unrecognized layouts are read whole)
+        expected: Report type named in the error when nothing matches
+        columns: Canonical columns to parse (default: all the schema maps)
+
+    Returns:
+        The reports concatenated in archive order
+
+    Raises:
+        ValueError: If no report in the input has an accepted type
+    """
+    frames, rejected = [], []
+    for source in expand_sources(path):
+        fmt = sniff(source)
+        report_type = fmt['report_type']
+        if report_type is not None and report_type not in accepted:
+            rejected.append((source, report_type))
+            continue
+        schema = get_schema(report_type) if report_type else None
+        options = schema.read_options(fmt['columns'], columns) if schema else {}
+        df = read_report(source, fmt, **options)
+        frames.append(schema.rename(df) if schema else df)
+
+    if not frames:
+        got = rejected[0][1].replace('_', ' ')
+        raise ValueError(f"Expected a {expected} report, got a {got} report")
+    for source, report_type in rejected:
+        print(f"[WARN] Skipped {report_name(source)}: {report_type.replace('_', ' ')} report")
+    return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
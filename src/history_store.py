@@ -0,0 +1,249 @@
+"""
+History Store Module
+Local partitioned columnar store for loaded reports. Rows are kept as
+Parquet files under <root>/<report_type>/account=<account>/month=<YYYY-MM>/,
+so reads can skip whole partitions and only decode the requested columns.
+"""
+
+import os
+import re
+import time
+import uuid
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+from typing import Dict, List, Sequence
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+from config import HISTORY_STORE
+
+
+class HistoryStore:
+    """Append/upsert report rows into account/report-type/month Parquet partitions."""
+
+    # Columns identifying a row within a partition; an upsert replaces rows with the same key
+    REPORT_KEYS = {
+        'campaign': ['date', 'campaign_name', 'campaign_type', 'platform', 'device_os'],
+        'monthly': ['Month', 'Campaign'],
+        'keyword': ['campaign_name', 'ad_group_name', 'keyword', 'match_type', 'search_term'],
+    }
+    # Column each report's month partition is derived from (others use the snapshot month)
+    MONTH_SOURCES = {'campaign': 'date', 'monthly': 'Period'}
+
+    PARTITION_COLUMNS = ['account', 'month']
+    DATA_FILE = 'data.parquet'
+
+    def __init__(self, root: str, account: str = 'default'):
+        """
+        Initialize store rooted at a directory.
+
+        Args:
+            root: Directory holding the partitions (created on first write)
+            account: Default account partition for writes and reads
+
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        if not HAS_PYARROW:
+            raise ImportError("The history store requires pyarrow (pip install pyarrow)")
+        self.root = Path(root)
+        self.account = account
+
+    @classmethod
+    def from_config(cls) -> 'HistoryStore | None':
+        """Build the store configured in HISTORY_STORE, or None when disabled or unavailable."""
+        if not HISTORY_STORE.get('enabled'):
+            return None
+        if not HAS_PYARROW:
+            print("[WARN] History store enabled but pyarrow is not installed - skipping")
+            return None
+        root = Path(HISTORY_STORE.get('path', 'history'))
+        if not root.is_absolute():
+            root = Path(__file__).parent.parent / root
+        return cls(str(root), HISTORY_STORE.get('account', 'default'))
+
+    @staticmethod
+    def _slug(value: str) -> str:
+        """Make a value safe to use as a partition directory name."""
+        return re.sub(r'[^A-Za-z0-9_.-]+', '_', str(value)).strip('_') or 'unknown'
+
+    def _partition_dir(self, report_type: str, account: str, month: str) -> Path:
+        """Directory of one account/month partition."""
+        return self.root / report_type / f"account={self._slug(account)}" / f"month={month}"
+
+    def _months(self, report_type: str, df: pd.DataFrame, month: str | None) -> pd.Series:
+        """Month partition ('YYYY-MM') of every row."""
+        snapshot = month or date.today().strftime('%Y-%m')
+        source = self.MONTH_SOURCES.get(report_type)
+        if source is None or source not in df.columns:
+            return pd.Series(snapshot, index=df.index)
+
+        values = df[source]
+        if isinstance(values.dtype, pd.PeriodDtype):
+            months = values.astype(str)
+        else:
+            months = pd.to_datetime(values, errors='coerce').dt.strftime('%Y-%m')
+        return months.where(months.notna(), snapshot).astype(str)
+
+    @staticmethod
+    def _normalize(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Coerce columns to a small set of stable Parquet types.
+
+        Numbers become float64, datetimes stay timestamps and everything else
+        is stored as strings, so partitions written from different files
+        always share a compatible schema.
+        """
+        out = pd.DataFrame(index=df.index)
+        for col in df.columns:
+            values = df[col]
+            if pd.api.types.is_bool_dtype(values) or pd.api.types.is_numeric_dtype(values):
+                out[col] = values.astype('float64')
+            elif pd.api.types.is_datetime64_any_dtype(values):
+                out[col] = pd.to_datetime(values).astype('datetime64[ns]')
+            else:
+                out[col] = values.astype(object).where(values.notna(), None)
+                out[col] = out[col].map(lambda v: v if v is None else str(v))
+        return out.reset_index(drop=True)
+
+    def _write_file(self, path: Path, frame: pd.DataFrame) -> None:
+        """Write a partition file atomically."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        pq.write_table(table, tmp_path, compression='snappy')
+        os.replace(tmp_path, path)
+
+    def _split(self, report_type: str, df: pd.DataFrame, month: str | None):
+        """Yield (month, normalized rows) for each month partition in df."""
+        if report_type not in self.REPORT_KEYS:
+            raise ValueError(f"Unknown report type '{report_type}' (use {', '.join(self.REPORT_KEYS)})")
+        months = self._months(report_type, df, month)
+        for partition_month, rows in df.groupby(months.to_numpy(), sort=True):
+            yield partition_month, self._normalize(rows)
+
+    def append(self, report_type: str, df: pd.DataFrame, account: str | None = None,
+               month: str | None = None) -> int:
+        """
+        Add rows as new files without reading existing partitions.
+
+        Args:
+            report_type: 'campaign', 'monthly' or 'keyword'
+            df: Rows to store
+            account: Account partition (default: the store's account)
+            month: Snapshot month for reports without a date column
+
+        Returns:
+            Number of partitions written
+        """
+        written = 0
+        for partition_month, rows in self._split(report_type, df, month):
+            directory = self._partition_dir(report_type, account or self.account, partition_month)
+            # Time-ordered names, so a later upsert lets the newest part win
+            self._write_file(directory / f"part-{time.time_ns():020d}-{uuid.uuid4().hex[:8]}.parquet", rows)
+            written += 1
+        return written
+
+    def upsert(self, report_type: str, df: pd.DataFrame, account: str | None = None,
+               month: str | None = None) -> int:
+        """
+        Merge rows into their partitions, replacing rows with the same key.
+
+        Each touched partition is rewritten as a single file; other
+        partitions are not read.
+
+        Args:
+            report_type: 'campaign', 'monthly' or 'keyword'
+            df: Rows to store
+            account: Account partition (default: the store's account)
+            month: Snapshot month for reports without a date column
+
+        Returns:
+            Number of partitions written
+        """
+        written = 0
+        for partition_month, rows in self._split(report_type, df, month):
+            directory = self._partition_dir(report_type, account or self.account, partition_month)
+            existing = sorted(directory.glob('*.parquet')) if directory.exists() else []
+            if existing:
+                previous = [pq.read_table(path).to_pandas() for path in existing]
+                rows = pd.concat(previous + [rows], ignore_index=True)
+                keys = [col for col in self.REPORT_KEYS[report_type] if col in rows.columns]
+                if keys:
+                    rows = rows.drop_duplicates(subset=keys, keep='last').reset_index(drop=True)
+
+            self._write_file(directory / self.DATA_FILE, rows)
+            for path in existing:
+                if path.name != self.DATA_FILE:
+                    path.unlink()
+            written += 1
+        return written
+
+    def _dataset(self, report_type: str) -> 'ds.Dataset | None':
+        """Dataset over all partitions of a report type, with a unified schema."""
+        base = self.root / report_type
+        files = sorted(base.glob('account=*/month=*/*.parquet')) if base.exists() else []
+        if not files:
+            return None
+
+        partition_schema = pa.schema([(name, pa.string()) for name in self.PARTITION_COLUMNS])
+        # Footers only: columns added in later files are read as nulls from older ones
+        file_schema = pa.unify_schemas([pq.read_schema(path) for path in files])
+        schema = pa.unify_schemas([file_schema, partition_schema])
+        return ds.dataset([str(path) for path in files], format='parquet', schema=schema,
+                          partitioning=ds.partitioning(partition_schema, flavor='hive'),
+                          partition_base_dir=str(base))
+
+    def read(self, report_type: str, columns: Sequence[str] | None = None, account: str | None = None,
+             start_month: str | None = None, end_month: str | None = None,
+             filters: Dict[str, object] | None = None) -> pd.DataFrame:
+        """
+        Read stored rows, pruning partitions and columns before decoding.
+
+        Args:
+            report_type: 'campaign', 'monthly' or 'keyword'
+            columns: Columns to return (default: all)
+            account: Account partition (default: the store's account; '*' for all)
+            start_month: First month to include ('YYYY-MM')
+            end_month: Last month to include ('YYYY-MM')
+            filters: {column: value or list of values} row predicates
+
+        Returns:
+            DataFrame of matching rows (empty if nothing is stored)
+        """
+        dataset = self._dataset(report_type)
+        if dataset is None:
+            return pd.DataFrame(columns=list(columns or []))
+
+        account = account or self.account
+        expression = None
+        conditions = []
+        if account != '*':
+            conditions.append(ds.field('account') == self._slug(account))
+        if start_month:
+            conditions.append(ds.field('month') >= start_month)
+        if end_month:
+            conditions.append(ds.field('month') <= end_month)
+        for col, value in (filters or {}).items():
+            values = list(value) if isinstance(value, (list, tuple, set)) else [value]
+            conditions.append(ds.field(col).isin(values))
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+
+        table = dataset.to_table(columns=list(columns) if columns else None, filter=expression)
+        return table.to_pandas()
+
+    def partitions(self, report_type: str, account: str | None = None) -> List[str]:
+        """List stored months for a report type and account."""
+        base = self.root / report_type / f"account={self._slug(account or self.account)}"
+        if not base.exists():
+            return []
+        return sorted(path.name.split('=', 1)[1] for path in base.glob('month=*') if any(path.glob('*.parquet')))
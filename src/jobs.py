@@ -0,0 +1,137 @@
+"""
+Jobs Module
+Background analysis jobs with an append-only event log, so several
+clients can follow a run's progress (and resume after a reconnect).
+"""
+
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, List
+
+from .progress import ProgressCallback
+from .serialization import dumps
+
+
+class Job:
+    """One background run: its events, final result and status."""
+
+    def __init__(self, kind: str):
+        """Initialize a pending job of the given kind."""
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = 'pending'
+        self.result: Any = None
+        self.error: str | None = None
+        self.events: List[Dict] = []
+        self._changed = threading.Condition()
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job has completed or failed."""
+        return self.status in ('completed', 'failed')
+
+    def emit(self, event: Dict) -> None:
+        """Append an event and wake up any waiting streams."""
+        with self._changed:
+            self.events.append({'id': len(self.events), **event})
+            self._changed.notify_all()
+
+    def _finish(self, status: str, result: Any = None, error: str | None = None) -> None:
+        """Record the outcome and emit the final event."""
+        with self._changed:
+            self.result = result
+            self.error = error
+            self.status = status
+            # Same lock as the status change: streams never see "finished" without this event
+            self.emit({'event': 'done', 'status': status, 'error': error})
+
+    def iter_events(self, after: int = -1, heartbeat: float = 15.0) -> Iterator[Dict | None]:
+        """
+        Yield events with an id above ``after`` as they arrive.
+
+        Yields None when nothing happened for ``heartbeat`` seconds, so
+        callers can keep idle connections alive. Stops after the job ends.
+        """
+        position = after + 1
+        while True:
+            with self._changed:
+                if position >= len(self.events) and not self.finished:
+                    self._changed.wait(timeout=heartbeat)
+                pending = self.events[position:]
+                finished = self.finished
+            position += len(pending)
+            if pending:
+                yield from pending
+            elif finished:
+                return
+            else:
+                yield None
+
+    def to_dict(self, include_result: bool = True) -> Dict:
+        """Job status (and result once completed)."""
+        payload = {'job_id': self.id, 'kind': self.kind, 'status': self.status,
+                   'events': len(self.events), 'error': self.error}
+        if include_result and self.status == 'completed':
+            payload['result'] = self.result
+        return payload
+
+
+class JobRegistry:
+    """Start jobs on background threads and keep the most recent ones."""
+
+    def __init__(self, max_jobs: int = 32):
+        """
+        Initialize registry.
+
+        Args:
+            max_jobs: Finished jobs beyond this count are forgotten, oldest first
+        """
+        self.max_jobs = max_jobs
+        self._jobs: 'OrderedDict[str, Job]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def start(self, kind: str, target: Callable[[ProgressCallback], Any]) -> Job:
+        """
+        Run ``target(progress_callback)`` on a background thread.
+
+        Args:
+            kind: Job kind label (e.g. 'campaign', 'keyword')
+            target: Callable receiving the job's progress callback and
+                returning the result payload (exceptions fail the job)
+
+        Returns:
+            The started Job
+        """
+        job = Job(kind)
+
+        def run():
+            job.status = 'running'
+            try:
+                job._finish('completed', result=target(job.emit))
+            except Exception as e:
+                job._finish('failed', error=str(e))
+
+        with self._lock:
+            self._jobs[job.id] = job
+            self._evict()
+        threading.Thread(target=run, name=f"job-{job.id[:8]}", daemon=True).start()
+        return job
+
+    def _evict(self) -> None:
+        """Drop the oldest finished jobs beyond the limit."""
+        excess = len(self._jobs) - self.max_jobs
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished][:max(excess, 0)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Job | None:
+        """Look up a job by id."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+
+def format_sse(event: Dict | None) -> str:
+    """Encode an event as a server-sent event frame (None gives a keep-alive comment)."""
+    if event is None:
+        return ": keep-alive\n\n"
+    return f"id: {event['id']}\nevent: {event['event']}\ndata: {dumps(event).decode('utf-8')}\n\n"
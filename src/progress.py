@@ -0,0 +1,64 @@
+"""
+Progress Module
+Structured progress events for the analysis orchestrators. Each stage
+emits a plain dict that callers can print, queue or stream to a browser.
+"""
+
+import time
+from typing import Any, Callable, Dict
+
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+
+class ProgressTracker:
+    """Emit stage, partial-result and completion events for one analysis run."""
+
+    def __init__(self, total_stages: int, callback: ProgressCallback | None = None):
+        """
+        Initialize tracker.
+
+        Args:
+            total_stages: Number of stages the run goes through
+            callback: Receives each event dict (no-op if None)
+        """
+        self.total_stages = total_stages
+        self.callback = callback
+        self.step = 0
+        self.rows: int | None = None
+        self.started = time.perf_counter()
+
+    def _emit(self, event: str, **fields) -> None:
+        """Send one event with the common timing fields."""
+        if self.callback is None:
+            return
+        self.callback({
+            'event': event,
+            'step': self.step,
+            'total_steps': self.total_stages,
+            'elapsed': round(time.perf_counter() - self.started, 3),
+            **fields,
+        })
+
+    def stage(self, name: str, rows: int | None = None) -> None:
+        """
+        Mark the start of the next stage.
+
+        Args:
+            name: Human-readable stage name
+            rows: Rows processed so far (kept for later events if given)
+        """
+        self.step += 1
+        if rows is not None:
+            self.rows = rows
+        self._emit('stage', stage=name, rows=self.rows,
+                   percent=round(100 * (self.step - 1) / self.total_stages, 1))
+
+    def partial(self, key: str, value: Any) -> None:
+        """Publish an intermediate result as soon as a stage produces it."""
+        self._emit('partial', key=key, value=value, rows=self.rows)
+
+    def complete(self, rows: int | None = None) -> None:
+        """Mark the run as finished."""
+        if rows is not None:
+            self.rows = rows
+        self._emit('complete', rows=self.rows, percent=100.0)
@@ -3,8 +3,11 @@ Recommendation Engine Module
 Generates intelligent, data-driven recommendations based on performance analysis.
 """
 
+import numpy as np
 from typing import Dict, List, Any
-import json
+
+from .budget_allocator import BudgetAllocator, efficiency_scores
+from .serialization import dumps
 
 
 class RecommendationEngine:
@@ -236,67 +239,63 @@ class RecommendationEngine:
             }
         }
     
-    def generate_budget_allocation_recommendation(self) -> Dict:
+    def generate_budget_allocation_recommendation(self, group_by: str | None = None) -> Dict:
         """
         Generate overall budget allocation recommendation across all campaigns.
         
+        Shares follow weighted ROAS/conversion-rate efficiency, bounded by the
+        configured min/max allocation and rounded to the adjustment step.
+        
+        Args:
+            group_by: Optional campaign attribute ('platform' or 'campaign_type')
+                to apply the allocation caps to groups instead of campaigns
+        
         Returns:
             Dictionary with budget allocation suggestions
         """
-        total_cost = sum(m['cost'] for m in self.campaign_metrics.values())
+        names = list(self.campaign_metrics)
+        metrics_list = [self.campaign_metrics[name] for name in names]
         
-        allocations = {}
+        cost = np.array([m['cost'] for m in metrics_list], dtype=float)
+        roas = np.array([m['roas'] for m in metrics_list], dtype=float)
+        conversion_rate = np.array([m['conversion_rate'] for m in metrics_list], dtype=float)
         
-        for campaign_name, metrics in self.campaign_metrics.items():
-            current_pct = (metrics['cost'] / total_cost * 100) if total_cost > 0 else 0
-            
-            # Calculate recommended allocation based on performance
-            roas = metrics['roas'] if metrics['roas'] > 0 else 0.5
-            conversion_rate = metrics['conversion_rate'] if metrics['conversion_rate'] > 0 else 0.5
-            efficiency_score = (roas * conversion_rate)
-            
+        total_cost = cost.sum()
+        current_pct = cost / total_cost * 100 if total_cost > 0 else np.zeros(len(names))
+        
+        allocator = BudgetAllocator()
+        scores = efficiency_scores(roas, conversion_rate, allocator.weights)
+        groups = [m.get(group_by, 'Unknown') for m in metrics_list] if group_by else None
+        recommended = allocator.allocate(scores, groups)
+        
+        allocations = {}
+        for i, campaign_name in enumerate(names):
+            metrics = metrics_list[i]
             allocations[campaign_name] = {
                 'current_budget': metrics['cost'],
-                'current_percentage': round(current_pct, 1),
-                'efficiency_score': round(efficiency_score, 2),
+                'current_percentage': round(float(current_pct[i]), 1),
+                'efficiency_score': round(float(scores[i]), 2),
                 'metrics': {
                     'roas': metrics['roas'],
                     'conversion_rate': metrics['conversion_rate'],
                     'cpa': metrics['cpa']
-                }
+                },
+                'recommended_percentage': round(float(recommended[i]), 1),
+                'budget_adjustment': round(float(recommended[i] - round(current_pct[i], 1)), 1)
             }
+            if group_by:
+                allocations[campaign_name]['group'] = groups[i]
         
-        # Normalize efficiency scores for allocation
-        total_score = sum(a['efficiency_score'] for a in allocations.values())
-        
-        if total_score > 0:
-            for campaign in allocations:
-                allocations[campaign]['recommended_percentage'] = round(
-                    (allocations[campaign]['efficiency_score'] / total_score * 100), 1
-                )
-                allocations[campaign]['budget_adjustment'] = round(
-                    allocations[campaign]['recommended_percentage'] - allocations[campaign]['current_percentage'], 1
-                )
+        num_groups = len(set(groups)) if groups else None
         
         return {
-            'total_monthly_budget': round(total_cost, 2),
+            'total_monthly_budget': round(float(total_cost), 2),
             'allocations': allocations,
-            'notes': 'Allocations based on ROAS and conversion rate efficiency'
+            'constraints': {**allocator.describe(len(names), num_groups), 'group_by': group_by},
+            'notes': 'Allocations based on weighted ROAS and conversion rate efficiency, '
+                     'within min/max allocation limits'
         }
     
-    def _convert_to_serializable(self, obj):
-        """Convert numpy/pandas types to Python native types for JSON serialization."""
-        if isinstance(obj, dict):
-            return {key: self._convert_to_serializable(val) for key, val in obj.items()}
-        elif isinstance(obj, list):
-            return [self._convert_to_serializable(item) for item in obj]
-        elif isinstance(obj, (int, float)):
-            return float(obj) if isinstance(obj, float) else int(obj)
-        elif obj is None or isinstance(obj, (str, bool)):
-            return obj
-        else:
-            return str(obj)
-    
     def export_recommendations_json(self, filepath: str | None = None) -> str:
         """
         Export recommendations as JSON.
@@ -317,14 +316,11 @@ class RecommendationEngine:
             'budget_allocation': self.generate_budget_allocation_recommendation()
         }
         
-        # Convert to serializable format
-        output = self._convert_to_serializable(output)
-        
-        json_str = json.dumps(output, indent=2)
+        json_bytes = dumps(output, indent=True)
         
         if filepath:
-            with open(filepath, 'w') as f:
-                f.write(json_str)
+            with open(filepath, 'wb') as f:
+                f.write(json_bytes)
             print(f"[OK] Recommendations exported to {filepath}")
         
-        return json_str
+        return json_bytes.decode('utf-8')
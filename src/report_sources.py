@@ -0,0 +1,207 @@
+"""
+Report Sources Module
+Opens report inputs that arrive compressed, bundled or as workbooks
+(.csv.gz, .csv.zst, .xlsx, .zip with several exports) as streaming binary
+CSV handles, so the parsers read them without extracting anything to disk.
+"""
+
+import csv
+import gzip
+import io
+import zipfile
+from datetime import datetime, time
+from pathlib import Path
+from typing import BinaryIO, List
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+try:
+    import openpyxl
+    HAS_OPENPYXL = True
+except ImportError:
+    HAS_OPENPYXL = False
+
+# Separates an archive path from a member name: "exports.zip::Mar 2025.csv"
+MEMBER_SEPARATOR = '::'
+
+# Single-file compression suffixes, the workbook suffix and the archive suffix
+COMPRESSED_SUFFIXES = ('.gz', '.zst')
+WORKBOOK_SUFFIX = '.xlsx'
+ARCHIVE_SUFFIX = '.zip'
+MEMBER_SUFFIXES = ('.csv', '.csv.gz', '.csv.zst', WORKBOOK_SUFFIX)
+REPORT_SUFFIXES = MEMBER_SUFFIXES + (ARCHIVE_SUFFIX,)
+
+
+def is_report_file(filename: str) -> bool:
+    """Whether a filename is a CSV report, a compressed CSV, a workbook or a zip of reports."""
+    return str(filename).lower().endswith(REPORT_SUFFIXES)
+
+
+def split_source(source: str) -> tuple:
+    """(container path, member name or None) of a source."""
+    path, sep, member = str(source).partition(MEMBER_SEPARATOR)
+    return path, (member if sep else None)
+
+
+def report_name(source: str) -> str:
+    """File name of the report a source holds, without compression suffixes."""
+    path, member = split_source(source)
+    name = Path(member or path).name
+    for suffix in COMPRESSED_SUFFIXES:
+        if name.lower().endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+def expand_sources(path: str) -> List[str]:
+    """
+    List the reports inside an input.
+
+    Args:
+        path: A CSV, compressed CSV or zip archive
+
+    Returns:
+        One source per CSV member for archives (in archive order, folders and
+        macOS metadata skipped), otherwise just the path itself
+
+    Raises:
+        ValueError: If a zip holds no CSV reports
+    """
+    path = str(path)
+    if not path.lower().endswith(ARCHIVE_SUFFIX):
+        return [path]
+
+    with zipfile.ZipFile(path) as archive:
+        members = [
+            info.filename for info in archive.infolist()
+            if not info.is_dir() and not info.filename.startswith('__MACOSX/')
+            and info.filename.lower().endswith(MEMBER_SUFFIXES)
+        ]
+    if not members:
+        raise ValueError(f"No CSV or XLSX reports found in {Path(path).name}")
+    return [f"{path}{MEMBER_SEPARATOR}{member}" for member in members]
+
+
+def _cell_text(cell) -> str:
+    """CSV text of a worksheet cell, as Google Ads would have written it to a CSV export."""
+    value = cell.value
+    if value is None:
+        return ''
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and '%' in (cell.number_format or ''):
+        # Percent-formatted numbers (0.0718) become the "7.18%" text CSV exports carry
+        return f"{value * 100:.10g}%"
+    if isinstance(value, datetime):
+        return value.date().isoformat() if value.time() == time() else value.isoformat(sep=' ')
+    return str(value)
+
+
+class XlsxCsvStream(io.RawIOBase):
+    """
+    First worksheet of a workbook rendered as UTF-8 CSV, one row at a time.
+
+    The workbook is opened in openpyxl's read-only mode, so rows are parsed
+    from the sheet XML as they are read and memory stays bounded by one
+    row plus the read buffer, whatever the workbook size.
+    """
+
+    def __init__(self, handle: BinaryIO):
+        """
+        Open a workbook for streaming.
+
+        Raises:
+            ImportError: If openpyxl is not installed
+        """
+        if not HAS_OPENPYXL:
+            handle.close()
+            raise ImportError("Reading .xlsx reports requires openpyxl (pip install openpyxl)")
+        super().__init__()
+        self._handle = handle
+        self._workbook = openpyxl.load_workbook(handle, read_only=True, data_only=True)
+        self._rows = self._workbook.worksheets[0].iter_rows()
+        self._pending = bytearray()
+        self._line = io.StringIO()
+        self._writer = csv.writer(self._line, lineterminator='\n')
+
+    def readable(self) -> bool:
+        return True
+
+    def _render(self, row) -> bytes:
+        """One CSV line; a row holding only a leading value (title, date range) stays one field."""
+        values = [_cell_text(cell) for cell in row]
+        if values and not any(values[1:]):
+            values = values[:1] if values[0] else []
+        self._line.seek(0)
+        self._line.truncate()
+        self._writer.writerow(values)
+        return self._line.getvalue().encode('utf-8')
+
+    def readinto(self, buffer) -> int:
+        while len(self._pending) < len(buffer):
+            row = next(self._rows, None)
+            if row is None:
+                break
+            self._pending += self._render(row)
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        del self._pending[:size]
+        return size
+
+    def close(self) -> None:
+        if not self.closed:
+            self._workbook.close()
+            self._handle.close()
+        super().close()
+
+
+def _decompress(handle: BinaryIO, name: str) -> BinaryIO:
+    """Wrap a raw handle in a streaming decoder (decompressor or workbook reader) chosen by its suffix."""
+    lowered = name.lower()
+    if lowered.endswith(WORKBOOK_SUFFIX):
+        return io.BufferedReader(XlsxCsvStream(handle))
+    if lowered.endswith('.gz'):
+        return gzip.GzipFile(fileobj=handle, mode='rb')
+    if lowered.endswith('.zst'):
+        if not HAS_ZSTD:
+            handle.close()
+            raise ImportError("Reading .zst reports requires zstandard (pip install zstandard)")
+        return zstandard.ZstdDecompressor().stream_reader(handle, closefd=True)
+    return handle
+
+
+def open_source(source: str) -> BinaryIO:
+    """
+    Open a report as a streaming binary handle.
+
+    Args:
+        source: A file path, or an archive member ("archive.zip::member.csv")
+
+    Returns:
+        Readable binary file object (decompressed on the fly; workbooks are
+        streamed as CSV text)
+
+    Raises:
+        FileNotFoundError: If the file or archive member does not exist
+        ImportError: For .zst input without zstandard, or .xlsx without openpyxl
+    """
+    path, member = split_source(source)
+    if member is None:
+        return _decompress(open(path, 'rb'), path)
+
+    archive = zipfile.ZipFile(path)
+    try:
+        handle = archive.open(member)
+    except KeyError:
+        archive.close()
+        raise FileNotFoundError(f"{member} not found in {Path(path).name}")
+    # Members stay readable after the archive object is closed
+    archive.close()
+    return _decompress(handle, member)
+
+
+def source_exists(source: str) -> bool:
+    """Whether the file (or archive) a source points into exists."""
+    return Path(split_source(source)[0]).exists()
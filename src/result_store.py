@@ -0,0 +1,193 @@
+"""
+Result Store Module
+Keeps complete analysis result lists server-side so clients can page,
+sort and filter them with cursors instead of re-running the analysis.
+"""
+
+import base64
+import hashlib
+import json
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Sequence
+
+# Ordinal labels sort by rank rather than alphabetically
+ORDINAL_RANKS = {'critical': 4, 'high': 3, 'medium': 2, 'low': 1}
+ORDINAL_FIELDS = {'severity', 'priority', 'confidence', 'confidence_level'}
+
+
+def _sort_key(field: str):
+    """Key function sorting items by a field: numbers numerically, labels by rank, text case-insensitively."""
+    def key(item: Dict):
+        value = item.get(field)
+        if value is None:
+            return (1, 0, 0)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return (0, 0, value)
+        text = str(value)
+        if field in ORDINAL_FIELDS and text.lower() in ORDINAL_RANKS:
+            return (0, 0, ORDINAL_RANKS[text.lower()])
+        return (0, 1, text.casefold())
+    return key
+
+
+class ResultStore:
+    """Retain recent result collections and serve cursor-paginated views of them."""
+
+    DEFAULT_LIMIT = 50
+    MAX_LIMIT = 1000
+
+    def __init__(self, max_results: int = 16, max_views: int = 64):
+        """
+        Initialize store.
+
+        Args:
+            max_results: Results retained, least recently used evicted first
+            max_views: Sorted/filtered orderings cached across results
+        """
+        self.max_results = max_results
+        self.max_views = max_views
+        self._results: 'OrderedDict[str, Dict[str, List[Dict]]]' = OrderedDict()
+        self._views: 'OrderedDict[tuple, List[int]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, collections: Dict[str, List[Dict]], result_id: str | None = None) -> str:
+        """
+        Retain a result's collections.
+
+        Args:
+            collections: {collection name: list of finding dicts}
+            result_id: Deterministic id (e.g. the result's ETag), replacing any
+                result already stored under it; a random id when None
+
+        Returns:
+            Result id used by the paging calls
+        """
+        result_id = result_id or uuid.uuid4().hex
+        with self._lock:
+            if result_id in self._results:
+                # Cached views of the replaced result are stale
+                for view in [v for v in self._views if v[0] == result_id]:
+                    del self._views[view]
+            self._results[result_id] = {name: list(items) for name, items in collections.items()}
+            self._results.move_to_end(result_id)
+            while len(self._results) > self.max_results:
+                evicted, _ = self._results.popitem(last=False)
+                for view in [v for v in self._views if v[0] == evicted]:
+                    del self._views[view]
+        return result_id
+
+    def describe(self, result_id: str) -> Dict[str, int] | None:
+        """Item count per collection of a retained result (None if unknown or evicted)."""
+        with self._lock:
+            result = self._results.get(result_id)
+            if result is None:
+                return None
+            self._results.move_to_end(result_id)
+            return {name: len(items) for name, items in result.items()}
+
+    @staticmethod
+    def _encode_cursor(offset: int, view: str) -> str:
+        """Opaque cursor for the next page of a view."""
+        raw = json.dumps({'o': offset, 'v': view}, separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> tuple:
+        """Offset and view fingerprint stored in a cursor."""
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            data = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            return int(data['o']), str(data['v'])
+        except (ValueError, KeyError, TypeError):
+            raise ValueError("Invalid cursor")
+
+    @staticmethod
+    def _view_key(result_id: str, collection: str, sort: str | None, descending: bool,
+                  filters: Dict[str, Sequence[str]]) -> tuple:
+        """Normalized identity of a sorted/filtered view."""
+        frozen_filters = tuple(sorted((field, tuple(sorted({str(v).casefold() for v in values})))
+                                      for field, values in filters.items() if values))
+        return (result_id, collection, sort, descending, frozen_filters)
+
+    def _view(self, items: List[Dict], key: tuple) -> List[int]:
+        """Positions of matching items in view order, computed once per view."""
+        with self._lock:
+            if key in self._views:
+                self._views.move_to_end(key)
+                return self._views[key]
+
+        _, _, sort, descending, filters = key
+        positions = [
+            i for i, item in enumerate(items)
+            if all(str(item.get(field)).casefold() in allowed for field, allowed in filters)
+        ]
+        if sort is not None:
+            item_key = _sort_key(sort)
+            missing = [i for i in positions if items[i].get(sort) is None]
+            present = sorted((i for i in positions if items[i].get(sort) is not None),
+                             key=lambda i: item_key(items[i]), reverse=descending)
+            # Items without the field go last in either direction
+            positions = present + missing
+
+        with self._lock:
+            self._views[key] = positions
+            while len(self._views) > self.max_views:
+                self._views.popitem(last=False)
+        return positions
+
+    def page(self, result_id: str, collection: str, cursor: str | None = None, limit: int | None = None,
+             sort: str | None = None, descending: bool = False,
+             filters: Dict[str, Sequence[str]] | None = None) -> Dict:
+        """
+        Get one page of a retained collection.
+
+        Args:
+            result_id: Id returned by put()
+            collection: Collection name (e.g. 'audit')
+            cursor: Cursor from the previous page (None for the first page)
+            limit: Items per page (capped at MAX_LIMIT)
+            sort: Field to sort by (original order if None)
+            descending: Sort direction
+            filters: {field: allowed values}, matched case-insensitively
+
+        Returns:
+            Dict with items, total matches and next_cursor (None on the last page)
+
+        Raises:
+            KeyError: Unknown or evicted result, or unknown collection
+            ValueError: Invalid cursor or limit, or a cursor from a different view
+        """
+        with self._lock:
+            result = self._results.get(result_id)
+            if result is None:
+                raise KeyError("Unknown or expired result")
+            self._results.move_to_end(result_id)
+        if collection not in result:
+            raise KeyError(f"Unknown collection '{collection}' (available: {', '.join(result)})")
+
+        limit = self.DEFAULT_LIMIT if limit is None else limit
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        limit = min(limit, self.MAX_LIMIT)
+
+        items = result[collection]
+        key = self._view_key(result_id, collection, sort, descending, filters or {})
+        positions = self._view(items, key)
+
+        # The cursor is bound to its view, so it can't be replayed against another sort/filter
+        view_id = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()[:16]
+        offset = 0
+        if cursor:
+            offset, cursor_view = self._decode_cursor(cursor)
+            if cursor_view != view_id or offset < 0:
+                raise ValueError("Cursor does not belong to this sort/filter view")
+
+        end = offset + limit
+        return {
+            'collection': collection,
+            'total': len(positions),
+            'items': [items[i] for i in positions[offset:end]],
+            'next_cursor': self._encode_cursor(end, view_id) if end < len(positions) else None,
+        }
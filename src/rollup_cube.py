@@ -0,0 +1,159 @@
+"""
+Rollup Cube Module
+Precomputed additive cube of campaign metrics. Every combination of the
+available dimensions is summed once; ratios are derived when a slice is read.
+"""
+
+import hashlib
+import os
+from collections import OrderedDict
+from itertools import combinations
+
+import pandas as pd
+from typing import Dict, Iterable, List, Sequence
+
+from .time_series import TimeSeriesEngine
+
+
+class RollupCube:
+    """Sums of additive metrics for every dimension combination of a dataset."""
+
+    MEASURES = ['impressions', 'clicks', 'cost', 'conversions', 'revenue']
+    # Candidate dimensions, in display order; only those present are used
+    DIMENSIONS = ['campaign_name', 'campaign_type', 'platform', 'device_os', 'month', 'service']
+
+    def __init__(self, df: pd.DataFrame):
+        """
+        Build the base cuboid and roll it up into every coarser cuboid.
+
+        Args:
+            df: DataLoader rows (date, campaign_name, metric columns and
+                optional campaign_type, platform, device_os, service)
+        """
+        frame = pd.DataFrame(index=df.index)
+        if 'date' in df.columns:
+            frame['month'] = pd.to_datetime(df['date'], errors='coerce').dt.strftime('%Y-%m')
+        for dim in self.DIMENSIONS:
+            if dim in df.columns:
+                frame[dim] = df[dim]
+        self.dimensions: List[str] = [dim for dim in self.DIMENSIONS if dim in frame.columns]
+        for dim in self.dimensions:
+            frame[dim] = frame[dim].astype(object).where(frame[dim].notna(), 'Unknown').astype(str)
+        for col in self.MEASURES:
+            frame[col] = pd.to_numeric(df[col], errors='coerce').fillna(0) if col in df.columns else 0.0
+
+        self.num_rows = len(frame)
+        self.cuboids: Dict[frozenset, pd.DataFrame] = {}
+        self._build(frame)
+
+    def _build(self, frame: pd.DataFrame) -> None:
+        """Materialize all 2^d cuboids, each rolled up from its smallest parent."""
+        full = frozenset(self.dimensions)
+        if self.dimensions:
+            self.cuboids[full] = frame.groupby(self.dimensions, observed=True)[self.MEASURES].sum().reset_index()
+        else:
+            self.cuboids[full] = frame[self.MEASURES].sum().to_frame().T
+
+        for size in range(len(self.dimensions) - 1, -1, -1):
+            for dims in combinations(self.dimensions, size):
+                key = frozenset(dims)
+                parent = min((self.cuboids[key | {extra}] for extra in full - key), key=len)
+                if dims:
+                    self.cuboids[key] = parent.groupby(list(dims), observed=True)[self.MEASURES].sum().reset_index()
+                else:
+                    self.cuboids[key] = parent[self.MEASURES].sum().to_frame().T
+
+    @property
+    def num_cells(self) -> int:
+        """Total rows stored across all cuboids."""
+        return sum(len(cuboid) for cuboid in self.cuboids.values())
+
+    def _check_dimensions(self, dims: Iterable[str]) -> None:
+        """Raise ValueError for dimensions this dataset doesn't have."""
+        unknown = [dim for dim in dims if dim not in self.dimensions]
+        if unknown:
+            raise ValueError(f"Unknown dimension(s): {', '.join(unknown)} "
+                             f"(available: {', '.join(self.dimensions)})")
+
+    def query(self, group_by: Sequence[str] = (), filters: Dict[str, Sequence[str]] | None = None,
+              sort_by: str | None = None, ascending: bool = False) -> pd.DataFrame:
+        """
+        Answer a slice from the precomputed cuboids.
+
+        Args:
+            group_by: Dimensions to group by (empty for the grand total)
+            filters: {dimension: allowed values}; rows must match every dimension
+            sort_by: Optional measure or ratio to sort by
+            ascending: Sort direction
+
+        Returns:
+            DataFrame with the group_by columns, summed measures and ratios
+        """
+        group_by = list(dict.fromkeys(group_by))
+        filters = filters or {}
+        self._check_dimensions(group_by + list(filters))
+
+        # The finest cuboid needed holds both the grouped and the filtered dimensions
+        cuboid = self.cuboids[frozenset(group_by) | frozenset(filters)]
+        if filters:
+            mask = pd.Series(True, index=cuboid.index)
+            for dim, values in filters.items():
+                mask &= cuboid[dim].isin([str(v) for v in values])
+            cuboid = cuboid[mask]
+            if group_by:
+                cuboid = cuboid.groupby(group_by, observed=True)[self.MEASURES].sum().reset_index()
+            else:
+                cuboid = cuboid[self.MEASURES].sum().to_frame().T
+
+        result = TimeSeriesEngine.add_ratios(cuboid[group_by + self.MEASURES])
+        if sort_by is not None:
+            if sort_by not in result.columns:
+                raise ValueError(f"Cannot sort by '{sort_by}'")
+            result = result.sort_values(sort_by, ascending=ascending, kind='stable')
+        elif group_by:
+            result = result.sort_values(group_by, kind='stable')
+        return result.reset_index(drop=True)
+
+    def describe(self) -> Dict:
+        """Dimensions and distinct values available for slicing."""
+        return {
+            'dimensions': {dim: sorted(self.cuboids[frozenset([dim])][dim].tolist()) for dim in self.dimensions},
+            'measures': self.MEASURES,
+            'source_rows': self.num_rows,
+            'cells': self.num_cells,
+        }
+
+
+_CUBE_CACHE: 'OrderedDict[str, RollupCube]' = OrderedDict()
+CUBE_CACHE_SIZE = 8
+
+
+def dataset_key(filepath: str) -> str:
+    """Cache key for a data file: its path, size and modification time."""
+    stat = os.stat(filepath)
+    identity = f"{os.path.abspath(filepath)}:{stat.st_size}:{stat.st_mtime_ns}"
+    return hashlib.sha1(identity.encode('utf-8')).hexdigest()
+
+
+def get_cube(key: str, df: pd.DataFrame | None = None) -> RollupCube | None:
+    """
+    Get a cached cube, building it from ``df`` on a miss.
+
+    Args:
+        key: Dataset key (see dataset_key)
+        df: Rows to build from if the cube isn't cached
+
+    Returns:
+        RollupCube, or None on a miss without data
+    """
+    if key in _CUBE_CACHE:
+        _CUBE_CACHE.move_to_end(key)
+        return _CUBE_CACHE[key]
+    if df is None:
+        return None
+
+    cube = RollupCube(df)
+    _CUBE_CACHE[key] = cube
+    if len(_CUBE_CACHE) > CUBE_CACHE_SIZE:
+        _CUBE_CACHE.popitem(last=False)
+    return cube
@@ -0,0 +1,115 @@
+"""
+Serialization Module
+Fast JSON encoding for analysis results containing NumPy and pandas values.
+"""
+
+import json
+import math
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def to_native(obj: Any) -> Any:
+    """
+    Convert a result tree to plain Python types.
+
+    NaN and infinite floats become None so every encoder emits ``null``.
+    Unknown objects are stringified.
+
+    Args:
+        obj: Value to convert (dicts and lists are walked recursively)
+
+    Returns:
+        JSON-compatible Python value
+    """
+    if obj is None or isinstance(obj, (str, bool)):
+        return obj
+    if isinstance(obj, dict):
+        return {_native_key(k): to_native(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple, set)):
+        return [to_native(item) for item in obj]
+    if isinstance(obj, (np.bool_,)):
+        return bool(obj)
+    if isinstance(obj, (int, np.integer)):
+        return int(obj)
+    if isinstance(obj, (float, np.floating, Decimal)):
+        value = float(obj)
+        return value if math.isfinite(value) else None
+    if isinstance(obj, np.ndarray):
+        return to_native(obj.tolist())
+    if isinstance(obj, pd.DataFrame):
+        return to_native(obj.to_dict(orient='records'))
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return to_native(obj.tolist())
+    if obj is pd.NaT or obj is pd.NA:
+        return None
+    if isinstance(obj, (datetime, date, pd.Timestamp)):
+        return obj.isoformat()
+    return str(obj)
+
+
+def _native_key(key: Any) -> str:
+    """Convert a mapping key to a JSON object key."""
+    return key if isinstance(key, str) else str(to_native(key))
+
+
+def _orjson_default(obj: Any) -> Any:
+    """Fallback hook for types orjson does not encode natively."""
+    if isinstance(obj, (pd.DataFrame, pd.Series, pd.Index, set, Decimal)):
+        return to_native(obj)
+    if obj is pd.NaT or obj is pd.NA:
+        return None
+    if isinstance(obj, pd.Timestamp):
+        return obj.isoformat()
+    return str(obj)
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    Encode a result tree as UTF-8 JSON bytes.
+
+    Uses orjson (with native NumPy support) when installed and falls back
+    to the standard library encoder otherwise. Both paths emit ``null``
+    for NaN/inf.
+
+    Args:
+        obj: Value to encode
+        indent: Pretty-print with two-space indentation
+
+    Returns:
+        Encoded JSON bytes
+    """
+    if HAS_ORJSON:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=_orjson_default, option=option)
+        except (orjson.JSONEncodeError, TypeError):
+            # e.g. NumPy scalar dict keys or non-contiguous arrays
+            return orjson.dumps(to_native(obj), option=option)
+
+    return json.dumps(to_native(obj), indent=2 if indent else None, allow_nan=False).encode('utf-8')
+
+
+def write_json(filepath: str, obj: Any, indent: bool = True) -> None:
+    """
+    Encode a result tree and write it to a file.
+
+    Args:
+        filepath: Destination path
+        obj: Value to encode
+        indent: Pretty-print with two-space indentation
+    """
+    with open(filepath, 'wb') as f:
+        f.write(dumps(obj, indent=indent))
@@ -0,0 +1,108 @@
+"""
+Thresholds Module
+Per-campaign-type benchmarks from CAMPAIGN_TYPE_THRESHOLDS, compiled once
+into a lookup table and joined onto metrics frames as columns, so every
+rule compares a row against its own campaign type's benchmark in a single
+vectorized pass.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List
+
+from config import CAMPAIGN_TYPE_THRESHOLDS, CAMPAIGN_TYPES
+
+# Benchmark column joined onto a metrics frame -> CAMPAIGN_TYPE_THRESHOLDS key it comes from
+THRESHOLD_COLUMNS = {
+    'ctr_threshold': 'expected_ctr',
+    'conversion_rate_threshold': 'expected_conversion_rate',
+    'cpa_threshold': 'expected_cpa',
+}
+
+
+class ThresholdTable:
+    """Benchmarks per campaign type, looked up through integer codes of the type names."""
+
+    def __init__(self, by_type: Dict[str, Dict[str, float]], aliases: Dict[str, str] | None = None):
+        """
+        Compile a threshold table.
+
+        Args:
+            by_type: {campaign type: {'expected_ctr': ..., 'expected_conversion_rate': ...,
+                'expected_cpa': ...}}; a missing key falls back to the caller's default
+            aliases: {campaign type: other name exports use for it}
+                (e.g. 'PMax': 'Performance Max')
+        """
+        self.campaign_types: List[str] = list(by_type)
+        # One row per campaign type, one column per THRESHOLD_COLUMNS entry (NaN = use default)
+        self.values = np.array(
+            [[by_type[name].get(key, np.nan) for key in THRESHOLD_COLUMNS.values()]
+             for name in self.campaign_types],
+            dtype=float,
+        ).reshape(len(self.campaign_types), len(THRESHOLD_COLUMNS))
+
+        # Compiled once: normalized type name -> table row; the row for code -1
+        # (unrecognized or missing type) is appended at lookup time and holds the defaults
+        rows: Dict[str, int] = {}
+        for row, name in enumerate(self.campaign_types):
+            rows.setdefault(self._key(name), row)
+        for name, alias in (aliases or {}).items():
+            if name in by_type:
+                rows.setdefault(self._key(alias), self.campaign_types.index(name))
+        self.categories = pd.Index(list(rows))
+        self._category_rows = np.array(list(rows.values()) + [len(self.campaign_types)], dtype=np.intp)
+
+    @classmethod
+    def from_config(cls) -> 'ThresholdTable':
+        """Table compiled from CAMPAIGN_TYPE_THRESHOLDS (display names in CAMPAIGN_TYPES are aliases)."""
+        return cls(CAMPAIGN_TYPE_THRESHOLDS, CAMPAIGN_TYPES)
+
+    @staticmethod
+    def _key(name: str) -> str:
+        """Normalized form campaign types are matched on."""
+        return str(name).strip().casefold()
+
+    def codes(self, campaign_types: pd.Series) -> np.ndarray:
+        """Table row of each campaign type (len(campaign_types) for types without benchmarks)."""
+        keys = campaign_types.astype(str).str.strip().str.casefold()
+        # -1 for types outside the table picks the trailing defaults row
+        codes = self.categories.get_indexer(keys)
+        return self._category_rows[codes]
+
+    def attach(self, df: pd.DataFrame, defaults: Dict[str, float],
+               type_column: str = 'campaign_type') -> pd.DataFrame:
+        """
+        Join each row's benchmarks onto a metrics frame.
+
+        Args:
+            df: Metrics frame (modified in place)
+            defaults: {threshold column: value} for rows whose campaign type has
+                no benchmark (or that carry no campaign type at all)
+            type_column: Column holding the campaign type
+
+        Returns:
+            The same DataFrame with ctr_threshold, conversion_rate_threshold and
+            cpa_threshold columns added
+        """
+        fallback = np.array([defaults[column] for column in THRESHOLD_COLUMNS], dtype=float)
+        table = np.vstack([self.values, fallback])
+        table = np.where(np.isnan(table), fallback, table)
+
+        if type_column in df.columns:
+            rows = self.codes(df[type_column])
+        else:
+            rows = np.full(len(df), len(self.campaign_types), dtype=np.intp)
+        joined = table[rows]
+        for i, column in enumerate(THRESHOLD_COLUMNS):
+            df[column] = joined[:, i]
+        return df
+
+
+# Compiled once at import
+THRESHOLDS = ThresholdTable.from_config()
+
+
+def attach_thresholds(df: pd.DataFrame, defaults: Dict[str, float],
+                      type_column: str = 'campaign_type') -> pd.DataFrame:
+    """Join the configured per-campaign-type benchmarks onto a metrics frame (see ThresholdTable.attach)."""
+    return THRESHOLDS.attach(df, defaults, type_column)
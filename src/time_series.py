@@ -0,0 +1,225 @@
+"""
+Time Series Module
+Date-indexed campaign panel with resampling and incrementally maintained
+rolling-window metrics.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List
+
+
+class TimeSeriesEngine:
+    """Daily campaign time series built from DataLoader output."""
+
+    METRIC_COLUMNS = ['impressions', 'clicks', 'cost', 'conversions', 'revenue']
+
+    # Resampling frequencies and the pandas rule used for each
+    FREQUENCIES = {'D': 'D', 'W': 'W-SUN', 'M': 'MS'}
+
+    def __init__(self, df: pd.DataFrame | None = None, window: int = 7):
+        """
+        Initialize engine and build the panel from daily rows.
+
+        Args:
+            df: DataFrame with date, campaign_name and metric columns
+            window: Rolling window length in days
+        """
+        if window < 1:
+            raise ValueError("Rolling window must be at least one day")
+
+        self.window = window
+        self.campaigns: List[str] = []
+        self.start_date: pd.Timestamp | None = None
+        self._num_days = 0
+        # (day, metric, campaign) arrays; capacity grows geometrically on append
+        self._daily = np.zeros((0, len(self.METRIC_COLUMNS), 0))
+        self._rolling = np.zeros((0, len(self.METRIC_COLUMNS), 0))
+
+        if df is not None and len(df) > 0:
+            self._build(df)
+
+    def _aggregate(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Sum metric columns per (date, campaign)."""
+        if 'date' not in df.columns or 'campaign_name' not in df.columns:
+            raise ValueError("Time series requires 'date' and 'campaign_name' columns")
+
+        frame = df[['date', 'campaign_name']].copy()
+        frame['date'] = pd.to_datetime(frame['date'], errors='coerce').dt.normalize()
+        for col in self.METRIC_COLUMNS:
+            frame[col] = pd.to_numeric(df[col], errors='coerce').fillna(0) if col in df.columns else 0.0
+
+        frame = frame.dropna(subset=['date'])
+        return frame.groupby(['date', 'campaign_name'], observed=True)[self.METRIC_COLUMNS].sum()
+
+    def _build(self, df: pd.DataFrame) -> None:
+        """Build the daily panel and rolling sums from scratch (vectorized)."""
+        totals = self._aggregate(df)
+        if totals.empty:
+            return
+
+        dates = totals.index.get_level_values('date')
+        self.start_date = dates.min()
+        self.campaigns = sorted(totals.index.get_level_values('campaign_name').unique())
+        self._num_days = (dates.max() - self.start_date).days + 1
+
+        daily = np.zeros((self._num_days, len(self.METRIC_COLUMNS), len(self.campaigns)))
+        day_pos = (dates - self.start_date).days.to_numpy()
+        campaign_pos = pd.Index(self.campaigns).get_indexer(totals.index.get_level_values('campaign_name'))
+        daily[day_pos, :, campaign_pos] = totals.to_numpy()
+
+        # Rolling sum of the last `window` days via cumulative sums
+        cumulative = daily.cumsum(axis=0)
+        rolling = cumulative.copy()
+        rolling[self.window:] -= cumulative[:-self.window]
+
+        self._daily = daily
+        self._rolling = rolling
+
+    def _ensure_capacity(self, num_days: int, num_campaigns: int) -> None:
+        """Grow the backing arrays so they hold the requested shape."""
+        days_cap, _, campaign_cap = self._daily.shape
+        if num_days <= days_cap and num_campaigns <= campaign_cap:
+            return
+
+        new_days = max(num_days, days_cap * 2 if num_days > days_cap else days_cap)
+        new_campaigns = max(num_campaigns, campaign_cap)
+        for name in ('_daily', '_rolling'):
+            old = getattr(self, name)
+            grown = np.zeros((new_days, len(self.METRIC_COLUMNS), new_campaigns))
+            grown[:old.shape[0], :, :old.shape[2]] = old
+            setattr(self, name, grown)
+
+    def append(self, df: pd.DataFrame) -> None:
+        """
+        Add new daily rows and update rolling sums incrementally.
+
+        Rows for a new day only touch that day's rolling sums. Late
+        corrections to an existing day update at most `window` days.
+
+        Args:
+            df: DataFrame with the same columns as the initial data
+        """
+        totals = self._aggregate(df)
+        if totals.empty:
+            return
+
+        if self.start_date is None:
+            self._build(df)
+            return
+
+        dates = totals.index.get_level_values('date')
+        if dates.min() < self.start_date:
+            # History before the series start: rebuild once with all rows
+            self._build(pd.concat([self.to_frame(), df], ignore_index=True))
+            return
+
+        for name in sorted(set(totals.index.get_level_values('campaign_name')) - set(self.campaigns)):
+            self.campaigns.append(name)
+
+        last_day = (dates.max() - self.start_date).days
+        self._ensure_capacity(last_day + 1, len(self.campaigns))
+
+        # Extend the series day by day: yesterday's window minus the day leaving it
+        for day in range(self._num_days, last_day + 1):
+            self._rolling[day] = self._rolling[day - 1] if day > 0 else 0
+            if day >= self.window:
+                self._rolling[day] -= self._daily[day - self.window]
+        self._num_days = max(self._num_days, last_day + 1)
+
+        day_pos = (dates - self.start_date).days.to_numpy()
+        campaign_pos = pd.Index(self.campaigns).get_indexer(totals.index.get_level_values('campaign_name'))
+        for day, campaign, values in zip(day_pos, campaign_pos, totals.to_numpy()):
+            self._daily[day, :, campaign] += values
+            self._rolling[day:min(day + self.window, self._num_days), :, campaign] += values
+
+    @property
+    def dates(self) -> pd.DatetimeIndex:
+        """Daily index covering the whole series."""
+        if self.start_date is None:
+            return pd.DatetimeIndex([], name='date')
+        return pd.date_range(self.start_date, periods=self._num_days, freq='D', name='date')
+
+    def _to_long(self, values: np.ndarray) -> pd.DataFrame:
+        """Reshape a (day, metric, campaign) array to date × campaign rows."""
+        values = values[:self._num_days, :, :len(self.campaigns)]
+        index = pd.MultiIndex.from_product([self.dates, self.campaigns], names=['date', 'campaign_name'])
+        flat = values.transpose(0, 2, 1).reshape(-1, len(self.METRIC_COLUMNS))
+        return pd.DataFrame(flat, index=index, columns=self.METRIC_COLUMNS)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Get daily totals as date, campaign_name and metric columns."""
+        return self._to_long(self._daily).reset_index()
+
+    def panel(self) -> pd.DataFrame:
+        """
+        Get the date-indexed campaign panel.
+
+        Returns:
+            DataFrame indexed by day with (metric, campaign) columns
+        """
+        return self._to_long(self._daily).unstack('campaign_name')
+
+    @staticmethod
+    def add_ratios(frame: pd.DataFrame) -> pd.DataFrame:
+        """Derive CTR, conversion rate, CPA, CPC and ROAS from summed metrics."""
+        frame = frame.copy()
+        impressions = frame['impressions'].replace(0, np.nan)
+        clicks = frame['clicks'].replace(0, np.nan)
+        cost = frame['cost'].replace(0, np.nan)
+        conversions = frame['conversions'].replace(0, np.nan)
+
+        frame['ctr'] = (frame['clicks'] / impressions * 100).fillna(0).round(2)
+        frame['conversion_rate'] = (frame['conversions'] / clicks * 100).fillna(0).round(2)
+        frame['cpa'] = (frame['cost'] / conversions).fillna(0).round(2)
+        frame['cpc'] = (frame['cost'] / clicks).fillna(0).round(2)
+        frame['roas'] = (frame['revenue'] / cost).fillna(0).round(2)
+        return frame
+
+    def resample(self, freq: str = 'W', by_campaign: bool = True) -> pd.DataFrame:
+        """
+        Aggregate the series to daily, weekly or monthly buckets.
+
+        Args:
+            freq: 'D', 'W' (weeks ending Sunday) or 'M' (labelled by month start)
+            by_campaign: Keep one row per campaign, or total across campaigns
+
+        Returns:
+            DataFrame with summed metrics and derived ratios per bucket
+        """
+        if freq not in self.FREQUENCIES:
+            raise ValueError(f"Unsupported frequency '{freq}' (use {', '.join(self.FREQUENCIES)})")
+
+        long = self._to_long(self._daily)
+        keys = [pd.Grouper(level='date', freq=self.FREQUENCIES[freq])]
+        if by_campaign:
+            keys.append(pd.Grouper(level='campaign_name'))
+
+        return self.add_ratios(long.groupby(keys).sum()).reset_index()
+
+    def rolling_metrics(self, last_days: int | None = None) -> pd.DataFrame:
+        """
+        Get rolling-window sums and ratios for each day and campaign.
+
+        Args:
+            last_days: Only return the most recent N days
+
+        Returns:
+            DataFrame with date, campaign_name, window sums and ratios
+        """
+        long = self.add_ratios(self._to_long(self._rolling)).reset_index()
+        if last_days is not None:
+            long = long[long['date'] > self.dates[-1] - pd.Timedelta(days=last_days)].reset_index(drop=True)
+        return long
+
+    def latest_rolling(self) -> Dict[str, Dict]:
+        """Get the most recent rolling-window metrics per campaign."""
+        if self.start_date is None:
+            return {}
+
+        latest = self.rolling_metrics(last_days=1).set_index('campaign_name')
+        latest = latest.drop(columns='date')
+        return {
+            campaign: {'window_days': self.window, **{k: round(float(v), 2) for k, v in row.items()}}
+            for campaign, row in latest.iterrows()
+        }
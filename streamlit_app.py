@@ -14,10 +14,16 @@ from datetime import datetime
 # Add paths
 sys.path.insert(0, str(Path(__file__).parent))
 sys.path.insert(0, str(Path(__file__).parent / 'keyword_engine_v2'))
+sys.path.insert(0, str(Path(__file__).parent / 'monthly_campaign_engine'))
 
 try:
     from main_windows import ChampionCleanersBot
+    from src.rollup_cube import RollupCube
+    from src.export_schemas import get_schema
+    from src.format_sniffer import read_report
+    from src.report_sources import expand_sources
     from keyword_main import KeywordIntelligenceEngine
+    from watch_daemon import read_latest_results
 except ImportError as e:
     st.error(f"Error loading modules: {e}")
     sys.exit(1)
@@ -37,21 +43,8 @@ def to_excel_value(val):
 def convert_google_ads_keywords(df):
     """Convert Google Ads keyword report format to standard format."""
     try:
-        # Mapping of Google Ads columns to required columns
-        column_mapping = {
-            'Keyword': 'keyword',
-            'Match type': 'match_type',
-            'Clicks': 'clicks',
-            'Impr.': 'impressions',
-            'Cost': 'cost',
-            'Conversions': 'conversions'
-        }
-        
-        # Rename columns
-        df_converted = df.copy()
-        for old_col, new_col in column_mapping.items():
-            if old_col in df_converted.columns:
-                df_converted.rename(columns={old_col: new_col}, inplace=True)
+        # Rename Google Ads columns to the required names (shared export-schema aliases)
+        df_converted = get_schema('keyword').rename(df)
         
         # Add required columns if missing
         if 'campaign_name' not in df_converted.columns:
@@ -81,21 +74,11 @@ def convert_google_ads_campaigns(df):
     try:
         st.write(f"📋 Input columns: {list(df.columns)}")
         
-        # Mapping of Google Ads campaign columns to required columns
-        column_mapping = {
-            'Campaign': 'campaign_name',
-            'Campaign type': 'campaign_type',
-            'Impr.': 'impressions',
-            'Interactions': 'clicks',
-            'Cost': 'cost',
-            'Conversions': 'conversions'
-        }
-        
-        # Rename columns
-        df_converted = df.copy()
+        # Rename Google Ads campaign columns to the required names (shared export-schema aliases)
+        column_mapping = get_schema('monthly').resolve(list(df.columns))
+        df_converted = df.rename(columns=column_mapping)
         for old_col, new_col in column_mapping.items():
-            if old_col in df_converted.columns:
-                df_converted.rename(columns={old_col: new_col}, inplace=True)
+            if old_col != new_col:
                 st.write(f"  ✓ Renamed '{old_col}' → '{new_col}'")
         
         # Add date column if missing (use report date or default)
@@ -175,6 +158,8 @@ if 'analysis_type' not in st.session_state:
     st.session_state.analysis_type = 'campaign'
 if 'campaign_results' not in st.session_state:
     st.session_state.campaign_results = None
+if 'campaign_cube' not in st.session_state:
+    st.session_state.campaign_cube = None
 if 'keyword_results' not in st.session_state:
     st.session_state.keyword_results = None
 
@@ -187,7 +172,7 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # Main tabs for analysis type
-col1, col2 = st.columns(2)
+col1, col2, col3 = st.columns(3)
 with col1:
     if st.button("📊 Campaign Analysis", key="campaign_btn", use_container_width=True):
         st.session_state.analysis_type = 'campaign'
@@ -198,6 +183,11 @@ with col2:
         st.session_state.analysis_type = 'keyword'
         st.rerun()
 
+with col3:
+    if st.button("📅 Monthly Results", key="monthly_btn", use_container_width=True):
+        st.session_state.analysis_type = 'monthly'
+        st.rerun()
+
 st.markdown("---")
 
 # ==================== CAMPAIGN ANALYSIS ====================
@@ -217,6 +207,7 @@ if st.session_state.analysis_type == 'campaign':
                         bot = ChampionCleanersBot(str(sample_path), use_emojis=False)
                         results = bot.run_analysis(verbose=False)
                         st.session_state.campaign_results = results
+                        st.session_state.campaign_cube = RollupCube(bot.df) if results else None
                         st.success("✅ Analysis complete!")
                     else:
                         st.error("Sample data file not found")
@@ -226,7 +217,7 @@ if st.session_state.analysis_type == 'campaign':
     with tab2:
         st.write("Upload your CSV file for analysis")
         st.info("📌 Supports both standard CSV format and Google Ads campaign reports")
-        uploaded_file = st.file_uploader("Choose CSV file", type=['csv'], key="campaign_upload")
+        uploaded_file = st.file_uploader("Choose CSV or XLSX file", type=['csv', 'gz', 'zst', 'xlsx', 'zip'], key="campaign_upload")
         if uploaded_file is not None:
             if st.button("▶️ Run Analysis", key="campaign_upload_btn", use_container_width=True):
                 with st.spinner("Analyzing data..."):
@@ -239,28 +230,16 @@ if st.session_state.analysis_type == 'campaign':
                         with open(upload_path, 'wb') as f:
                             f.write(content)
                         
-                        # Try to load the file
+                        # Sniff the preamble, delimiter and encoding, then parse in a single pass
                         conversion_failed = False
                         df_loaded = None
-                        
-                        # Strategy 1: Try standard format
                         try:
-                            df_loaded = pd.read_csv(upload_path)
-                        except Exception as e1:
-                            st.write(f"Standard format failed: {str(e1)}")
-                            
-                            # Strategy 2: Try skipping 2 rows (Google Ads format)
-                            try:
-                                df_loaded = pd.read_csv(upload_path, skiprows=2)
-                            except Exception as e2:
-                                st.write(f"Skiprows 2 failed: {str(e2)}")
-                                
-                                # Strategy 3: Try skipping 3 rows
-                                try:
-                                    df_loaded = pd.read_csv(upload_path, skiprows=3)
-                                except Exception as e3:
-                                    st.error(f"All parsing strategies failed. Last error: {str(e3)}")
-                                    conversion_failed = True
+                            # Archives hold several reports: read each in one pass and stack them
+                            df_loaded = pd.concat([read_report(source) for source in expand_sources(str(upload_path))],
+                                                  ignore_index=True)
+                        except Exception as e:
+                            st.error(f"Could not parse file: {str(e)}")
+                            conversion_failed = True
                         
                         if df_loaded is not None and not conversion_failed:
                             # Check if it's Google Ads campaign format
@@ -293,6 +272,7 @@ if st.session_state.analysis_type == 'campaign':
                             
                             if results:
                                 st.session_state.campaign_results = results
+                                st.session_state.campaign_cube = RollupCube(bot.df)
                                 st.success("✅ Analysis complete!")
                             else:
                                 st.error("❌ Analysis failed - bot returned None")
@@ -312,13 +292,14 @@ if st.session_state.analysis_type == 'campaign':
         st.subheader("📈 Analysis Results")
         
         # Results tabs
-        res_tab1, res_tab2, res_tab3, res_tab4, res_tab5, res_tab6 = st.tabs([
+        res_tab1, res_tab2, res_tab3, res_tab4, res_tab5, res_tab6, res_tab7 = st.tabs([
             "Campaign Metrics",
             "Platform Analysis",
             "Device Analysis",
             "Issues Detected",
             "Recommendations",
-            "Budget Allocation"
+            "Budget Allocation",
+            "Explore"
         ])
         
         with res_tab1:
@@ -469,6 +450,20 @@ if st.session_state.analysis_type == 'campaign':
                             alloc_df = pd.DataFrame(alloc_data)
                             st.dataframe(alloc_df, use_container_width=True, hide_index=True)
         
+        with res_tab7:
+            st.write("### Explore")
+            cube = st.session_state.campaign_cube
+            if cube is not None:
+                # Any cut is answered from the precomputed cube, without re-running the analysis
+                group_by = st.multiselect("Group by", cube.dimensions, default=cube.dimensions[:1], key="cube_group_by")
+                filter_dim = st.selectbox("Filter on", ["(none)"] + cube.dimensions, key="cube_filter_dim")
+                filters = {}
+                if filter_dim != "(none)":
+                    options = cube.describe()['dimensions'][filter_dim]
+                    selected = st.multiselect("Values", options, default=options, key="cube_filter_values")
+                    filters = {filter_dim: selected}
+                st.dataframe(cube.query(group_by, filters), use_container_width=True, hide_index=True)
+        
         # Export buttons
         st.markdown("---")
         col1, col2 = st.columns(2)
@@ -604,6 +599,45 @@ if st.session_state.analysis_type == 'campaign':
             except ImportError:
                 st.error("Excel export requires openpyxl package")
 
+# ==================== MONTHLY RESULTS ====================
+elif st.session_state.analysis_type == 'monthly':
+    st.subheader("📅 Monthly Campaign Results")
+    
+    # Published by monthly_campaign_engine/watch_daemon.py whenever exports land in uploads/
+    latest = read_latest_results()
+    if latest is None:
+        st.info("No monthly results published yet. Start the watch daemon "
+                "(python monthly_campaign_engine/watch_daemon.py) and drop monthly exports into uploads/.")
+    else:
+        st.caption(f"Published {latest.get('published_at', 'N/A')} from "
+                   f"{len(latest.get('sources', []))} monthly exports")
+        summary = latest.get('summary', {})
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Campaigns", summary.get('total_campaigns', 0))
+        with col2:
+            st.metric("Months", summary.get('months_analyzed', 0))
+        with col3:
+            st.metric("Total Spend", f"AED {summary.get('total_spend', 0):,.2f}")
+        with col4:
+            st.metric("Conversions", summary.get('total_conversions', 0))
+        
+        results = latest.get('analysis_results', {})
+        losses = results.get('losses', [])
+        if losses:
+            st.markdown("**⚠️ Performance Issues**")
+            st.dataframe(pd.DataFrame(losses), use_container_width=True)
+        
+        recommendations = results.get('recommendations', {})
+        for section, title in (('loss_remediation', 'Loss Remediation'), ('growth_opportunities', 'Growth Opportunities')):
+            items = recommendations.get(section, [])
+            if items:
+                st.markdown(f"**💡 {title}**")
+                st.dataframe(pd.DataFrame(items).astype(str), use_container_width=True)
+        
+        with st.expander("Source exports"):
+            st.dataframe(pd.DataFrame(latest.get('sources', [])), use_container_width=True)
+
 # ==================== KEYWORD ENGINE ====================
 else:
     st.subheader("🔍 Keyword Intelligence Engine")
@@ -638,7 +672,7 @@ else:
     with tab2:
         st.write("Upload your keywords CSV file")
         st.info("📌 Supports both standard CSV format and Google Ads keyword reports")
-        uploaded_file = st.file_uploader("Choose CSV file", type=['csv'], key="keyword_upload")
+        uploaded_file = st.file_uploader("Choose CSV or XLSX file", type=['csv', 'gz', 'zst', 'xlsx', 'zip'], key="keyword_upload")
         if uploaded_file is not None:
             if st.button("▶️ Run Keyword Analysis", key="keyword_upload_btn", use_container_width=True):
                 with st.spinner("Analyzing keywords..."):
@@ -652,28 +686,16 @@ else:
                         with open(upload_path, 'wb') as f:
                             f.write(content)
                         
-                        # Try to load the file
+                        # Sniff the preamble, delimiter and encoding, then parse in a single pass
                         conversion_failed = False
                         df_loaded = None
-                        
-                        # Strategy 1: Try standard format
                         try:
-                            df_loaded = pd.read_csv(upload_path)
-                        except Exception as e1:
-                            st.write(f"Standard format failed: {str(e1)}")
-                            
-                            # Strategy 2: Try skipping 2 rows (Google Ads format)
-                            try:
-                                df_loaded = pd.read_csv(upload_path, skiprows=2)
-                            except Exception as e2:
-                                st.write(f"Skiprows 2 failed: {str(e2)}")
-                                
-                                # Strategy 3: Try skipping 3 rows
-                                try:
-                                    df_loaded = pd.read_csv(upload_path, skiprows=3)
-                                except Exception as e3:
-                                    st.error(f"All parsing strategies failed. Last error: {str(e3)}")
-                                    conversion_failed = True
+                            # Archives hold several reports: read each in one pass and stack them
+                            df_loaded = pd.concat([read_report(source) for source in expand_sources(str(upload_path))],
+                                                  ignore_index=True)
+                        except Exception as e:
+                            st.error(f"Could not parse file: {str(e)}")
+                            conversion_failed = True
                         
                         if df_loaded is not None and not conversion_failed:
                             # Check if it's Google Ads format
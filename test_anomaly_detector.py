@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""Test streaming anomaly detection on daily campaign metrics"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.anomaly_detector import AnomalyDetector
+
+
+def _daily_rows(days: int, spike_day: int | None = None, seed: int = 7) -> pd.DataFrame:
+    """Synthetic daily rows for two campaigns with an optional cost spike."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for day in range(days):
+        date = pd.Timestamp('2025-01-01') + pd.Timedelta(days=day)
+        for campaign, base_cost in (('Search_Brand', 1000), ('PMax_General', 2500)):
+            cost = base_cost * rng.normal(1, 0.05)
+            if spike_day == day and campaign == 'PMax_General':
+                cost *= 4
+            rows.append({'date': date, 'campaign_name': campaign, 'impressions': 10000,
+                         'clicks': int(rng.normal(500, 20)), 'cost': cost,
+                         'conversions': int(rng.normal(40, 3)), 'revenue': cost * 2})
+    return pd.DataFrame(rows)
+
+
+def test_spike_detected_and_streaming_matches_batch():
+    """A cost spike is flagged, and day-by-day updates equal one batch update"""
+    df = _daily_rows(30, spike_day=25)
+
+    batch = AnomalyDetector()
+    anomalies = batch.update(df)
+    spikes = [a for a in anomalies if a['issue_type'] == 'COST_SPIKE']
+    assert [(a['campaign'], a['date']) for a in spikes] == [('PMax_General', '2025-01-26')]
+    assert spikes[0]['severity'] == 'High'
+
+    streaming = AnomalyDetector()
+    streamed = []
+    for _, day in df.groupby('date'):
+        streamed.extend(streaming.update(day))
+    assert streamed == anomalies
+    np.testing.assert_array_equal(streaming.mean, batch.mean)
+
+    # Re-feeding processed days is a no-op
+    assert batch.update(df) == []
+    np.testing.assert_array_equal(streaming.count, batch.count)
+
+
+def test_state_round_trip_and_size():
+    """State persists to .npz and stays compact"""
+    df = _daily_rows(20)
+    detector = AnomalyDetector()
+    detector.update(df.iloc[:30])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'state.npz')
+        detector.save(path)
+        restored = AnomalyDetector.load(path)
+
+    assert restored.campaigns == detector.campaigns
+    assert restored.update(df.iloc[30:]) == detector.update(df.iloc[30:])
+    np.testing.assert_array_equal(restored.var, detector.var)
+    assert detector.state_bytes / detector.num_series <= 16
+
+
+if __name__ == '__main__':
+    test_spike_detected_and_streaming_matches_batch()
+    test_state_round_trip_and_size()
+    print("ALL ANOMALY DETECTOR TESTS PASSED")
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+"""Test multi-account batch runner manifest handling and rollup"""
+
+import json
+import multiprocessing
+import os
+import re
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import batch_main
+from batch_main import build_portfolio_rollup, load_manifest, run_account_task, run_batch
+
+
+def test_manifest_resolves_relative_paths():
+    """Relative inputs resolve against the manifest directory"""
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = Path(tmp) / 'accounts.json'
+        manifest.write_text(json.dumps({'accounts': [{'name': 'a', 'keyword_csv': 'kw.csv'}]}))
+        accounts = load_manifest(str(manifest))
+        assert accounts[0]['keyword_csv'] == str((Path(tmp) / 'kw.csv').resolve())
+
+
+def test_manifest_rejects_malformed_entries():
+    """Each bad account entry is reported by its index"""
+    bad_entries = [
+        ('kw.csv', "entry 1 must be an object"),
+        ({'keyword_csv': 'kw.csv'}, "entry 1 missing 'name'"),
+        ({'name': 'b'}, "entry 1 ('b') has no inputs"),
+        ({'name': 'b', 'monthly_dir': ['jan.csv']}, "entry 1 ('b') has a non-path 'monthly_dir'"),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = Path(tmp) / 'accounts.json'
+        for entry, message in bad_entries:
+            manifest.write_text(json.dumps({'accounts': [{'name': 'a', 'keyword_csv': 'kw.csv'}, entry]}))
+            with pytest.raises(ValueError, match=re.escape(message)):
+                load_manifest(str(manifest))
+
+
+def test_account_task_and_rollup():
+    """A single task writes its results and rolls up into portfolio totals"""
+    sample = str(Path(__file__).parent / 'sample_data.csv')
+    with tempfile.TemporaryDirectory() as tmp:
+        task = run_account_task('acct', 'campaign', sample, tmp)
+        failed = run_account_task('acct', 'keyword', str(Path(tmp) / 'missing.csv'), tmp)
+
+        assert task['status'] == 'success'
+        assert (Path(tmp) / 'acct' / 'campaign_analysis.json').exists()
+        assert failed['status'] == 'failed'
+
+        rollup = build_portfolio_rollup([task, failed], wall_seconds=1.0)
+        assert rollup['portfolio_totals']['total_spend'] == round(task['metrics']['cost'], 2)
+        assert rollup['run_stats']['failed_tasks'] == 1
+        assert rollup['accounts']['acct']['failed_reports'][0]['report_type'] == 'keyword'
+
+
+
+def _kill_worker(input_path, output_path):
+    """Analyzer that takes its worker process down, as an OOM kill would"""
+    os._exit(1)
+
+
+def test_dead_worker_is_recorded_not_fatal():
+    """A worker dying mid-task fails its tasks but still writes the rollup"""
+    if multiprocessing.get_start_method() != 'fork':
+        pytest.skip("Spawned workers would not see the patched analyzer")
+    sample = str(Path(__file__).parent / 'sample_data.csv')
+    original = batch_main.ANALYZERS['campaign']
+    # Forked workers inherit the patched analyzer
+    batch_main.ANALYZERS['campaign'] = _kill_worker
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            rollup = run_batch([{'name': 'acct', 'campaign_csv': sample}], tmp, workers=1)
+            assert (Path(tmp) / 'portfolio_summary.json').exists()
+    finally:
+        batch_main.ANALYZERS['campaign'] = original
+    assert rollup['run_stats']['failed_tasks'] == 1
+    failure = rollup['accounts']['acct']['failed_reports'][0]
+    assert failure['report_type'] == 'campaign' and 'Worker failed' in failure['error']
+
+
+if __name__ == '__main__':
+    test_manifest_resolves_relative_paths()
+    test_manifest_rejects_malformed_entries()
+    test_account_task_and_rollup()
+    try:
+        test_dead_worker_is_recorded_not_fatal()
+    except pytest.skip.Exception as e:
+        print(f"[WARN] Skipped dead worker test: {e}")
+    print("ALL BATCH RUNNER TESTS PASSED")
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+"""Test constrained budget allocation"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.budget_allocator import BudgetAllocator, round_to_step, water_fill
+from src.recommender import RecommendationEngine
+
+
+def test_water_fill_respects_bounds():
+    """Shares sum to one, stay within caps, and are proportional when caps don't bind"""
+    scores = np.array([10.0, 1.0, 1.0, 0.1, 3.0])
+    shares = water_fill(scores, 0.05, 0.5)
+    assert abs(shares.sum() - 1) < 1e-9
+    assert shares.min() >= 0.05 - 1e-12 and shares.max() <= 0.5 + 1e-12
+    assert shares[0] == 0.5 and shares[3] == 0.05
+
+    free = np.array([2.0, 3.0, 5.0])
+    np.testing.assert_allclose(water_fill(free, 0.0, 1.0), free / free.sum())
+
+
+def test_step_rounding_keeps_total():
+    """Largest-remainder rounding lands on the step grid and sums to 100"""
+    rounded = round_to_step(np.array([33.4, 33.3, 33.3]), 5)
+    assert rounded.sum() == 100 and (rounded % 5 == 0).all()
+
+
+
+def test_zero_scores_stay_within_caps():
+    """Zero-score campaigns are raised off the floor so shares still sum to one under the cap"""
+    lone = np.array([5.0, 0, 0, 0, 0, 0])
+    shares = water_fill(lone, 0.05, 0.5)
+    assert abs(shares.sum() - 1) < 1e-9 and shares.max() <= 0.5 + 1e-12
+    np.testing.assert_allclose(shares[1:], 0.1)
+    pct = BudgetAllocator().allocate(lone)
+    assert pct.sum() == 100 and pct.max() <= 50
+    assert list(pct) == [50, 10, 10, 10, 10, 10]
+
+    mixed = BudgetAllocator().allocate(np.array([5.0, 3.0, 0, 0, 0, 0]))
+    assert mixed.sum() == 100 and mixed.max() <= 50 and mixed.min() >= 5
+
+    zeros = BudgetAllocator().allocate(np.zeros(6))
+    assert zeros.sum() == 100 and zeros.max() <= 50 and zeros.max() - zeros.min() <= 5
+
+
+def test_rounding_respects_cap():
+    """Remainder units skip items already at the cap"""
+    rounded = round_to_step(np.array([50.0, 12.5, 12.5, 12.5, 12.5]), 5, max_percentage=50)
+    assert rounded.sum() == 100 and rounded[0] == 50
+
+def test_allocator_scales_and_groups():
+    """Thousands of campaigns allocate quickly; group caps bound group totals"""
+    rng = np.random.default_rng(3)
+    scores = rng.gamma(2.0, 1.0, 5000)
+    started = time.perf_counter()
+    pct = BudgetAllocator().allocate(scores)
+    assert time.perf_counter() - started < 1.0
+    assert abs(pct.sum() - 100) < 1e-6 and pct.max() <= 50
+
+    groups = np.array(['Search'] * 4990 + ['App'] * 5 + ['Display'] * 5)
+    pct = BudgetAllocator().allocate(scores, groups)
+    totals = {g: pct[groups == g].sum() for g in ('Search', 'App', 'Display')}
+    assert totals['Search'] <= 50 + 1e-6
+    assert abs(sum(totals.values()) - 100) < 1e-6
+
+
+def test_recommender_uses_config_limits():
+    """Recommended percentages honour MIN/MAX allocation and the 5% step"""
+    metrics = {
+        f'Campaign {i}': {'cost': 1000.0 * (i + 1), 'roas': roas, 'conversion_rate': cvr, 'cpa': 50.0,
+                          'platform': 'Search' if i < 3 else 'App'}
+        for i, (roas, cvr) in enumerate([(8.0, 9.0), (0.2, 0.5), (1.0, 2.0), (0.0, 0.0), (3.0, 4.0)])
+    }
+    budget = RecommendationEngine(metrics, [], {}).generate_budget_allocation_recommendation()
+    recommended = [a['recommended_percentage'] for a in budget['allocations'].values()]
+    assert sum(recommended) == 100
+    assert min(recommended) >= 5 and max(recommended) <= 50
+    assert all(p % 5 == 0 for p in recommended)
+    assert budget['constraints']['step_percentage'] == 5
+
+    grouped = RecommendationEngine(metrics, [], {}).generate_budget_allocation_recommendation('platform')
+    search = sum(a['recommended_percentage'] for a in grouped['allocations'].values() if a['group'] == 'Search')
+    assert search <= 50
+
+
+if __name__ == '__main__':
+    test_water_fill_respects_bounds()
+    test_step_rounding_keeps_total()
+    test_zero_scores_stay_within_caps()
+    test_rounding_respects_cap()
+    test_allocator_scales_and_groups()
+    test_recommender_uses_config_limits()
+    print("ALL BUDGET ALLOCATOR TESTS PASSED")
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+"""Test columnar JSON and Arrow IPC result encodings"""
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app import app
+from src.columnar import (
+    ARROW_STREAM_MIMETYPE, COLUMNAR_JSON_MIMETYPE, HAS_PYARROW, TABLE_KEY,
+    dumps_arrow, dumps_columnar, from_columnar,
+)
+from src.serialization import dumps
+
+if HAS_PYARROW:
+    import pyarrow as pa
+
+
+def _issues(n):
+    return [{'keyword': f"keyword {i}", 'campaign': 'Brand', 'issue_type': ['LOW_CTR', 'HIGH_CPA'][i % 2],
+             'severity': ['High', 'Medium', 'Low'][i % 3], 'value': np.float64(i / 4)} for i in range(n)]
+
+
+def test_columnar_round_trip_and_dictionaries():
+    """Record lists become columns, enums are dictionary-encoded, decoding restores the records"""
+    issues = _issues(1000)
+    # A record lacking a field and a nested record list
+    issues[5] = {key: value for key, value in issues[5].items() if key != 'value'}
+    payload = {'status': 'success', 'audit': issues, 'nested': [{'items': _issues(2)}], 'empty': []}
+
+    encoded = json.loads(dumps_columnar(payload))
+    table = encoded['audit'][TABLE_KEY]
+    assert table['length'] == 1000
+    assert table['dictionaries']['severity'] == ['High', 'Medium', 'Low']
+    assert table['columns']['severity'][:4] == [0, 1, 2, 0]
+    assert 'keyword' not in table['dictionaries']
+    assert table['missing'] == {'value': [5]}
+    assert from_columnar(encoded) == json.loads(dumps(payload))
+
+    # Repeated key names are what the format saves
+    assert len(dumps_columnar(payload)) * 2 < len(dumps(payload))
+
+
+def test_arrow_stream():
+    """Arrow IPC carries record lists as list<struct> with dictionary-encoded enums"""
+    if not HAS_PYARROW:
+        return
+    payload = {'status': 'success', 'audit': _issues(100), 'totals': {'audit': 100}}
+    table = pa.ipc.open_stream(dumps_arrow(payload)).read_all()
+    assert table.num_rows == 1 and table.column_names == ['status', 'audit', 'totals']
+    item = table.schema.field('audit').type.value_type
+    assert pa.types.is_dictionary(item.field('severity').type)
+    assert table.column('audit').to_pylist()[0][3]['severity'] == 'High'
+
+    # A list of records is one row per record
+    rows = pa.ipc.open_stream(dumps_arrow(_issues(10))).read_all()
+    assert rows.num_rows == 10 and rows.column('value').to_pylist()[4] == 1.0
+
+
+def test_accept_negotiation():
+    """Clients get columnar JSON or Arrow when they ask for it, JSON otherwise, each with its own ETag"""
+    client = app.test_client()
+    data = {'use_sample': 'true'}
+    plain = client.post('/api/analyze-keywords', data=data, headers={'Accept': '*/*'})
+    assert plain.mimetype == 'application/json'
+    assert 'Accept' in plain.headers['Vary']
+
+    columnar = client.post('/api/analyze-keywords', data=data, headers={'Accept': COLUMNAR_JSON_MIMETYPE})
+    assert columnar.mimetype == COLUMNAR_JSON_MIMETYPE
+    assert columnar.headers['ETag'] == plain.headers['ETag'][:-1] + '-columnar"'
+    decoded = from_columnar(json.loads(columnar.data))
+    expected = json.loads(plain.data)
+    assert decoded['keyword_audit'] == expected['keyword_audit']
+
+    repeat = client.post('/api/analyze-keywords', data=data,
+                         headers={'Accept': COLUMNAR_JSON_MIMETYPE, 'If-None-Match': columnar.headers['ETag']})
+    assert repeat.status_code == 304
+    assert repeat.headers['ETag'] == columnar.headers['ETag']
+
+    # An ETag only revalidates the format it was issued for
+    for accept, etag in [('application/json', columnar.headers['ETag']),
+                         (COLUMNAR_JSON_MIMETYPE, plain.headers['ETag'])]:
+        other = client.post('/api/analyze-keywords', data=data, headers={'Accept': accept, 'If-None-Match': etag})
+        assert other.status_code == 200 and other.mimetype == accept
+
+    if HAS_PYARROW:
+        arrow = client.post('/api/analyze', data=data, headers={'Accept': ARROW_STREAM_MIMETYPE})
+        assert arrow.mimetype == ARROW_STREAM_MIMETYPE
+        table = pa.ipc.open_stream(arrow.data).read_all()
+        assert table.column('status').to_pylist() == ['success']
+
+
+if __name__ == '__main__':
+    test_columnar_round_trip_and_dictionaries()
+    test_arrow_stream()
+    test_accept_negotiation()
+    print("ALL COLUMNAR TESTS PASSED")
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+"""Test the export-schema registry: detection, alias resolution and read options"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'monthly_campaign_engine'))
+
+from src.export_schemas import detect_schema, get_schema, parse_percent
+from src.format_sniffer import read_report, sniff
+from column_mapper import ColumnMapper
+
+
+def test_detect_schema_by_header():
+    """Header fingerprints pick the most specific schema"""
+    assert detect_schema(['Search term', 'Match type', 'Campaign', 'Keyword', 'Clicks']).name == 'search_terms'
+    assert detect_schema(['Keyword status', 'Keyword', 'Match type', 'Impr.']).name == 'keyword'
+    assert detect_schema(['Campaign status', 'Campaign', 'Impr.', 'Interactions']).name == 'monthly'
+    assert detect_schema(['date', 'campaign_name', 'impressions']).name == 'campaign'
+    assert detect_schema(['foo', 'bar']) is None
+
+
+def test_resolution_prefers_earlier_aliases():
+    """Preferred aliases win, case-insensitively, like the old per-mapper loops"""
+    monthly = get_schema('monthly')
+    resolved = monthly.resolve(['Clicks', 'Interactions', 'campaign', 'Status', 'Campaign status'])
+    assert resolved == {'Interactions': 'clicks', 'campaign': 'campaign_name', 'Campaign status': 'campaign_status'}
+
+    mapper = ColumnMapper(pd.DataFrame(columns=['Campaign', 'Interactions', 'Clicks', 'Impr.']))
+    assert mapper.find_column('clicks') == 'Interactions'
+    assert mapper.find_column('cost') is None
+
+
+def test_read_options_parse_only_needed_columns():
+    """Google Ads exports are parsed with usecols, string dtypes and percent converters"""
+    path = str(ROOT / 'website traffic 2 keywords.csv')
+    fmt = sniff(path)
+    schema = get_schema(fmt['report_type'])
+    options = schema.read_options(fmt['columns'], ['keyword', 'match_type', 'impressions'])
+    assert sorted(options['usecols']) == ['Impr.', 'Keyword', 'Match type']
+
+    df = schema.rename(read_report(path, fmt, **options))
+    assert list(df.columns) == ['keyword', 'match_type', 'impressions']
+    # Thousands separators are parsed instead of coerced to missing
+    assert df['impressions'].max() > 1000
+
+    monthly = get_schema('monthly').read_options(sniff(str(ROOT / 'Mar 2025.csv'))['columns'])
+    assert 'Currency code' not in monthly['usecols']
+    assert monthly['converters']['Interaction rate'] is parse_percent
+    assert parse_percent('7.58%') == 7.58 and pd.isna(parse_percent(' --'))
+
+
+if __name__ == '__main__':
+    test_detect_schema_by_header()
+    test_resolution_prefers_earlier_aliases()
+    test_read_options_parse_only_needed_columns()
+    print("ALL EXPORT SCHEMA TESTS PASSED")
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+"""Test monthly file loading: catalog discovery, parallel parsing and unified dtypes"""
+
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent / 'monthly_campaign_engine'))
+
+from file_catalog import MonthlyFileCatalog
+from file_loader import MonthlyFileLoader
+
+DATA_DIR = Path(__file__).parent
+
+
+def test_parallel_load_matches_sequential():
+    """Thread-pool parsing yields the same combined frame as a single worker"""
+    parallel = MonthlyFileLoader(str(DATA_DIR), max_workers=4).combine_all_months()
+    sequential = MonthlyFileLoader(str(DATA_DIR), max_workers=1).combine_all_months()
+    pd.testing.assert_frame_equal(parallel, sequential)
+
+
+def test_months_share_unified_dtypes():
+    """Every month has identical dtypes, with campaign names as one categorical"""
+    loader = MonthlyFileLoader(str(DATA_DIR))
+    frames = loader.load_monthly_files()
+    assert frames
+
+    dtypes = [df.dtypes.to_dict() for df in frames.values()]
+    assert all(d == dtypes[0] for d in dtypes)
+    assert isinstance(dtypes[0]['Campaign'], pd.CategoricalDtype)
+    assert dtypes[0]['Cost'] == 'float64'
+
+    combined = loader.combine_all_months()
+    assert isinstance(combined['Campaign'].dtype, pd.CategoricalDtype)
+    assert not combined['Campaign'].str.contains('Total', na=False).any()
+
+
+def test_catalog_detects_period_from_header():
+    """Any filename is accepted; the date-range header decides the month"""
+    with tempfile.TemporaryDirectory() as tmp:
+        shutil.copy(DATA_DIR / 'June 2025.csv', Path(tmp) / 'export-a.csv')
+        shutil.copy(DATA_DIR / 'Mar 2025.csv', Path(tmp) / 'export-b.csv')
+        shutil.copy(DATA_DIR / 'sample_data.csv', Path(tmp) / 'sample_data.csv')
+
+        catalog = MonthlyFileCatalog(tmp)
+        entries = catalog.scan()
+        assert [e['period'] for e in entries] == ['2025-03', '2025-06']
+        assert catalog.stats['refreshed'] == 3
+
+        # Unchanged files are served from the persisted index
+        rescan = MonthlyFileCatalog(tmp)
+        assert rescan.scan() == entries
+        assert rescan.stats['reused'] == 3 and rescan.stats['refreshed'] == 0
+
+        # The index lives in the project cache, not among the exports
+        assert sorted(p.name for p in Path(tmp).iterdir()) == ['export-a.csv', 'export-b.csv', 'sample_data.csv']
+        assert catalog.index_path.exists() and Path(tmp).resolve() not in catalog.index_path.parents
+        catalog.index_path.unlink()
+
+
+def test_months_in_chronological_order():
+    """Full month names load, and months sort by period rather than alphabetically"""
+    loader = MonthlyFileLoader(str(DATA_DIR))
+    loader.load_monthly_files()
+    assert 'Jun 2025' in loader.months_found and 'Jul 2025' in loader.months_found
+
+    periods = loader.get_periods()
+    assert periods.is_monotonic_increasing
+    assert loader.get_all_months() == [p.strftime('%b %Y') for p in periods]
+
+    combined = loader.combine_all_months()
+    assert combined['Period'].is_monotonic_increasing
+    assert list(combined['Month'].cat.categories) == loader.get_all_months()
+
+
+if __name__ == '__main__':
+    test_parallel_load_matches_sequential()
+    test_months_share_unified_dtypes()
+    test_catalog_detects_period_from_header()
+    test_months_in_chronological_order()
+    print("ALL FILE LOADER TESTS PASSED")
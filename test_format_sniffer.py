@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+"""Test CSV format sniffing and single-pass report loading"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'keyword_engine_v2'))
+
+from src.data_loader import DataLoader
+from src.format_sniffer import read_report, sniff
+from keyword_loader import KeywordLoader
+
+
+def test_sniff_sample_reports():
+    """Preamble, header and report type are detected for flat and Google Ads exports"""
+    flat = sniff(str(ROOT / 'sample_data.csv'))
+    assert (flat['skiprows'], flat['report_type'], flat['delimiter']) == (0, 'campaign', ',')
+    assert flat['columns'][0] == 'date'
+
+    export = sniff(str(ROOT / 'website traffic 2 keywords.csv'))
+    assert (export['skiprows'], export['report_type']) == (2, 'keyword')
+    assert export['title'] == 'Search keyword report'
+
+    monthly = sniff(str(ROOT / 'Mar 2025.csv'))
+    assert (monthly['skiprows'], monthly['report_type']) == (2, 'monthly')
+
+
+def test_encodings_and_delimiters():
+    """BOM-marked UTF-8 with semicolons and tab-separated UTF-16 parse in one pass"""
+    rows = 'Search terms report\nAll time\nSearch term;Keyword;Clicks\ncafé near me;cafe;3\ndry cleaner;dry cleaning;5\n'
+    with tempfile.TemporaryDirectory() as tmp:
+        semicolon = Path(tmp) / 'terms.csv'
+        semicolon.write_bytes(rows.encode('utf-8-sig'))
+        fmt = sniff(str(semicolon))
+        assert (fmt['encoding'], fmt['delimiter'], fmt['skiprows']) == ('utf-8-sig', ';', 2)
+        assert fmt['report_type'] == 'search_terms'
+        df = read_report(str(semicolon), fmt)
+        assert list(df.columns) == ['Search term', 'Keyword', 'Clicks']
+        assert df['Search term'].iloc[0] == 'café near me'
+
+        tabbed = Path(tmp) / 'keywords.csv'
+        tabbed.write_text(rows.replace(';', '\t'), encoding='utf-16')
+        fmt = sniff(str(tabbed))
+        assert (fmt['encoding'], fmt['delimiter']) == ('utf-16', '\t')
+        assert read_report(str(tabbed), fmt)['Clicks'].tolist() == [3, 5]
+
+
+def test_loaders_reject_other_report_types():
+    """Loaders fail fast on the wrong report type instead of parsing it"""
+    for loader in (DataLoader(str(ROOT / 'sample_keywords.csv')),
+                   KeywordLoader(str(ROOT / 'sample_data.csv'))):
+        try:
+            loader.load()
+        except ValueError as e:
+            assert 'Expected a' in str(e)
+        else:
+            raise AssertionError("Loading the wrong report type should fail")
+
+    df = KeywordLoader(str(ROOT / 'website traffic 2 keywords.csv')).load()
+    assert len(df) > 0 and df['match_type'].isin(['broad', 'phrase', 'exact']).all()
+
+
+if __name__ == '__main__':
+    test_sniff_sample_reports()
+    test_encodings_and_delimiters()
+    test_loaders_reject_other_report_types()
+    print("ALL FORMAT SNIFFER TESTS PASSED")
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+"""Test the partitioned Parquet history store and loader write-through"""
+
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'monthly_campaign_engine'))
+sys.path.insert(0, str(ROOT / 'keyword_engine_v2'))
+
+from src.data_loader import DataLoader
+from src.history_store import HistoryStore
+from file_loader import MonthlyFileLoader
+from keyword_loader import KeywordLoader
+
+
+def test_upsert_replaces_rows_and_reads_prune():
+    """Upserts replace keyed rows; reads filter by month and project columns"""
+    root = tempfile.mkdtemp()
+    try:
+        store = HistoryStore(root, account='acme')
+        df = pd.DataFrame({
+            'date': pd.to_datetime(['2025-01-05', '2025-01-06', '2025-02-01', '2025-03-01']),
+            'campaign_name': ['A', 'B', 'A', 'A'],
+            'cost': [10.0, 20.0, 30.0, 40.0],
+            'clicks': [1, 2, 3, 4],
+        })
+        assert store.upsert('campaign', df) == 3
+        assert store.partitions('campaign') == ['2025-01', '2025-02', '2025-03']
+
+        # Corrected February row replaces the stored one; appended rows add files
+        store.upsert('campaign', df.iloc[[2]].assign(cost=35.0))
+        store.append('campaign', df.iloc[[3]].assign(date=pd.Timestamp('2025-04-01')))
+
+        recent = store.read('campaign', columns=['campaign_name', 'cost'], start_month='2025-02')
+        assert list(recent.columns) == ['campaign_name', 'cost']
+        assert sorted(recent['cost']) == [35.0, 40.0, 40.0]
+
+        january = store.read('campaign', end_month='2025-01', filters={'campaign_name': 'B'})
+        assert january['cost'].tolist() == [20.0]
+        assert store.read('campaign', account='other').empty
+    finally:
+        shutil.rmtree(root)
+
+
+def test_loaders_write_through():
+    """All three loaders store what they load when given a store"""
+    root = tempfile.mkdtemp()
+    try:
+        store = HistoryStore(root)
+        campaign_df = DataLoader(str(ROOT / 'sample_data.csv'), history=store).load()
+        KeywordLoader(str(ROOT / 'sample_keywords.csv'), history=store).load()
+        loader = MonthlyFileLoader(str(ROOT), history=store)
+        loader.load_monthly_files()
+
+        assert len(store.read('campaign')) == len(campaign_df)
+        assert len(store.read('keyword', columns=['keyword'])) > 0
+        months = store.partitions('monthly')
+        assert months == [str(p) for p in loader.get_periods()]
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == '__main__':
+    test_upsert_replaces_rows_and_reads_prune()
+    test_loaders_write_through()
+    print("ALL HISTORY STORE TESTS PASSED")
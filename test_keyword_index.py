@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+"""Test keyword inverted index against str.contains lookups"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent / 'keyword_engine_v2'))
+
+from keyword_index import KeywordIndex
+from market_insights import MarketInsights
+
+
+def test_keyword_index_matches_str_contains():
+    """Index lookups return the same rows as a case-insensitive substring scan"""
+    keywords = pd.Series([
+        'Dry Cleaning Dubai', 'laundry cleaning', 'same-day laundry', 'Sofa  cleaning near me',
+        None, 'washing service', 'curtains', 'Dry Cleaning Dubai', 'abu dhabi carpet'
+    ])
+    index = KeywordIndex(keywords)
+
+    phrases = ['dry cleaning', 'wash', 'same-day', 'near me', 'abu dhabi', 'curtain', 'missing phrase', '-']
+    for phrase in phrases:
+        expected = np.flatnonzero(keywords.str.contains(phrase, case=False, regex=False, na=False))
+        assert list(index.rows_matching(phrase)) == list(expected), phrase
+
+    themes = MarketInsights.SERVICE_THEMES['carpet'] + MarketInsights.LOCATION_TERMS
+    expected = np.flatnonzero(keywords.str.lower().str.contains('|'.join(themes), na=False))
+    assert list(index.rows_matching(themes)) == list(expected)
+    assert index.mask(themes).sum() == len(expected)
+
+
+def test_market_insights_uses_index():
+    """Theme aggregation over the sample keyword file is unchanged"""
+    df = pd.read_csv(Path(__file__).parent / 'sample_keywords.csv')
+    insights = MarketInsights(df)
+
+    for trend in insights.identify_trending_themes():
+        theme_keywords = MarketInsights.SERVICE_THEMES[trend['theme']]
+        matching = df[df['keyword'].str.lower().str.contains('|'.join(theme_keywords), na=False)]
+        assert trend['keyword_count'] == len(matching)
+        assert trend['total_impressions'] == int(matching['impressions'].sum())
+
+
+if __name__ == '__main__':
+    test_keyword_index_matches_str_contains()
+    test_market_insights_uses_index()
+    print("ALL KEYWORD INDEX TESTS PASSED")
@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+"""Test the shared keyword normalizer and its reuse by the keyword engine"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent / 'keyword_engine_v2'))
+
+from keyword_index import KeywordIndex
+from keyword_loader import KeywordLoader
+from keyword_normalizer import (CANONICAL_COLUMN, canonical_keywords, clean_keyword_text,
+                                normalize_match_types)
+
+
+def test_variants_collapse_to_one_category():
+    """Quote, case and whitespace variants share one canonical keyword"""
+    raw = pd.Series(['"""Sofa  Cleaning"""', 'sofa cleaning', ' SOFA CLEANING ', None, 'Dry Clean'])
+
+    cleaned = clean_keyword_text(raw)
+    assert cleaned.tolist() == ['Sofa Cleaning', 'sofa cleaning', 'SOFA CLEANING', None, 'Dry Clean']
+
+    canonical = canonical_keywords(raw)
+    assert isinstance(canonical.dtype, pd.CategoricalDtype)
+    assert list(canonical.cat.categories) == ['sofa cleaning', 'dry clean']
+    assert canonical.cat.codes.tolist() == [0, 0, 0, -1, 1]
+
+    match_types = normalize_match_types(pd.Series(['Phrase match', 'EXACT', ' broad match ']))
+    assert match_types.tolist() == ['phrase', 'exact', 'broad']
+
+
+def test_loader_adds_canonical_column_reused_by_index():
+    """The loader adds keyword_norm and the index reuses its dictionary"""
+    loader = KeywordLoader(str(Path(__file__).parent / 'sample_keywords.csv'))
+    df = loader.load()
+
+    assert CANONICAL_COLUMN in df.columns
+    assert (df[CANONICAL_COLUMN].astype(object) == df['keyword'].str.lower()).all()
+
+    index = KeywordIndex.from_frame(df)
+    assert index.uniques == list(df[CANONICAL_COLUMN].cat.categories)
+    for phrase in ['cleaning', 'dubai', 'laundry']:
+        expected = np.flatnonzero(df['keyword'].str.contains(phrase, case=False, regex=False, na=False))
+        assert list(index.rows_matching(phrase)) == list(expected), phrase
+
+
+if __name__ == '__main__':
+    test_variants_collapse_to_one_category()
+    test_loader_adds_canonical_column_reused_by_index()
+    print("ALL KEYWORD NORMALIZER TESTS PASSED")
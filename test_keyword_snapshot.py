@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+"""Test memory-mapped keyword snapshots and their reuse by the keyword loader"""
+
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'keyword_engine_v2'))
+
+from keyword_loader import KeywordLoader
+from keyword_audit import KeywordAuditor
+from keyword_snapshot import KeywordSnapshot, has_keyword_metrics
+
+
+def test_snapshot_round_trip_and_invalidation():
+    """A snapshot reads back the cleaned table plus metrics and goes stale when the export changes"""
+    tmp = tempfile.mkdtemp()
+    try:
+        export = Path(tmp) / 'keywords.csv'
+        shutil.copy(ROOT / 'website traffic 2 keywords.csv', export)
+        df = KeywordLoader(str(export)).load()
+
+        snapshot = KeywordSnapshot(str(export), str(Path(tmp) / 'snapshots'))
+        assert not snapshot.is_fresh()
+        snapshot.write(df)
+        assert snapshot.is_fresh()
+
+        restored = snapshot.read()
+        assert has_keyword_metrics(restored) and not has_keyword_metrics(df)
+        pd.testing.assert_frame_equal(restored[df.columns], df, check_dtype=False, check_categorical=False)
+        # Numeric columns are views of the mapped file, not copies
+        assert not restored['clicks'].to_numpy().flags.writeable
+
+        audited = KeywordAuditor(df).df
+        for col in ('ctr', 'conversion_rate', 'cpa', 'cpc', 'roas'):
+            pd.testing.assert_series_equal(restored[col], audited[col])
+
+        stat = export.stat()
+        os.utime(export, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert not snapshot.is_fresh()
+    finally:
+        shutil.rmtree(tmp)
+
+
+def test_loader_reuses_fresh_snapshot():
+    """The second load of an unchanged export comes from the snapshot"""
+    tmp = tempfile.mkdtemp()
+    try:
+        source = str(ROOT / 'sample_keywords.csv')
+        snapshot = KeywordSnapshot(source, tmp)
+        first = KeywordLoader(source, snapshot=snapshot).load()
+        assert snapshot.path.exists()
+
+        loader = KeywordLoader(source, snapshot=snapshot)
+        loader._convert_google_ads_format = None  # the CSV path must not run again
+        second = loader.load()
+        assert len(second) == len(first)
+        assert second['keyword_norm'].tolist() == first['keyword_norm'].tolist()
+        assert second['cost'].sum() == first['cost'].sum()
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == '__main__':
+    test_snapshot_round_trip_and_invalidation()
+    test_loader_reuses_fresh_snapshot()
+    print("ALL KEYWORD SNAPSHOT TESTS PASSED")
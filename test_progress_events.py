@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+"""Test structured progress events and the background job SSE stream"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app import app
+from main_windows import ChampionCleanersBot
+from src.jobs import Job
+
+SAMPLE = Path(__file__).parent / 'sample_data.csv'
+
+
+def test_orchestrator_emits_stages_in_order():
+    """Each stage reports a rising percentage, then a completion event"""
+    events = []
+    results = ChampionCleanersBot(str(SAMPLE)).run_analysis(verbose=False, progress=events.append)
+    assert results is not None
+
+    stages = [e for e in events if e['event'] == 'stage']
+    assert [e['step'] for e in stages] == [1, 2, 3, 4, 5]
+    assert [e['percent'] for e in stages] == sorted(e['percent'] for e in stages)
+    assert stages[1]['rows'] == 25
+    assert events[-1]['event'] == 'complete' and events[-1]['percent'] == 100.0
+
+    partial = next(e for e in events if e['event'] == 'partial' and e['key'] == 'campaign_metrics')
+    assert partial['value'] == results['campaign_metrics']
+
+
+def test_job_stream_resumes_after_last_event_id():
+    """Streams replay events after the given id and end with the job"""
+    job = Job('test')
+    job.emit({'event': 'stage', 'stage': 'one'})
+    job.emit({'event': 'stage', 'stage': 'two'})
+    job._finish('completed', result={'ok': True})
+    assert [e['event'] for e in job.iter_events(after=0)] == ['stage', 'done']
+
+
+def test_sse_endpoint_streams_campaign_job():
+    """POST /api/jobs returns a job whose events arrive as SSE frames"""
+    client = app.test_client()
+    started = client.post('/api/jobs', data={'use_sample': 'true', 'kind': 'campaign'})
+    assert started.status_code == 202
+
+    stream = client.get(started.json['events_url'])
+    assert stream.mimetype == 'text/event-stream'
+    frames = [f for f in stream.get_data(as_text=True).split('\n\n') if f]
+    events = [json.loads(f.split('data: ', 1)[1]) for f in frames]
+    assert events[-1] == {'id': len(events) - 1, 'event': 'done', 'status': 'completed', 'error': None}
+
+    status = client.get(started.json['result_url']).json
+    assert status['result']['status'] == 'success'
+
+
+if __name__ == '__main__':
+    test_orchestrator_emits_stages_in_order()
+    test_job_stream_resumes_after_last_event_id()
+    test_sse_endpoint_streams_campaign_job()
+    print("ALL PROGRESS EVENT TESTS PASSED")
@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+"""Test compressed and archived report inputs"""
+
+import gzip
+import io
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'keyword_engine_v2'))
+sys.path.insert(0, str(ROOT / 'monthly_campaign_engine'))
+
+from src.data_loader import DataLoader
+from src.report_sources import HAS_ZSTD, expand_sources, is_report_file, open_source, report_name
+from keyword_loader import KeywordLoader
+from file_catalog import MonthlyFileCatalog
+from file_loader import MonthlyFileLoader
+
+MONTH_FILES = ['Mar 2025.csv', 'Apr 2025.csv', 'May 2025.csv']
+
+
+def _zip(path: Path, names, extra=None):
+    """Zip repo files (plus extra {name: bytes} members) into path."""
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name in names:
+            archive.write(ROOT / name, f"exports/{name}")
+        for name, data in (extra or {}).items():
+            archive.writestr(name, data)
+
+
+def test_sources_and_names():
+    """Archives expand to one source per CSV member; names drop compression suffixes"""
+    assert is_report_file('a.csv.gz') and is_report_file('b.ZIP') and not is_report_file('c.xls')
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = Path(tmp) / 'bundle.zip'
+        _zip(archive, MONTH_FILES[:2], {'__MACOSX/._x.csv': b'junk', 'notes.txt': b'hi'})
+        sources = expand_sources(str(archive))
+        assert [report_name(s) for s in sources] == MONTH_FILES[:2]
+        with open_source(sources[0]) as f:
+            assert f.read() == (ROOT / MONTH_FILES[0]).read_bytes()
+    assert report_name('x/Mar 2025.csv.gz') == 'Mar 2025.csv'
+
+
+def test_loaders_read_gzip_and_zip():
+    """Campaign and keyword loaders give the same rows from gzip and zip inputs"""
+    expected_campaign = DataLoader(str(ROOT / 'sample_data.csv')).load()
+    expected_keywords = KeywordLoader(str(ROOT / 'sample_keywords.csv')).load()
+    with tempfile.TemporaryDirectory() as tmp:
+        gz = Path(tmp) / 'sample_data.csv.gz'
+        gz.write_bytes(gzip.compress((ROOT / 'sample_data.csv').read_bytes()))
+        pd.testing.assert_frame_equal(DataLoader(str(gz)).load(), expected_campaign)
+
+        # A mixed archive: the keyword loader keeps keyword reports and skips the campaign one
+        archive = Path(tmp) / 'mixed.zip'
+        _zip(archive, ['sample_keywords.csv', 'sample_data.csv'])
+        df = KeywordLoader(str(archive)).load()
+        assert df['keyword'].tolist() == expected_keywords['keyword'].tolist()
+
+        if not HAS_ZSTD:
+            zst = Path(tmp) / 'sample_data.csv.zst'
+            zst.write_bytes(b'(\xb5/\xfd')
+            try:
+                DataLoader(str(zst)).load()
+            except ValueError as e:
+                assert 'zstandard' in str(e)
+            else:
+                raise AssertionError(".zst input without zstandard should fail clearly")
+
+
+def test_monthly_zip_loads_in_one_go():
+    """A zip of monthly exports loads like the same exports in a directory"""
+    with tempfile.TemporaryDirectory() as tmp:
+        plain_dir = Path(tmp) / 'plain'
+        plain_dir.mkdir()
+        for name in MONTH_FILES:
+            (plain_dir / name).write_bytes((ROOT / name).read_bytes())
+        expected = MonthlyFileLoader(str(plain_dir), max_workers=1).combine_all_months()
+
+        archive = Path(tmp) / 'q1.zip'
+        _zip(archive, MONTH_FILES)
+        loader = MonthlyFileLoader(str(archive), max_workers=1)
+        combined = loader.combine_all_months()
+        assert loader.get_all_months() == ['Mar 2025', 'Apr 2025', 'May 2025']
+        pd.testing.assert_frame_equal(combined, expected)
+
+
+def test_app_accepts_archive_uploads():
+    """The upload handlers take compressed files, and a monthly zip runs as one job"""
+    import app as web
+
+    client = web.app.test_client()
+    data = {'file': (io.BytesIO(gzip.compress((ROOT / 'sample_data.csv').read_bytes())), 'upload_test.csv.gz')}
+    response = client.post('/api/analyze', data=data, content_type='multipart/form-data')
+    assert response.status_code == 200, response.get_json()
+    assert response.get_json()['data_summary']['total_rows'] == 25
+
+    rejected = client.post('/api/analyze', data={'file': (io.BytesIO(b'x'), 'report.xls')},
+                           content_type='multipart/form-data')
+    assert rejected.status_code == 400
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        for name in MONTH_FILES:
+            archive.write(ROOT / name, name)
+    buffer.seek(0)
+    started = client.post('/api/jobs', data={'kind': 'monthly', 'file': (buffer, 'upload_test_months.zip')},
+                          content_type='multipart/form-data')
+    assert started.status_code == 202
+    job = web.JOBS.get(started.get_json()['job_id'])
+    deadline = time.time() + 60
+    while not job.finished and time.time() < deadline:
+        time.sleep(0.1)
+    assert job.status == 'completed', job.error
+    assert job.result['dataset'] == 'upload_test_months.zip'
+
+    for name in ('upload_test.csv.gz', 'upload_test_months.zip'):
+        (web.UPLOAD_FOLDER / name).unlink(missing_ok=True)
+    MonthlyFileCatalog.default_index_path(web.UPLOAD_FOLDER / 'upload_test_months.zip').unlink(missing_ok=True)
+
+
+if __name__ == '__main__':
+    test_sources_and_names()
+    test_loaders_read_gzip_and_zip()
+    test_monthly_zip_loads_in_one_go()
+    test_app_accepts_archive_uploads()
+    print("ALL REPORT SOURCE TESTS PASSED")
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+"""Test response compression and ETag revalidation in the Flask API"""
+
+import gzip
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app import app
+
+
+def test_analyze_is_compressed_and_revalidates():
+    """gzip is negotiated, and a repeat request with the ETag gets a 304"""
+    client = app.test_client()
+    first = client.post('/api/analyze', data={'use_sample': 'true'}, headers={'Accept-Encoding': 'gzip'})
+    assert first.status_code == 200
+    assert first.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in first.headers['Vary']
+    body = gzip.decompress(first.data)
+    assert json.loads(body)['status'] == 'success'
+    assert len(first.data) * 3 < len(body)
+
+    repeat = client.post('/api/analyze', data={'use_sample': 'true'},
+                         headers={'If-None-Match': first.headers['ETag']})
+    assert repeat.status_code == 304
+    assert repeat.data == b''
+    # The 304 names the compressed variant the client revalidated
+    assert repeat.headers['ETag'] == first.headers['ETag']
+    repeat = client.post('/api/analyze', data={'use_sample': 'true'},
+                         headers={'Accept-Encoding': 'gzip', 'If-None-Match': first.headers['ETag']})
+    assert repeat.status_code == 304 and repeat.headers['ETag'] == first.headers['ETag']
+
+    # Without Accept-Encoding the body is plain JSON under the base ETag
+    plain = client.post('/api/analyze', data={'use_sample': 'true'})
+    assert 'Content-Encoding' not in plain.headers
+    assert first.headers['ETag'].startswith(plain.headers['ETag'][:-1])
+
+
+def test_query_etag_depends_on_parameters():
+    """Different slices of the same dataset get different ETags"""
+    client = app.test_client()
+    by_campaign = client.get('/api/query?group_by=campaign_name')
+    etag = by_campaign.headers['ETag']
+    assert client.get('/api/query?group_by=campaign_name', headers={'If-None-Match': etag}).status_code == 304
+    assert client.get('/api/query?group_by=platform', headers={'If-None-Match': etag}).status_code == 200
+
+
+if __name__ == '__main__':
+    test_analyze_is_compressed_and_revalidates()
+    test_query_etag_depends_on_parameters()
+    print("ALL RESPONSE CACHING TESTS PASSED")
@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+"""Test the precomputed rollup cube and its slice queries"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.rollup_cube import RollupCube
+
+SAMPLE = Path(__file__).parent / 'sample_data.csv'
+
+
+def test_slices_match_direct_groupby():
+    """Every slice equals a groupby on the raw rows, with ratios on read"""
+    df = pd.read_csv(SAMPLE, parse_dates=['date'])
+    cube = RollupCube(df)
+    assert len(cube.cuboids) == 2 ** len(cube.dimensions)
+
+    sliced = cube.query(['platform'], {'campaign_type': ['Search', 'PMax']})
+    subset = df[df['campaign_type'].isin(['Search', 'PMax'])]
+    expected = subset.groupby('platform')[RollupCube.MEASURES].sum().reset_index()
+    pd.testing.assert_frame_equal(sliced[['platform'] + RollupCube.MEASURES], expected, check_dtype=False)
+
+    total = cube.query()
+    assert len(total) == 1
+    assert total['cost'].iloc[0] == df['cost'].sum()
+    assert total['roas'].iloc[0] == round(df['revenue'].sum() / df['cost'].sum(), 2)
+
+
+def test_sorting_and_unknown_dimensions():
+    """Results sort by any measure or ratio; unknown dimensions are rejected"""
+    cube = RollupCube(pd.read_csv(SAMPLE, parse_dates=['date']))
+    by_roas = cube.query(['campaign_name'], sort_by='roas')
+    assert by_roas['roas'].is_monotonic_decreasing
+
+    try:
+        cube.query(['service'])
+        assert False, "Expected ValueError for a missing dimension"
+    except ValueError:
+        pass
+
+
+if __name__ == '__main__':
+    test_slices_match_direct_groupby()
+    test_sorting_and_unknown_dimensions()
+    print("ALL ROLLUP CUBE TESTS PASSED")
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+"""Test shared JSON serializer for analysis results"""
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src import serialization
+from src.serialization import dumps, to_native
+
+
+RESULT = {
+    'campaign': 'Search_Brand',
+    'impressions': np.int64(15000),
+    'ctr': np.float64(6.0),
+    'cpa': float('inf'),
+    'roas': np.float32('nan'),
+    'flags': np.array([True, False]),
+    'month': pd.Period('2025-03', freq='M'),
+    'date': pd.Timestamp('2025-03-01'),
+    'missing': pd.NaT,
+    'nested': [{'value': np.int32(3)}],
+}
+
+
+def test_dumps_handles_numpy_and_pandas():
+    """NumPy scalars/arrays and pandas values encode; inf/NaN become null"""
+    decoded = json.loads(dumps(RESULT))
+    assert decoded['impressions'] == 15000
+    assert decoded['ctr'] == 6.0
+    assert decoded['cpa'] is None
+    assert decoded['roas'] is None
+    assert decoded['flags'] == [True, False]
+    assert decoded['month'] == '2025-03'
+    assert decoded['date'].startswith('2025-03-01')
+    assert decoded['missing'] is None
+    assert decoded['nested'] == [{'value': 3}]
+
+
+def test_stdlib_fallback_matches():
+    """The fallback encoder produces the same document as orjson"""
+    has_orjson = serialization.HAS_ORJSON
+    try:
+        serialization.HAS_ORJSON = False
+        fallback = json.loads(dumps(RESULT, indent=True))
+    finally:
+        serialization.HAS_ORJSON = has_orjson
+    assert fallback == json.loads(dumps(RESULT))
+    assert fallback == to_native(RESULT) | {'date': fallback['date']}
+
+
+if __name__ == '__main__':
+    test_dumps_handles_numpy_and_pandas()
+    test_stdlib_fallback_matches()
+    print("ALL SERIALIZATION TESTS PASSED")
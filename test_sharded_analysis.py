@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""Test sharded (map-reduce) keyword analysis against the single-process pipeline"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'keyword_engine_v2'))
+
+from keyword_loader import KeywordLoader
+from keyword_audit import KeywordAuditor
+from lost_demand_detector import LostDemandDetector
+from match_type_optimizer import MatchTypeOptimizer
+from market_insights import MarketInsights
+from sharded_analysis import partition, run_sharded_analysis
+
+
+def _account(rows: int = 600) -> pd.DataFrame:
+    """Keyword table spread over several campaigns with varied metrics."""
+    base = KeywordLoader(str(ROOT / 'website traffic 2 keywords.csv')).load()
+    rng = np.random.default_rng(7)
+    df = base.sample(rows, replace=True, random_state=7).reset_index(drop=True)
+    df['campaign_name'] = pd.Series([f"Campaign {i}" for i in rng.integers(0, 9, rows)], dtype=str)
+    for col in ('impressions', 'clicks'):
+        df[col] = (df[col] * rng.uniform(0.2, 3, rows)).round().astype('int64')
+    df['cost'] = (df['cost'] * rng.uniform(0.2, 3, rows)).round(2)
+    return df
+
+
+def _single_process(df: pd.DataFrame) -> dict:
+    """Results of the unsharded modules, keyed like run_sharded_analysis()."""
+    optimizer = MatchTypeOptimizer(df)
+    market = MarketInsights(df)
+    return {
+        'audit': KeywordAuditor(df).audit_keyword_health(),
+        'lost_searches': LostDemandDetector(df).detect_lost_searches(),
+        'match_analysis': optimizer.analyze_match_type_performance(),
+        'match_recommendations': optimizer.recommend_match_type_changes(),
+        'trends': market.identify_trending_themes(),
+        'new_keywords': market.identify_new_keyword_opportunities(),
+        'location_opportunities': market.analyze_location_opportunity(),
+        'service_gaps': market.identify_service_gaps(),
+    }
+
+
+def test_partition_covers_rows_and_keeps_campaigns_together():
+    """Every row lands in exactly one shard; a campaign never spans shards"""
+    df = _account()
+    for by in ('campaign', 'keyword'):
+        shards = partition(df, 4, by)
+        assert sorted(np.concatenate(shards).tolist()) == list(range(len(df)))
+    for rows in partition(df, 4, 'campaign'):
+        others = np.setdiff1d(np.arange(len(df)), rows)
+        assert not set(df['campaign_name'].iloc[rows]) & set(df['campaign_name'].iloc[others])
+
+
+def test_sharded_results_match_single_process():
+    """Merged shard results equal the single-process results, in the same order"""
+    df = _account()
+    expected = _single_process(df)
+    assert expected['audit'] and expected['lost_searches'] and expected['match_recommendations']
+    for by in ('campaign', 'keyword'):
+        for workers in (2, 5):
+            assert run_sharded_analysis(df, workers=workers, by=by, use_processes=False) == expected, (by, workers)
+    assert run_sharded_analysis(df, workers=3) == expected
+
+
+if __name__ == '__main__':
+    test_partition_covers_rows_and_keeps_campaigns_together()
+    test_sharded_results_match_single_process()
+    print("ALL SHARDED ANALYSIS TESTS PASSED")
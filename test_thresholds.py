@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+"""Test per-campaign-type thresholds"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent / 'keyword_engine_v2'))
+
+from config import CAMPAIGN_TYPE_THRESHOLDS, CPA_THRESHOLDS
+from src.analyzer import PerformanceAnalyzer
+from src.thresholds import ThresholdTable, attach_thresholds
+
+from keyword_audit import KeywordAuditor
+
+DEFAULTS = {'ctr_threshold': 1.0, 'conversion_rate_threshold': 1.0, 'cpa_threshold': 500}
+
+
+def test_lookup_by_type_alias_and_default():
+    """Rows get their type's benchmarks; display names and case match; unknown types get defaults"""
+    df = pd.DataFrame({'campaign_type': ['Search', 'performance max', ' iOS App ', 'Display', None]})
+    attach_thresholds(df, DEFAULTS)
+    assert df['cpa_threshold'].tolist() == [
+        CAMPAIGN_TYPE_THRESHOLDS['Search']['expected_cpa'],
+        CAMPAIGN_TYPE_THRESHOLDS['PMax']['expected_cpa'],
+        CAMPAIGN_TYPE_THRESHOLDS['iOS App']['expected_cpa'],
+        500, 500,
+    ]
+    assert df['ctr_threshold'].tolist()[:2] == [3.0, 2.0]
+
+    # No type column at all: every row is held to the defaults
+    untyped = attach_thresholds(pd.DataFrame({'ctr': [0.5, 2.0]}), DEFAULTS)
+    assert untyped['ctr_threshold'].tolist() == [1.0, 1.0]
+
+
+def test_missing_keys_fall_back_per_column():
+    """A type configuring only some benchmarks keeps the defaults for the rest"""
+    table = ThresholdTable({'Video': {'expected_ctr': 0.5}})
+    df = table.attach(pd.DataFrame({'campaign_type': ['Video']}), DEFAULTS)
+    assert df.iloc[0][['ctr_threshold', 'conversion_rate_threshold', 'cpa_threshold']].tolist() == [0.5, 1.0, 500]
+
+
+def _campaign_rows(campaign_type: str, cost: float, conversions: int) -> dict:
+    return {'date': '2025-12-01', 'campaign_name': f"{campaign_type}_Campaign", 'campaign_type': campaign_type,
+            'impressions': 10000, 'clicks': 500, 'cost': cost, 'conversions': conversions, 'revenue': cost * 3}
+
+
+def test_analyzer_compares_against_campaign_type():
+    """The same CPA is high for a Search campaign but fine for an unbenchmarked type"""
+    df = pd.DataFrame([_campaign_rows('Search', 2500, 10), _campaign_rows('Display', 2500, 10)])
+    issues = PerformanceAnalyzer(df).detect_trends_and_risks()
+    high_cpa = [i for i in issues if i['issue_type'] == 'HIGH_CPA']
+    assert [i['campaign'] for i in high_cpa] == ['Search_Campaign']
+    # 250 is more than twice the Search benchmark of 100
+    assert high_cpa[0]['severity'] == 'High' and high_cpa[0]['threshold'] == 100.0
+    assert 'benchmark AED 100' in high_cpa[0]['description']
+
+
+def test_keyword_audit_uses_campaign_type_when_present():
+    """Keyword exports with a campaign type column are held to that type's CPA"""
+    df = pd.DataFrame({
+        'campaign_name': ['Brand', 'Brand'], 'ad_group_name': ['A', 'A'], 'keyword': ['sofa cleaning', 'maid'],
+        'match_type': ['exact', 'exact'], 'impressions': [1000, 1000], 'clicks': [100, 100],
+        'cost': [400.0, 400.0], 'conversions': [2, 2],
+    })
+    untyped = [i['keyword'] for i in KeywordAuditor(df).audit_keyword_health() if i['issue_type'] == 'HIGH_CPA']
+    assert untyped == []  # CPA 200 is under the global warning level
+    assert CPA_THRESHOLDS['warning'] > 200
+
+    df['campaign_type'] = ['Search', 'Display']
+    typed = [i['keyword'] for i in KeywordAuditor(df).audit_keyword_health() if i['issue_type'] == 'HIGH_CPA']
+    assert typed == ['sofa cleaning']
+
+
+if __name__ == '__main__':
+    test_lookup_by_type_alias_and_default()
+    test_missing_keys_fall_back_per_column()
+    test_analyzer_compares_against_campaign_type()
+    test_keyword_audit_uses_campaign_type_when_present()
+    print("ALL THRESHOLD TESTS PASSED")
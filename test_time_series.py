@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+"""Test daily time-series panel, resampling and incremental rolling windows"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.time_series import TimeSeriesEngine
+
+SAMPLE = Path(__file__).parent / 'sample_data.csv'
+
+
+def test_incremental_append_matches_full_build():
+    """Appending day by day gives the same rolling sums as a full rebuild"""
+    df = pd.read_csv(SAMPLE, parse_dates=['date'])
+    dates = sorted(df['date'].unique())
+
+    full = TimeSeriesEngine(df, window=3)
+    incremental = TimeSeriesEngine(df[df['date'] < dates[2]], window=3)
+    for day in dates[2:]:
+        incremental.append(df[df['date'] == day])
+
+    pd.testing.assert_frame_equal(incremental.rolling_metrics(), full.rolling_metrics())
+
+    # Late correction to an earlier day only shifts that day's window
+    correction = df[df['date'] == dates[1]].head(1)
+    incremental.append(correction)
+    rebuilt = TimeSeriesEngine(pd.concat([df, correction]), window=3)
+    pd.testing.assert_frame_equal(incremental.rolling_metrics(), rebuilt.rolling_metrics())
+
+
+def test_rolling_matches_pandas_rolling():
+    """Rolling sums agree with pandas rolling over the daily panel"""
+    df = pd.read_csv(SAMPLE, parse_dates=['date'])
+    engine = TimeSeriesEngine(df, window=7)
+    expected = engine.panel().rolling(7, min_periods=1).sum()
+
+    rolling = engine.rolling_metrics().set_index(['date', 'campaign_name'])
+    for metric in TimeSeriesEngine.METRIC_COLUMNS:
+        actual = rolling[metric].unstack('campaign_name')
+        np.testing.assert_allclose(actual.to_numpy(), expected[metric].to_numpy())
+
+
+def test_resample_totals():
+    """Weekly and monthly buckets preserve campaign totals"""
+    df = pd.read_csv(SAMPLE, parse_dates=['date'])
+    engine = TimeSeriesEngine(df)
+
+    for freq in ('D', 'W', 'M'):
+        buckets = engine.resample(freq)
+        totals = buckets.groupby('campaign_name')['cost'].sum()
+        expected = df.groupby('campaign_name')['cost'].sum()
+        pd.testing.assert_series_equal(totals, expected, check_names=False, check_dtype=False)
+
+    monthly = engine.resample('M', by_campaign=False)
+    assert len(monthly) == df['date'].dt.to_period('M').nunique()
+    assert (monthly['ctr'] == (monthly['clicks'] / monthly['impressions'] * 100).round(2)).all()
+
+
+if __name__ == '__main__':
+    test_incremental_append_matches_full_build()
+    test_rolling_matches_pandas_rolling()
+    test_resample_totals()
+    print("ALL TIME SERIES TESTS PASSED")
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+"""Test the watch-folder daemon: change detection, incremental refresh and publishing"""
+
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'monthly_campaign_engine'))
+
+import file_loader
+from watch_daemon import DirectoryWatcher, MonthlyWatchDaemon, read_latest_results
+
+
+def _drop_later(directory: Path, names, delay: float = 0.1) -> threading.Thread:
+    """Write files into a directory from another thread, a short while from now."""
+    def write():
+        for name in names:
+            time.sleep(delay)
+            (directory / name).write_text('Campaign report\n')
+    thread = threading.Thread(target=write)
+    thread.start()
+    return thread
+
+
+def test_watcher_debounces_report_arrivals():
+    """A burst of report files is reported once; hidden and non-report files are ignored"""
+    for use_inotify in (True, False):
+        directory = Path(tempfile.mkdtemp())
+        try:
+            watcher = DirectoryWatcher(str(directory), poll_seconds=0.05, use_inotify=use_inotify)
+            assert watcher.mode == ('inotify' if use_inotify and sys.platform.startswith('linux') else 'polling')
+
+            thread = _drop_later(directory, ['Mar 2025.csv', '.Apr 2025.csv.tmp', 'notes.txt', 'Apr 2025.csv'])
+            changed = watcher.wait(debounce=0.4, timeout=5)
+            thread.join()
+            assert changed == {'Mar 2025.csv', 'Apr 2025.csv'}, changed
+
+            thread = _drop_later(directory, ['readme.txt'])
+            assert watcher.wait(debounce=0.1, timeout=0.5) == set()
+            thread.join()
+            watcher.close()
+        finally:
+            shutil.rmtree(directory)
+
+
+def test_refresh_reparses_only_changed_months_and_publishes():
+    """Only new exports are parsed again; unchanged folders don't re-run; results are published"""
+    tmp = Path(tempfile.mkdtemp())
+    parse = file_loader._parse_month_file
+    parsed = []
+    file_loader._parse_month_file = lambda source: parsed.append(Path(source).name) or parse(source)
+    try:
+        uploads = tmp / 'uploads'
+        uploads.mkdir()
+        for name in ('Mar 2025.csv', 'Apr 2025.csv'):
+            shutil.copy(ROOT / name, uploads / name)
+        output = tmp / 'results' / 'monthly_latest.json'
+
+        daemon = MonthlyWatchDaemon(str(uploads), str(output), debounce=0, use_inotify=False)
+        first = daemon.refresh()
+        assert sorted(parsed) == ['Apr 2025.csv', 'Mar 2025.csv']
+        assert first['changed_months'] == ['2025-03', '2025-04']
+        assert read_latest_results(str(output))['summary']['months_analyzed'] == 2
+
+        assert daemon.refresh() is None
+
+        parsed.clear()
+        shutil.copy(ROOT / 'May 2025.csv', uploads / 'May 2025.csv')
+        second = daemon.refresh()
+        assert parsed == ['May 2025.csv']
+        assert second['changed_months'] == ['2025-05']
+        assert [s['period'] for s in read_latest_results(str(output))['sources']] == ['2025-03', '2025-04', '2025-05']
+
+        # A restarted daemon picks up from the published results
+        assert MonthlyWatchDaemon(str(uploads), str(output), use_inotify=False).refresh() is None
+    finally:
+        file_loader._parse_month_file = parse
+        shutil.rmtree(tmp)
+
+
+def test_latest_endpoint_serves_published_results():
+    """/api/monthly/latest returns the published file with an ETag, 404 before the first publish"""
+    import app as web
+
+    tmp = Path(tempfile.mkdtemp())
+    original = web.latest_results_path
+    try:
+        path = tmp / 'monthly_latest.json'
+        web.latest_results_path = lambda: path
+        client = web.app.test_client()
+        assert client.get('/api/monthly/latest').status_code == 404
+
+        path.write_text('{"summary": {"months_analyzed": 3}}')
+        response = client.get('/api/monthly/latest')
+        assert response.status_code == 200
+        assert response.get_json()['summary']['months_analyzed'] == 3
+        etag = response.headers['ETag'].strip('"')
+        assert client.get('/api/monthly/latest', headers={'If-None-Match': f'"{etag}"'}).status_code == 304
+    finally:
+        web.latest_results_path = original
+        shutil.rmtree(tmp)
+
+
+if __name__ == '__main__':
+    test_watcher_debounces_report_arrivals()
+    test_refresh_reparses_only_changed_months_and_publishes()
+    test_latest_endpoint_serves_published_results()
+    print("ALL WATCH DAEMON TESTS PASSED")
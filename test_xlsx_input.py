@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+"""Test streaming XLSX report input against the equivalent CSV exports"""
+
+import csv
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+from openpyxl import Workbook
+
+ROOT = Path(__file__).parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'keyword_engine_v2'))
+sys.path.insert(0, str(ROOT / 'monthly_campaign_engine'))
+
+from src.data_loader import DataLoader
+from src.format_sniffer import sniff
+from src.report_sources import open_source
+from keyword_loader import KeywordLoader
+from file_loader import MonthlyFileLoader
+
+
+def _to_xlsx(csv_path: Path, xlsx_path: Path) -> None:
+    """Save a CSV export as a workbook the way Google Ads does: numbers as numbers, rates as percents."""
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        for row in csv.reader(f):
+            cells = []
+            for value in row:
+                text = value.strip().replace(',', '')
+                try:
+                    if text.endswith('%'):
+                        from openpyxl.cell import WriteOnlyCell
+                        cell = WriteOnlyCell(sheet, value=float(text[:-1]) / 100)
+                        cell.number_format = '0.00%'
+                        cells.append(cell)
+                        continue
+                    cells.append(float(text) if '.' in text else int(text))
+                except ValueError:
+                    cells.append(value if value != '' else None)
+            sheet.append(cells)
+    workbook.save(xlsx_path)
+
+
+def test_xlsx_streams_as_csv():
+    """A workbook export sniffs like its CSV twin: same preamble, header and report type"""
+    with tempfile.TemporaryDirectory() as tmp:
+        xlsx = Path(tmp) / 'Mar 2025.xlsx'
+        _to_xlsx(ROOT / 'Mar 2025.csv', xlsx)
+        fmt, expected = sniff(str(xlsx)), sniff(str(ROOT / 'Mar 2025.csv'))
+        for key in ('skiprows', 'columns', 'report_type', 'title'):
+            assert fmt[key] == expected[key], key
+
+        with open_source(str(xlsx)) as f:
+            lines = f.read().decode('utf-8').splitlines()
+        assert lines[0] == 'Campaign report'
+
+
+def test_loaders_match_csv():
+    """Campaign, keyword and monthly loaders give the same frames from XLSX as from CSV"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for name in ('sample_data.csv', 'sample_keywords.csv', 'website traffic 2 keywords.csv'):
+            _to_xlsx(ROOT / name, tmp / name.replace('.csv', '.xlsx'))
+
+        campaign = DataLoader(str(tmp / 'sample_data.xlsx')).load()
+        expected = DataLoader(str(ROOT / 'sample_data.csv')).load()
+        pd.testing.assert_frame_equal(campaign, expected, check_dtype=False)
+
+        for name in ('sample_keywords', 'website traffic 2 keywords'):
+            keywords = KeywordLoader(str(tmp / f'{name}.xlsx')).load()
+            expected = KeywordLoader(str(ROOT / f'{name}.csv')).load()
+            assert keywords['keyword'].tolist() == expected['keyword'].tolist()
+            for col in ('impressions', 'clicks', 'cost', 'conversions'):
+                assert keywords[col].tolist() == expected[col].tolist(), (name, col)
+
+        months = tmp / 'months'
+        months.mkdir()
+        for name in ('Mar 2025', 'Apr 2025'):
+            _to_xlsx(ROOT / f'{name}.csv', months / f'{name}.xlsx')
+        combined = MonthlyFileLoader(str(months), max_workers=1).combine_all_months()
+        csv_dir = tmp / 'csv'
+        csv_dir.mkdir()
+        for name in ('Mar 2025', 'Apr 2025'):
+            (csv_dir / f'{name}.csv').write_bytes((ROOT / f'{name}.csv').read_bytes())
+        expected = MonthlyFileLoader(str(csv_dir), max_workers=1).combine_all_months()
+        assert combined['Campaign'].tolist() == expected['Campaign'].tolist()
+        for col in ('Cost', 'Impr.', 'Conversions', 'Interaction rate', 'Conv. rate'):
+            pd.testing.assert_series_equal(combined[col], expected[col], check_dtype=False)
+
+
+if __name__ == '__main__':
+    test_xlsx_streams_as_csv()
+    test_loaders_match_csv()
+    print("ALL XLSX INPUT TESTS PASSED")